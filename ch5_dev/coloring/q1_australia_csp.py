@@ -14,6 +14,10 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from csp import CSP, Constraint, Variable, Value, Domain, Scope, Relation
 
+_COLORS = frozenset({"Red", "Green", "Blue"})  # Using English color names
+# Adjacent regions must have different colors; shared by every explicit constraint
+_NEQ_REL = frozenset((a, b) for a in _COLORS for b in _COLORS if a != b)
+
 
 def create_australia_map_csp() -> CSP:
     """
@@ -54,19 +58,7 @@ def create_australia_map_csp() -> CSP:
 
     # Create constraints: adjacent regions must have different colors
     for var1, var2 in adjacent_pairs:
-        # Create constraint scope
-        scope = (var1, var2)
-
-        # Create constraint relation: combinations with different colors only
-        relation = set()
-        for color1 in colors:
-            for color2 in colors:
-                if color1 != color2:  # Adjacent regions must have different colors
-                    relation.add((color1, color2))
-
-        # Create and add constraint
-        constraint = Constraint(scope, relation)
-        csp.add_constraint(constraint)
+        csp.add_constraint(Constraint((var1, var2), _NEQ_REL))
 
     return csp
 
@@ -131,7 +123,7 @@ def print_csp_analysis(csp: CSP, title: str = "CSP Analysis") -> None:
 
     print(f"Constraints: {len(csp.constraints)}")
     implicit_count = sum(1 for c in csp.constraints if callable(c.relation))
-    explicit_count = sum(1 for c in csp.constraints if isinstance(c.relation, set))
+    explicit_count = sum(1 for c in csp.constraints if isinstance(c.relation, (set, frozenset)))
     print(f"  Implicit constraints (functions): {implicit_count}")
     print(f"  Explicit constraints (sets): {explicit_count}")
 
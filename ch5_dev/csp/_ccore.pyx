@@ -0,0 +1,107 @@
+# cython: boundscheck=False, wraparound=False, cdivision=True, language_level=3
+"""
+可选的 Cython 加速内核：9x9 数独位掩码回溯
+
+与 sudoku/_solve_numba.py 中的 ``_solve`` 逻辑一致（按行优先选择第一个空格，
+数字从小到大尝试），但提前编译为 C 扩展，没有 JIT 预热开销。
+
+缓冲区约定：
+- domain_masks: 81 个候选位掩码（第 v-1 位表示数字 v 可选）
+- row_mask / col_mask / box_mask: 各 9 个已用数字位掩码
+- assignment: 81 个格子的值，0 表示空
+- counters: [attempts, depth, max_depth, constraint_checks, assigned]，
+  下标与长度取自 csp._sudoku_counters，与 sudoku/_solve_numba.py 共用同一套布局
+
+array.array('H'/'b'/'q') 与 NumPy 数组都可以直接传入。
+
+构建（在 ch5_dev 目录下）：
+    cythonize -i csp/_ccore.pyx
+未构建时导入失败，调用方会回退到纯 Python 实现。
+"""
+
+from . import _sudoku_counters
+
+cdef Py_ssize_t ATTEMPTS = _sudoku_counters.ATTEMPTS
+cdef Py_ssize_t DEPTH = _sudoku_counters.DEPTH
+cdef Py_ssize_t MAX_DEPTH = _sudoku_counters.MAX_DEPTH
+cdef Py_ssize_t CONSTRAINT_CHECKS = _sudoku_counters.CONSTRAINT_CHECKS
+cdef Py_ssize_t ASSIGNED = _sudoku_counters.ASSIGNED
+cdef Py_ssize_t N_COUNTERS = _sudoku_counters.N_COUNTERS
+
+
+cpdef int solve_sudoku(
+    unsigned short[:] domain_masks,
+    unsigned short[:] row_mask,
+    unsigned short[:] col_mask,
+    unsigned short[:] box_mask,
+    signed char[:] assignment,
+    long long[:] counters,
+) except -1:
+    """求解成功返回 1，无解返回 0；计数器原地更新。"""
+    cdef int trail_idx[82]
+    cdef unsigned short trail_tried[82]
+    cdef int level = 0
+    cdef bint descend = True
+    cdef int idx = 0, r, c, b, value
+    cdef unsigned short candidates, bit
+
+    if counters.shape[0] < N_COUNTERS:
+        raise ValueError(f"counters 至少需要 {N_COUNTERS} 项")
+
+    while True:
+        if descend:
+            counters[ATTEMPTS] += 1
+            counters[DEPTH] = level + 1
+            if level + 1 > counters[MAX_DEPTH]:
+                counters[MAX_DEPTH] = level + 1
+
+            if counters[ASSIGNED] == 81:
+                counters[DEPTH] = 0
+                return 1
+
+            idx = 0
+            while assignment[idx] != 0:
+                idx += 1
+            trail_idx[level] = idx
+            trail_tried[level] = 0
+        else:
+            # 子树失败：撤销本层的赋值
+            idx = trail_idx[level]
+            bit = 1 << (assignment[idx] - 1)
+            assignment[idx] = 0
+            r = idx // 9
+            c = idx % 9
+            b = (r // 3) * 3 + c // 3
+            row_mask[r] ^= bit
+            col_mask[c] ^= bit
+            box_mask[b] ^= bit
+            counters[ASSIGNED] -= 1
+
+        r = idx // 9
+        c = idx % 9
+        b = (r // 3) * 3 + c // 3
+        candidates = domain_masks[idx] & ~trail_tried[level]
+        descend = False
+        for value in range(1, 10):
+            bit = 1 << (value - 1)
+            if not candidates & bit:
+                continue
+            trail_tried[level] |= bit
+            counters[CONSTRAINT_CHECKS] += 3
+            if (row_mask[r] | col_mask[c] | box_mask[b]) & bit:
+                continue
+
+            assignment[idx] = value
+            row_mask[r] |= bit
+            col_mask[c] |= bit
+            box_mask[b] |= bit
+            counters[ASSIGNED] += 1
+            level += 1
+            descend = True
+            break
+
+        if not descend:
+            if level == 0:
+                counters[DEPTH] = 0
+                return 0
+            level -= 1
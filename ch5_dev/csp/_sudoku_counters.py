@@ -0,0 +1,14 @@
+"""
+Counter layout shared by the Sudoku bitmask kernels.
+
+``sudoku/_solve_numba.py`` and the optional Cython build in ``_ccore.pyx``
+both update a flat int64 ``counters`` buffer in place; these are its slot
+indices and length.
+"""
+
+ATTEMPTS = 0
+DEPTH = 1
+MAX_DEPTH = 2
+CONSTRAINT_CHECKS = 3
+ASSIGNED = 4
+N_COUNTERS = 5
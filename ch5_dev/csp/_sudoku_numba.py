@@ -0,0 +1,135 @@
+"""
+Whole-grid Sudoku consistency check.
+
+Checking a (partial) Sudoku assignment against the CSP normally dispatches
+``Constraint.is_satisfied`` 27 times over a dict assignment. Here the grid and
+the constraint scopes are materialized once as integer tables:
+
+- ``grid``: 9x9 cell values, 0 for an empty cell
+- ``scopes``: one row per all-different constraint, each entry the 0-based
+  ``(row, col)`` of a cell in its scope, shape ``(n_constraints, 9, 2)``
+
+``check_sudoku`` then ORs ``1 << v`` per constraint and flags any repeated
+digit. The constraints are independent, so with Numba installed the kernel is
+compiled with ``njit(parallel=True, cache=True)`` and spreads them over
+``prange``; each iteration writes only its own slot of a flag buffer, which is
+reduced outside the parallel loop. Without Numba it runs as plain Python on
+nested lists.
+
+``all_different_bitmask`` is the per-constraint check used as the relation
+of the row/column/box constraints in the Sudoku models.
+
+``compile_check`` is the dict-based counterpart: since the scopes are fixed
+when the CSP is built, it generates one straight-line Python function with
+every cell key inlined, for callers that hold a ``{(row, col): digit}``
+assignment.
+"""
+
+from typing import Callable, Dict, Sequence, Tuple
+
+from .csp_core import Constraint
+
+try:
+    import numpy as np
+    from numba import njit, prange
+except ImportError:  # pragma: no cover - optional acceleration
+    np = None
+    njit = None
+    prange = range
+
+NUMBA_AVAILABLE = njit is not None
+
+
+def all_different_bitmask(*values: int) -> bool:
+    """
+    All-different check for small non-negative integer values (e.g. Sudoku digits)
+
+    Each value sets bit ``1 << v`` in an int accumulator, so a repeat is detected
+    without building a set.
+
+    Args:
+        *values: Integer variable values to check
+
+    Returns:
+        bool: True if all values are different, False otherwise
+    """
+    mask = 0
+    for v in values:
+        bit = 1 << v
+        if mask & bit:
+            return False
+        mask |= bit
+    return True
+
+
+def _mark_violations(grid, scopes, violations):
+    """Set ``violations[k]`` to 1 when scope ``k`` contains the same digit twice."""
+    for k in prange(len(scopes)):
+        mask = 0
+        for j in range(len(scopes[k])):
+            v = grid[scopes[k][j][0]][scopes[k][j][1]]
+            if v == 0:
+                continue
+            bit = 1 << v
+            if mask & bit:
+                violations[k] = 1
+                break
+            mask |= bit
+
+
+if NUMBA_AVAILABLE:
+    _mark_violations = njit(parallel=True, cache=True)(_mark_violations)
+
+
+def check_sudoku(grid, scopes) -> bool:
+    """Return True when no constraint scope contains the same digit twice."""
+    if np is not None:
+        violations = np.zeros(len(scopes), dtype=np.uint8)
+    else:
+        violations = [0] * len(scopes)
+    _mark_violations(grid, scopes, violations)
+    return not any(violations)
+
+
+def build_scope_table(constraints: Sequence[Constraint]):
+    """0-based ``(row, col)`` of every cell in every constraint scope of a 9x9 Sudoku CSP."""
+    table = [[(r - 1, c - 1) for r, c in constraint.scope] for constraint in constraints]
+    if np is not None:
+        return np.asarray(table, dtype=np.int32).reshape(len(table), 9, 2)
+    return table
+
+
+def build_grid(assignment: Dict[Tuple[int, int], int]):
+    """9x9 value grid for ``assignment`` (keys are 1-based ``(row, col)``), 0 where unassigned."""
+    grid = [[0] * 9 for _ in range(9)]
+    for (r, c), value in assignment.items():
+        grid[r - 1][c - 1] = value
+    if np is not None:
+        return np.asarray(grid, dtype=np.int8)
+    return grid
+
+
+def compile_check(constraints: Sequence[Constraint]) -> Callable[[Dict[Tuple[int, int], int]], bool]:
+    """
+    Generate ``check(assignment)`` with the all-different test of every scope unrolled.
+
+    Unassigned cells (missing keys) are skipped, so partial assignments are
+    checked on their filled cells.
+    """
+    lines = ["def check(a):", "    get = a.get"]
+    for constraint in constraints:
+        lines.append("    m = 0")
+        for cell in constraint.scope:
+            lines += [
+                f"    v = get({cell!r}, 0)",
+                "    if v:",
+                "        b = 1 << v",
+                "        if m & b:",
+                "            return False",
+                "        m |= b",
+            ]
+    lines.append("    return True")
+
+    namespace: Dict[str, Callable] = {}
+    exec(compile("\n".join(lines), "<sudoku-check>", "exec"), namespace)
+    return namespace["check"]
@@ -0,0 +1,206 @@
+"""
+Integer-array backtracking kernel for small CSPs.
+
+A CSP whose constraints are binary (or n-ary but exactly expressible by their
+pairwise projections, such as all-different) is packed into flat arrays:
+
+- ``domain``: one candidate bitmask per variable (bit ``i`` = ``values[var][i]``)
+- ``edges``: directed arcs ``(x, y)`` as variable indices, shape ``(n_edges, 2)``
+- ``support``: ``support[e, i]`` is the bitmask of ``y`` values compatible with
+  value ``i`` of ``x`` for arc ``e``
+
+``solve_masks`` then runs a stack-based depth-first search with forward checking
+on those arrays. It is compiled with ``numba.njit(cache=True)`` when Numba is
+installed and runs as plain Python otherwise, so the regular solvers remain the
+reference oracle.
+"""
+
+from dataclasses import dataclass
+from itertools import product
+from math import prod
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from ..csp_core import CSP, Variable, Value
+
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:  # pragma: no cover - optional acceleration
+    np = None
+    njit = None
+
+NUMBA_AVAILABLE = njit is not None
+
+# Domains are packed into uint16 masks
+MAX_DOMAIN_SIZE = 16
+# Packing a callable or n-ary constraint enumerates the product of its scope's
+# domains; a 9-cell all-different over 1-9 would be 9**9 tuples
+MAX_SCOPE_PRODUCT = 1 << 16
+
+
+@dataclass(frozen=True)
+class PackedCSP:
+    variables: Tuple[Variable, ...]
+    values: Tuple[Tuple[Value, ...], ...]
+    domain: Any
+    edges: Any
+    support: Any
+
+    def decode(self, assignment) -> Dict[Variable, Value]:
+        """Map the kernel's per-variable value indices back to CSP values."""
+        return {
+            var: self.values[idx][int(assignment[idx])]
+            for idx, var in enumerate(self.variables)
+        }
+
+
+def solve_masks(domain, edges, support, assignment):
+    """
+    Depth-first search over variables in index order with forward checking.
+
+    Domain masks for every level live on one flat stack, so undoing an
+    assignment is just stepping back a level. ``assignment`` receives the chosen
+    value index per variable. Returns True when a solution was found.
+    """
+    n = len(domain)
+    n_edges = len(edges)
+    stack = [0] * ((n + 1) * n)
+    tried = [0] * (n + 1)
+    for i in range(n):
+        stack[i] = domain[i]
+
+    level = 0
+    while True:
+        if level == n:
+            return True
+
+        base = level * n
+        candidates = stack[base + level] & ~tried[level]
+        if candidates == 0:
+            assignment[level] = -1
+            if level == 0:
+                return False
+            level -= 1
+            continue
+
+        bit = candidates & -candidates
+        tried[level] |= bit
+        k = 0
+        while (bit >> k) != 1:
+            k += 1
+        assignment[level] = k
+
+        nxt = base + n
+        for i in range(n):
+            stack[nxt + i] = stack[base + i]
+        stack[nxt + level] = bit
+
+        consistent = True
+        for e in range(n_edges):
+            if edges[e][0] != level:
+                continue
+            target = edges[e][1]
+            remaining = stack[nxt + target] & support[e][k]
+            stack[nxt + target] = remaining
+            if remaining == 0:
+                consistent = False
+                break
+
+        if consistent:
+            level += 1
+            tried[level] = 0
+
+
+if NUMBA_AVAILABLE:
+    solve_masks = njit(cache=True)(solve_masks)
+
+
+def _check_scope_product(csp: CSP, scope: Tuple[Variable, ...]) -> None:
+    size = prod(len(csp.domains[var]) for var in scope)
+    if size > MAX_SCOPE_PRODUCT:
+        raise ValueError(
+            f"Constraint on {scope} spans {size} value tuples; at most {MAX_SCOPE_PRODUCT} can be enumerated"
+        )
+
+
+def _allowed_tuples(csp: CSP, scope: Tuple[Variable, ...], relation) -> Set[Tuple[Value, ...]]:
+    if isinstance(relation, (set, frozenset)):
+        # Only tuples inside the current domains matter (and are comparable below)
+        domains = [csp.domains[var] for var in scope]
+        return {values for values in relation if all(v in d for v, d in zip(values, domains))}
+    _check_scope_product(csp, scope)
+    return {values for values in product(*(csp.domains[var] for var in scope)) if relation(*values)}
+
+
+def pack_csp(csp: CSP) -> PackedCSP:
+    """
+    Build the array form of ``csp`` used by ``solve_masks``.
+
+    Raises:
+        ValueError: if a domain is too large for a uint16 mask, a callable or
+            n-ary constraint spans more than ``MAX_SCOPE_PRODUCT`` value tuples,
+            or an n-ary constraint cannot be expressed exactly through binary
+            supports.
+    """
+    variables = tuple(sorted(csp.variables, key=str))
+    index = {var: idx for idx, var in enumerate(variables)}
+    values = tuple(tuple(csp.domains[var]) for var in variables)
+    bits = [{value: 1 << i for i, value in enumerate(vals)} for vals in values]
+    for var, vals in zip(variables, values):
+        if len(vals) > MAX_DOMAIN_SIZE:
+            raise ValueError(f"Domain of {var!r} has {len(vals)} values; at most {MAX_DOMAIN_SIZE} fit in a mask")
+
+    domain = [(1 << len(vals)) - 1 for vals in values]
+    edges: List[Tuple[int, int]] = []
+    support: List[List[int]] = []
+
+    for constraint in csp.constraints:
+        scope = constraint.scope
+        allowed = _allowed_tuples(csp, scope, constraint.relation)
+
+        if len(scope) == 1:
+            idx = index[scope[0]]
+            domain[idx] &= sum(bits[idx][t[0]] for t in allowed if t[0] in bits[idx])
+            continue
+
+        # Pairwise projections; n-ary constraints must be exactly their conjunction
+        pairs = [(a, b) for a in range(len(scope)) for b in range(len(scope)) if a != b]
+        projections = {(a, b): {(t[a], t[b]) for t in allowed} for a, b in pairs}
+        if len(scope) > 2:
+            _check_scope_product(csp, scope)
+            decomposed = {
+                values_
+                for values_ in product(*(csp.domains[var] for var in scope))
+                if all((values_[a], values_[b]) in projections[a, b] for a, b in pairs if a < b)
+            }
+            if decomposed != allowed:
+                raise ValueError(f"Constraint on {scope} cannot be packed as binary supports")
+
+        for a, b in pairs:
+            x, y = index[scope[a]], index[scope[b]]
+            row = [0] * MAX_DOMAIN_SIZE
+            for x_value, y_value in projections[a, b]:
+                if x_value in bits[x] and y_value in bits[y]:
+                    row[bits[x][x_value].bit_length() - 1] |= bits[y][y_value]
+            edges.append((x, y))
+            support.append(row)
+
+    if np is not None:
+        return PackedCSP(
+            variables,
+            values,
+            np.asarray(domain, dtype=np.uint16),
+            np.asarray(edges, dtype=np.int32).reshape(len(edges), 2),
+            np.asarray(support, dtype=np.uint16).reshape(len(support), MAX_DOMAIN_SIZE),
+        )
+    return PackedCSP(variables, values, domain, edges, support)
+
+
+def numba_backtracking_search(csp: CSP) -> Optional[Dict[Variable, Value]]:
+    """Solve ``csp`` with the packed kernel and return the assignment (or None)."""
+    packed = csp.to_numba_arrays()
+    n = len(packed.variables)
+    assignment = np.full(n, -1, dtype=np.int32) if np is not None else [-1] * n
+    if not solve_masks(packed.domain, packed.edges, packed.support, assignment):
+        return None
+    return packed.decode(assignment)
@@ -6,7 +6,9 @@ Constraint Satisfaction Problems.
 
 Functions Overview:
 - backtracking_search(): Main entry point for basic backtracking algorithm
+- _bytearray_backtrack(): Same search on a compact bytearray assignment
 - count_solutions(): Count all possible solutions (with upper limit)
+- count_solutions_parallel(): Same count, split across worker processes by root value
 - _recursive_backtrack(): Core recursive implementation for basic backtracking
 - _select_unassigned_variable(): Simple variable selection (first unassigned)
 
@@ -14,9 +16,14 @@ All functions follow a pure functional approach - they don't modify the CSP
 object itself, only work with assignment dictionaries.
 """
 
-from typing import Dict, Optional
+import pickle
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Tuple
 from ..csp_core import CSP, Variable, Value
 
+# Value ids are stored in a bytearray with 0 meaning "unassigned"
+MAX_BYTE_DOMAIN = 255
+
 
 def backtracking_search(csp: CSP) -> Optional[Dict[Variable, Value]]:
     """
@@ -29,8 +36,61 @@ def backtracking_search(csp: CSP) -> Optional[Dict[Variable, Value]]:
         Optional[Dict[Variable, Value]]: A complete assignment if a solution is found,
                                         None if no solution exists
     """
-    assignment: Dict[Variable, Value] = {}
-    return _recursive_backtrack(csp, assignment)
+    if any(len(csp.domains[var]) > MAX_BYTE_DOMAIN for var in csp.variables):
+        assignment: Dict[Variable, Value] = {}
+        return _recursive_backtrack(csp, assignment)
+    return _bytearray_backtrack(csp)
+
+
+def _bytearray_backtrack(csp: CSP) -> Optional[Dict[Variable, Value]]:
+    """
+    Backtracking with the assignment held in a bytearray indexed by variable id.
+
+    ``state[vid]`` is 0 while the variable is unassigned, otherwise 1 + the index
+    of its value in ``values[vid]``. Variables are tried in the same order as
+    ``_select_unassigned_variable`` and values in domain iteration order, so the
+    search visits the same nodes as ``_recursive_backtrack``. The dict solution
+    is rebuilt once at the end.
+    """
+    id2var = csp._id2var
+    var2id = csp._var2id
+    values: List[Tuple[Value, ...]] = [tuple(csp.domains[var]) for var in id2var]
+    order = [var2id[var] for var in csp.variables]
+    state = bytearray(len(id2var))
+
+    # Per variable id: (scope ids, check) for every constraint touching it
+    checks: List[List[Tuple[Tuple[int, ...], Callable[[Tuple[Value, ...]], bool]]]] = [[] for _ in id2var]
+    for constraint in csp.constraints:
+        relation = constraint.relation
+        if isinstance(relation, (set, frozenset)):
+            check = relation.__contains__
+        else:
+            check = (lambda rel: lambda vals: rel(*vals))(relation)
+        scope_ids = tuple(var2id[var] for var in constraint.scope)
+        for vid in dict.fromkeys(scope_ids):
+            checks[vid].append((scope_ids, check))
+
+    def consistent(vid: int) -> bool:
+        for scope_ids, check in checks[vid]:
+            if all(state[i] for i in scope_ids):
+                if not check(tuple(values[i][state[i] - 1] for i in scope_ids)):
+                    return False
+        return True
+
+    def backtrack(depth: int) -> bool:
+        if depth == len(order):
+            return True
+        vid = order[depth]
+        for value_id in range(1, len(values[vid]) + 1):
+            state[vid] = value_id
+            if consistent(vid) and backtrack(depth + 1):
+                return True
+        state[vid] = 0
+        return False
+
+    if not backtrack(0):
+        return None
+    return {id2var[vid]: values[vid][state[vid] - 1] for vid in range(len(id2var))}
 
 
 def _recursive_backtrack(csp: CSP, assignment: Dict[Variable, Value]) -> Optional[Dict[Variable, Value]]:
@@ -99,6 +159,12 @@ def count_solutions(csp: CSP, max_count: int = 1000) -> int:
     """
     Count the number of solutions for a CSP (up to max_count).
 
+    Variables are assigned in the fixed order of ``_select_unassigned_variable``,
+    so the number of completions below a node depends only on its depth and on
+    the values of the assigned variables that still share a constraint with an
+    unassigned one. Those sub-counts are memoized on the CSP and reused across
+    calls until the variables, constraints or domains change.
+
     Args:
         csp (CSP): The CSP to analyze
         max_count (int): Maximum number of solutions to count (to avoid infinite loops)
@@ -106,23 +172,102 @@ def count_solutions(csp: CSP, max_count: int = 1000) -> int:
     Returns:
         int: Number of solutions found (capped at max_count)
     """
-    def _count_recursive(csp: CSP, assignment: Dict[Variable, Value], count: int) -> int:
-        if count >= max_count:
-            return count
-
-        if csp.is_complete(assignment):
-            return count + 1
-
-        var = _select_unassigned_variable(csp, assignment)
-        if var is None:
-            return count
-
+    order = list(csp.variables)
+    domains_key = tuple((var, frozenset(csp.domains[var])) for var in order)
+    cache_key = (csp._cache_version, domains_key, max_count)
+    if csp._count_cache_key != cache_key:
+        csp._count_cache_key = cache_key
+        csp._count_cache = {}
+    memo = csp._count_cache
+
+    # boundary[d]: assigned variables (order[:d]) constrained together with order[d:]
+    position = {var: i for i, var in enumerate(order)}
+    last_partner = {var: position[var] for var in order}
+    for var in order:
+        for constraint in csp._by_var.get(var, ()):
+            for other in constraint.scope:
+                last_partner[var] = max(last_partner[var], position[other])
+    boundary = [
+        tuple(var for var in order[:depth] if last_partner[var] >= depth)
+        for depth in range(len(order) + 1)
+    ]
+
+    def _count_recursive(assignment: Dict[Variable, Value], depth: int) -> int:
+        if depth == len(order):
+            return 1
+
+        key = (depth, tuple(assignment[var] for var in boundary[depth]))
+        cached = memo.get(key)
+        if cached is not None:
+            return cached
+
+        var = order[depth]
+        count = 0
         for value in csp.domains[var]:
             if csp.is_consistent(var, value, assignment):
                 assignment[var] = value
-                count = _count_recursive(csp, assignment, count)
+                count += _count_recursive(assignment, depth + 1)
                 del assignment[var]
+                if count >= max_count:
+                    count = max_count
+                    break
 
+        memo[key] = count
         return count
 
-    return _count_recursive(csp, {}, 0)
+    return _count_recursive({}, 0)
+
+
+def _count_branch(payload: bytes, root: Variable, value: Value, max_count: int) -> int:
+    """Worker: count solutions of the pickled CSP with root fixed to value."""
+    csp = pickle.loads(payload)
+    csp.domains[root] = {value}
+    return count_solutions(csp, max_count)
+
+
+def count_solutions_parallel(csp: CSP, max_count: int = 1000, workers: Optional[int] = None) -> int:
+    """
+    Count solutions (up to max_count) by splitting on the root variable's values.
+
+    The root is the variable with the smallest domain (MRV). The branches below
+    its values are disjoint, so each one is counted in its own worker process
+    and the results are summed. Once the running total reaches max_count the
+    executor is shut down without waiting: queued branches are cancelled and
+    the call returns while running branches finish in the background.
+
+    The CSP is pickled once and the same bytes are sent to every worker, so
+    relations must be picklable (explicit relation sets or module-level
+    functions, not lambdas). If it cannot be pickled, the count falls back to
+    count_solutions in this process.
+
+    Args:
+        csp (CSP): The CSP to analyze
+        max_count (int): Maximum number of solutions to count
+        workers (Optional[int]): Worker processes (default: executor default)
+
+    Returns:
+        int: Number of solutions found (capped at max_count)
+    """
+    if not csp.variables:
+        return min(1, max_count)
+
+    try:
+        payload = pickle.dumps(csp)
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return count_solutions(csp, max_count)
+
+    root = min(csp.variables, key=lambda var: len(csp.domains[var]))
+    total = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = {
+            executor.submit(_count_branch, payload, root, value, max_count)
+            for value in csp.domains[root]
+        }
+        while pending and total < max_count:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            total += sum(future.result() for future in done)
+        if pending:
+            # Cap reached: leaving the with block would otherwise join the running workers
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    return min(total, max_count)
@@ -253,6 +253,8 @@ class InstrumentedHeuristicBacktracking:
 
         self.csp: Optional[CSP] = None
         self.neighbors: Dict[Variable, Set[Variable]] = {}
+        # Working assignment reused across solves; callers only ever see a snapshot.
+        self._assignment: Dict[Variable, Value] = {}
         self._reset_counters()
 
     def _reset_counters(self) -> None:
@@ -285,7 +287,8 @@ class InstrumentedHeuristicBacktracking:
         self.start_time = time.time()
         self.last_progress_time = self.start_time
 
-        assignment: Dict[Variable, Value] = {}
+        assignment = self._assignment
+        assignment.clear()
         if initial_assignment:
             for var, value in initial_assignment.items():
                 if var not in csp.variables:
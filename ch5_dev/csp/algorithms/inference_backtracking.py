@@ -20,7 +20,7 @@ from collections import deque
 from dataclasses import dataclass
 from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Set, Tuple
 
-from ..csp_core import CSP, Variable, Value
+from ..csp_core import CSP, Variable, Value, build_support_masks
 
 Assignment = Dict[Variable, Value]
 Domain = Dict[Variable, Set[Value]]
@@ -49,13 +49,41 @@ def _stub_not_implemented(label: str) -> TechniqueHandler:
 
 
 def _build_neighbors(csp: CSP) -> Dict[Variable, Set[Variable]]:
-    neighbors: Dict[Variable, Set[Variable]] = {var: set() for var in csp.variables}
+    return {var: set(csp._adjacency[var]) for var in csp.variables}
+
+
+def _build_arc_supports(
+    csp: CSP, value_order: Dict[Variable, Tuple[Value, ...]]
+) -> Dict[Tuple[Variable, Variable], Dict[Value, int]]:
+    """
+    Precompute support bitmasks for arcs whose only constraints are binary relation sets.
+
+    ``supports[(x, y)][v]`` has bit ``i`` set when ``value_order[y][i]`` is compatible
+    with ``x = v``. Arcs touched by a callable or non-binary constraint are left out
+    and revised with the generic consistency check instead.
+    """
+    supports: Dict[Tuple[Variable, Variable], Dict[Value, int]] = {}
+    generic: Set[Tuple[Variable, Variable]] = set()
     for constraint in csp.constraints:
         scope = constraint.scope
-        for var in scope:
-            others = set(scope) - {var}
-            neighbors[var].update(others)
-    return neighbors
+        relation = constraint.relation
+        if len(scope) != 2 or scope[0] == scope[1] or not isinstance(relation, (set, frozenset)):
+            for x in scope:
+                for y in scope:
+                    generic.add((x, y))
+            continue
+
+        x, y = scope
+        reverse = frozenset((b, a) for a, b in relation)
+        for arc, arc_relation in (((x, y), relation), ((y, x), reverse)):
+            masks = build_support_masks(arc, arc_relation, value_order)
+            if arc in supports:
+                masks = {value: supports[arc][value] & mask for value, mask in masks.items()}
+            supports[arc] = masks
+
+    for arc in generic:
+        supports.pop(arc, None)
+    return supports
 
 
 class InferenceBacktrackingSolver:
@@ -86,16 +114,23 @@ class InferenceBacktrackingSolver:
         ),
     }
 
-    def __init__(self, techniques: Sequence[str] = ()) -> None:
+    def __init__(self, techniques: Sequence[str] = (), *, initial_ac3: bool = False) -> None:
         unknown = [name for name in techniques if name not in self.TECHNIQUES]
         if unknown:
             raise UnknownTechniqueError(f"Unknown inference technique(s): {', '.join(sorted(unknown))}")
 
         self.techniques = [self.TECHNIQUES[name] for name in techniques]
+        # One-shot AC-3 over every arc before the search starts
+        self.initial_ac3 = initial_ac3
         self.csp: Optional[CSP] = None
         self.neighbors: Dict[Variable, Set[Variable]] = {}
         self.current_domains: Domain = {}
+        # Bitmask mirror of current_domains used by the AC-3 fast path
+        self._value_bits: Dict[Variable, Dict[Value, int]] = {}
+        self._domain_masks: Dict[Variable, int] = {}
+        self._arc_supports: Dict[Tuple[Variable, Variable], Dict[Value, int]] = {}
         self.metrics: Dict[str, Any] = {}
+        self._metrics: Dict[str, Any] = {}
 
         # Metrics counters populated during search
         self._nodes_expanded = 0
@@ -104,6 +139,7 @@ class InferenceBacktrackingSolver:
         self._forward_prunes = 0
         self._propagation_steps = 0
         self._arc_revisions = 0
+        self._ac3_revisions = 0
 
     # ------------------------------------------------------------------ Public API
 
@@ -120,28 +156,30 @@ class InferenceBacktrackingSolver:
         start_time = time.perf_counter()
         current_bytes = peak_bytes = 0
         try:
-            solution = self._backtrack({}, depth=0)
+            if self.initial_ac3 and not self._preprocess_arc_consistency():
+                solution = None
+            else:
+                solution = self._backtrack({}, depth=0)
         finally:
             current_bytes, peak_bytes = tracemalloc.get_traced_memory()
             tracemalloc.stop()
         elapsed = time.perf_counter() - start_time
 
-        self.metrics = {
-            "nodes_expanded": float(self._nodes_expanded),
-            "backtracks": float(self._backtracks),
-            "max_depth": float(self._max_depth),
-            "forward_check_prunes": float(self._forward_prunes),
-            "propagation_steps": float(self._propagation_steps),
-            "arc_revisions": float(self._arc_revisions),
-            "elapsed_seconds": float(elapsed),
-            "current_memory_mb": float(current_bytes / (1024 * 1024)),
-            "peak_memory_mb": float(peak_bytes / (1024 * 1024)),
-            "solution_found": solution is not None,
-            "assignment_size": float(len(solution) if solution else 0),
-            "techniques": ", ".join(defn.name for defn in self.techniques) or "none",
-            "technique_names": [defn.name for defn in self.techniques],
-        }
-        return solution, dict(self.metrics)
+        metrics = self._metrics
+        metrics["nodes_expanded"] = float(self._nodes_expanded)
+        metrics["backtracks"] = float(self._backtracks)
+        metrics["max_depth"] = float(self._max_depth)
+        metrics["forward_check_prunes"] = float(self._forward_prunes)
+        metrics["propagation_steps"] = float(self._propagation_steps)
+        metrics["arc_revisions"] = float(self._arc_revisions)
+        metrics["ac3_revisions"] = float(self._ac3_revisions)
+        metrics["elapsed_seconds"] = float(elapsed)
+        metrics["current_memory_mb"] = float(current_bytes / (1024 * 1024))
+        metrics["peak_memory_mb"] = float(peak_bytes / (1024 * 1024))
+        metrics["solution_found"] = solution is not None
+        metrics["assignment_size"] = float(len(solution) if solution else 0)
+        self.metrics = metrics
+        return solution, metrics
 
     # ------------------------------------------------------------------ Core search
 
@@ -149,12 +187,39 @@ class InferenceBacktrackingSolver:
         self.csp = csp
         self.neighbors = _build_neighbors(csp)
         self.current_domains = {var: set(domain) for var, domain in csp.domains.items()}
+        value_order = {var: tuple(domain) for var, domain in self.current_domains.items()}
+        self._value_bits = {
+            var: {value: 1 << bit for bit, value in enumerate(values)} for var, values in value_order.items()
+        }
+        self._domain_masks = {var: (1 << len(values)) - 1 for var, values in value_order.items()}
+        self._arc_supports = _build_arc_supports(csp, value_order)
         self._nodes_expanded = 0
         self._backtracks = 0
         self._max_depth = 0
         self._forward_prunes = 0
         self._propagation_steps = 0
         self._arc_revisions = 0
+        self._ac3_revisions = 0
+
+        # Built once per solve; the search fills the counters in place and the
+        # same dict is handed back to the caller.
+        names = [defn.name for defn in self.techniques]
+        self._metrics = {
+            "nodes_expanded": 0.0,
+            "backtracks": 0.0,
+            "max_depth": 0.0,
+            "forward_check_prunes": 0.0,
+            "propagation_steps": 0.0,
+            "arc_revisions": 0.0,
+            "ac3_revisions": 0.0,
+            "elapsed_seconds": 0.0,
+            "current_memory_mb": 0.0,
+            "peak_memory_mb": 0.0,
+            "solution_found": False,
+            "assignment_size": 0.0,
+            "techniques": ", ".join(names) or "none",
+            "technique_names": names,
+        }
 
     def _backtrack(self, assignment: Assignment, depth: int) -> Optional[Assignment]:
         if self.csp is None:
@@ -215,6 +280,7 @@ class InferenceBacktrackingSolver:
     def _restore(self, removals: Removals) -> None:
         for var, value in reversed(removals):
             self.current_domains[var].add(value)
+            self._domain_masks[var] |= self._value_bits[var][value]
 
     # ------------------------------------------------------------------ Techniques
     def _order_values(self, var: Variable, assignment: Assignment) -> List[Value]:
@@ -232,10 +298,9 @@ class InferenceBacktrackingSolver:
             if neighbor in assignment:
                 continue
 
-            for neighbor_value in list(self.current_domains[neighbor]):
-                if not self.csp.is_consistent(neighbor, neighbor_value, assignment):
-                    if self._prune(neighbor, neighbor_value, removals):
-                        self._forward_prunes += 1
+            for neighbor_value in self._inconsistent_values(neighbor, assignment):
+                if self._prune(neighbor, neighbor_value, removals):
+                    self._forward_prunes += 1
 
             if not self.current_domains[neighbor]:
                 return False
@@ -255,10 +320,9 @@ class InferenceBacktrackingSolver:
                     continue
 
                 pruned = False
-                for neighbor_value in list(self.current_domains[neighbor]):
-                    if not self.csp.is_consistent(neighbor, neighbor_value, assignment):
-                        if self._prune(neighbor, neighbor_value, removals):
-                            pruned = True
+                for neighbor_value in self._inconsistent_values(neighbor, assignment):
+                    if self._prune(neighbor, neighbor_value, removals):
+                        pruned = True
 
                 if not self.current_domains[neighbor]:
                     return False
@@ -273,37 +337,74 @@ class InferenceBacktrackingSolver:
         if self.csp is None:
             raise RuntimeError("Solver must be prepared with a CSP before searching.")
 
-        arc_queue: Deque[Tuple[Variable, Variable]] = deque()
+        arcs = [(neighbor, var) for neighbor in self.neighbors.get(var, [])]
+        consistent, revisions = self._propagate_arcs(arcs, assignment, removals)
+        self._arc_revisions += revisions
+        return consistent
 
-        for neighbor in self.neighbors.get(var, []):
-            arc_queue.append((neighbor, var))
+    def _preprocess_arc_consistency(self) -> bool:
+        """
+        Make every arc consistent once before search. Removals are permanent for
+        this solve, so they are not recorded for undo.
+        """
+        arcs = [(xi, xj) for xi, neighbors in self.neighbors.items() for xj in neighbors]
+        consistent, revisions = self._propagate_arcs(arcs, {}, [])
+        self._ac3_revisions += revisions
+        return consistent
+
+    def _propagate_arcs(
+        self, arcs: Sequence[Tuple[Variable, Variable]], assignment: Assignment, removals: Removals
+    ) -> Tuple[bool, int]:
+        """
+        AC-3 worklist: returns (consistent, number of revising arcs). A set mirrors
+        the deque so an arc already waiting is not queued twice.
+        """
+        arc_queue: Deque[Tuple[Variable, Variable]] = deque()
+        in_queue: Set[Tuple[Variable, Variable]] = set()
+        for arc in arcs:
+            if arc[0] != arc[1] and arc not in in_queue:
+                in_queue.add(arc)
+                arc_queue.append(arc)
 
+        revisions = 0
         while arc_queue:
-            xi, xj = arc_queue.popleft()
-            if xi == xj:
-                continue
+            arc = arc_queue.popleft()
+            in_queue.discard(arc)
+            xi, xj = arc
 
             if xi not in self.current_domains or xj not in self.current_domains:
                 continue
 
-            revised = self._revise(xi, xj, assignment, removals)
-            if revised:
+            if self._revise(xi, xj, assignment, removals):
+                revisions += 1
                 if not self.current_domains[xi]:
-                    return False
+                    return False, revisions
 
-                self._arc_revisions += 1
                 for xk in self.neighbors.get(xi, []):
                     if xk == xj:
                         continue
-                    arc_queue.append((xk, xi))
+                    follow_up = (xk, xi)
+                    if follow_up not in in_queue:
+                        in_queue.add(follow_up)
+                        arc_queue.append(follow_up)
 
-        return True
+        return True, revisions
 
     def _revise(self, xi: Variable, xj: Variable, assignment: Assignment, removals: Removals) -> bool:
         if self.csp is None:
             raise RuntimeError("Solver must be prepared with a CSP before searching.")
 
         revised = False
+        supports = self._arc_supports.get((xi, xj))
+        if supports is not None:
+            # Binary relation arc: a value survives if its support mask meets D(xj)
+            domain_j = self._domain_masks[xj]
+            for value in list(self.current_domains[xi]):
+                if not supports[value] & domain_j:
+                    if self._prune(xi, value, removals):
+                        revised = True
+            return revised
+
         for value in list(self.current_domains[xi]):
             if not self._has_support(xi, value, xj, assignment):
                 if self._prune(xi, value, removals):
@@ -330,6 +431,35 @@ class InferenceBacktrackingSolver:
 
     # ------------------------------------------------------------------ Utilities
 
+    def _inconsistent_values(self, var: Variable, assignment: Assignment) -> List[Value]:
+        """
+        Return the values of ``var``'s current domain that violate a constraint.
+
+        Equivalent to calling ``csp.is_consistent`` per value, but the whole
+        domain is checked against one scratch copy of the assignment and the
+        constraints touching ``var`` are looked up once. Constraints with
+        another unassigned variable in scope cannot be violated yet, so they
+        are dropped before the value loop.
+        """
+        if self.csp is None:
+            raise RuntimeError("Solver must be prepared with a CSP before searching.")
+
+        constraints = [
+            constraint for constraint in self.csp._by_var.get(var, ())
+            if all(other == var or other in assignment for other in constraint.scope)
+        ]
+        if not constraints:
+            return []
+        temp_assignment = assignment.copy()
+        rejected: List[Value] = []
+        for value in self.current_domains[var]:
+            temp_assignment[var] = value
+            for constraint in constraints:
+                if not constraint.is_satisfied(temp_assignment):
+                    rejected.append(value)
+                    break
+        return rejected
+
     def _restrict_to_assignment(self, var: Variable, value: Value, removals: Removals) -> bool:
         """
         Keep only the assigned value in the variable's domain so subsequent inference
@@ -351,6 +481,7 @@ class InferenceBacktrackingSolver:
         if value not in domain:
             return False
         domain.remove(value)
+        self._domain_masks[var] &= ~self._value_bits[var][value]
         removals.append((var, value))
         return True
 
@@ -380,11 +511,15 @@ def inference_backtracking_with_metrics(
     csp: CSP,
     *,
     techniques: Sequence[str] = ("forward_checking",),
+    initial_ac3: bool = False,
 ) -> Tuple[Optional[Assignment], Dict[str, Any]]:
     """
     Variant of `inference_backtracking_search` that also returns the collected metrics.
+
+    With ``initial_ac3=True`` a full AC-3 pass runs before the search; its
+    revisions are reported as ``metrics["ac3_revisions"]``.
     """
-    solver = InferenceBacktrackingSolver(techniques)
+    solver = InferenceBacktrackingSolver(techniques, initial_ac3=initial_ac3)
     return solver.solve_with_metrics(csp)
 
 
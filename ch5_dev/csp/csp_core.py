@@ -10,15 +10,20 @@ CSP = (X, D, C)
 - C 是一个约束的有限集合
 """
 
-from typing import List, Tuple, Set, Any, Dict, Callable, Union, Optional
+from typing import AbstractSet, List, Tuple, Set, Any, Dict, Callable, Sequence, Union, Optional
+
+try:
+    import numpy as np
+except ImportError:  # 可选加速
+    np = None
 
 # --- 类型别名，用于提高代码可读性 ---
 Variable = str         # 变量使用字符串表示，如 "WA", "NT"
 Value = Any            # 变量的值可以是任何类型
-Domain = Set[Value]    # 值域是值的集合，目前假设为离散有限域
+Domain = AbstractSet[Value]    # 值域是值的集合（set 或 frozenset），目前假设为离散有限域
 Scope = Tuple[Variable, ...] # 约束的作用域是变量名的元组
 # 约束关系可以是显式的值组合集合，也可以是隐式的约束函数
-Relation = Union[Set[Tuple[Value, ...]], Callable[..., bool]]
+Relation = Union[AbstractSet[Tuple[Value, ...]], Callable[..., bool]]
 
 
 class Constraint:
@@ -31,7 +36,8 @@ class Constraint:
 
     注意:
         relation 可以是两种类型:
-        1. 显式约束: Set[Tuple[Value, ...]] - 包含所有允许的值组合的集合
+        1. 显式约束: set / frozenset[Tuple[Value, ...]] - 包含所有允许的值组合的集合
+           （成员检查在 C 层完成，比逐次调用 Python 函数更快，可在多个约束间共享）
         2. 隐式约束: Callable[..., bool] - 接受变量值作为参数，返回布尔值表示是否满足约束
     """
     def __init__(self, scope: Scope, relation: Relation):
@@ -59,7 +65,7 @@ class Constraint:
         values = tuple(assignment[var] for var in self.scope)
 
         # 根据约束类型进行检查
-        if isinstance(self.relation, set):
+        if isinstance(self.relation, (set, frozenset)):
             # 显式约束：检查值组合是否在允许的集合中
             return values in self.relation
         elif callable(self.relation):
@@ -70,7 +76,7 @@ class Constraint:
 
     def __repr__(self) -> str:
         """返回约束的字符串表示"""
-        if isinstance(self.relation, set):
+        if isinstance(self.relation, (set, frozenset)):
             relation_str = f"Set({len(self.relation)} combinations)"
         elif callable(self.relation):
             relation_str = f"Function({self.relation.__name__})"
@@ -79,6 +85,45 @@ class Constraint:
         return f"Constraint(scope={self.scope}, relation={relation_str})"
 
 
+# --- 位掩码辅助：值域较小时用整数的二进制位表示值集合 ---
+popcount = int.bit_count
+
+
+def iter_bits(mask: int):
+    """依次产出 mask 中为 1 的位的下标（从低位到高位）。"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def build_support_masks(
+    scope: Tuple[Variable, Variable],
+    relation: AbstractSet[Tuple[Value, Value]],
+    domains: Dict[Variable, Sequence[Value]],
+) -> Dict[Value, int]:
+    """
+    为二元显式约束预计算支持掩码。
+
+    参数:
+        scope: 约束作用域 (X, Y)。
+        relation: 允许的 (x, y) 值对集合。
+        domains: 变量到有序值序列的映射，Y 的第 i 个值对应第 i 位。
+
+    返回:
+        Dict[Value, int]: X 的每个值 -> Y 中与之相容的值构成的位掩码。
+    """
+    x, y = scope
+    supports: Dict[Value, int] = {}
+    for x_value in domains[x]:
+        mask = 0
+        for bit, y_value in enumerate(domains[y]):
+            if (x_value, y_value) in relation:
+                mask |= 1 << bit
+        supports[x_value] = mask
+    return supports
+
+
 class CSP:
     """
     表示一个约束满足问题 CSP = {X, D, C}
@@ -92,6 +137,27 @@ class CSP:
         self.variables: Set[Variable] = set()
         self.domains: Dict[Variable, Domain] = {}
         self.constraints: List[Constraint] = []
+        # 变量 -> 涉及该变量的约束列表，在 add_constraint 中维护
+        self._by_var: Dict[Variable, List[Constraint]] = {}
+        # 约束图邻接表：变量 -> 与其共享某个约束的其它变量
+        self._adjacency: Dict[Variable, Set[Variable]] = {}
+        # 变量 <-> 稳定整数 id（按添加顺序分配），供紧凑的数组形式赋值使用
+        self._var2id: Dict[Variable, int] = {}
+        self._id2var: List[Variable] = []
+        # 结构版本号：每次添加变量或约束时递增，用于使 count_solutions 的缓存失效
+        self._cache_version = 0
+        self._count_cache_key: Optional[Tuple[Any, ...]] = None
+        self._count_cache: Dict[Tuple[Any, ...], int] = {}
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """
+        pickle 时不带 count_solutions 的缓存：接收方（如并行计数的工作进程）
+        会按自己的值域重新建立，没必要随每个副本传输。
+        """
+        state = self.__dict__.copy()
+        state['_count_cache_key'] = None
+        state['_count_cache'] = {}
+        return state
 
     def add_variable(self, var: Variable, domain: Domain) -> None:
         """
@@ -103,6 +169,11 @@ class CSP:
         """
         self.variables.add(var)
         self.domains[var] = domain
+        self._adjacency.setdefault(var, set())
+        if var not in self._var2id:
+            self._var2id[var] = len(self._id2var)
+            self._id2var.append(var)
+        self._cache_version += 1
 
     def add_constraint(self, constraint: Constraint) -> None:
         """
@@ -116,6 +187,22 @@ class CSP:
             if var not in self.variables:
                 raise ValueError(f"约束中的变量 '{var}' 尚未添加到 CSP 中")
         self.constraints.append(constraint)
+        for var in dict.fromkeys(constraint.scope):
+            self._by_var.setdefault(var, []).append(constraint)
+            self._adjacency[var].update(other for other in constraint.scope if other != var)
+        self._cache_version += 1
+
+    def constraints_of(self, var: Variable) -> Sequence[Constraint]:
+        """
+        返回作用域中包含 var 的约束（来自 add_constraint 维护的索引，无需扫描全部约束）
+
+        参数:
+            var (Variable): 变量
+
+        返回:
+            Sequence[Constraint]: 涉及该变量的约束，按添加顺序排列
+        """
+        return self._by_var.get(var, ())
 
     def is_consistent(self, var: Variable, value: Value, assignment: Dict[Variable, Value]) -> bool:
         """
@@ -129,15 +216,21 @@ class CSP:
         返回:
             bool: 如果一致则返回True，否则返回False
         """
+        # 只检查涉及 var 的约束（通过 _by_var 索引直接取得），
+        # 且跳过作用域尚未全部赋值的约束——它们此时必然满足
+        ready = [
+            constraint for constraint in self._by_var.get(var, ())
+            if all(other == var or other in assignment for other in constraint.scope)
+        ]
+        if not ready:
+            return True
+
         # 创建临时赋值（包含新的变量赋值）
         temp_assignment = assignment.copy()
         temp_assignment[var] = value
-
-        # 检查所有相关约束
-        for constraint in self.constraints:
-            if var in constraint.scope:
-                if not constraint.is_satisfied(temp_assignment):
-                    return False
+        for constraint in ready:
+            if not constraint.is_satisfied(temp_assignment):
+                return False
         return True
 
     def is_complete(self, assignment: Dict[Variable, Value]) -> bool:
@@ -207,6 +300,32 @@ class CSP:
         from .algorithms.backtracking import count_solutions
         return count_solutions(self, max_count)
 
+    def count_solutions_parallel(self, max_count: int = 1000, workers: Optional[int] = None) -> int:
+        """
+        Count solutions like count_solutions, splitting the root variable's values
+        across worker processes.
+
+        Args:
+            max_count (int): Maximum number of solutions to count
+            workers (Optional[int]): Number of worker processes
+
+        Returns:
+            int: Number of solutions found (capped at max_count)
+        """
+        from .algorithms.backtracking import count_solutions_parallel
+        return count_solutions_parallel(self, max_count, workers)
+
+    def to_numba_arrays(self):
+        """
+        将 CSP 打包为整数数组形式（值域位掩码、有向弧、支持表），
+        供 algorithms.backtrack_numba.solve_masks 使用。
+
+        返回:
+            PackedCSP: 安装 NumPy 时字段为 NumPy 数组，否则为 Python 列表
+        """
+        from .algorithms.backtrack_numba import pack_csp
+        return pack_csp(self)
+
     def __repr__(self) -> str:
         """返回 CSP 问题的字符串表示"""
         return (
@@ -216,3 +335,36 @@ class CSP:
             f"  Constraints: {self.constraints}\n"
             f")"
         )
+
+
+def adjacency_matrix(csp: CSP) -> Tuple[Dict[Variable, int], Any]:
+    """
+    由 CSP._adjacency 构建约束图的 N x N 0/1 邻接矩阵。
+
+    行列顺序与 pack_csp 相同（sorted(csp.variables, key=str)）。变量的度为行和，
+    度启发式所需的未赋值邻居数为按未赋值变量掩码的行和。
+
+    返回:
+        Tuple[Dict[Variable, int], Any]: (变量 -> 行号, adj)；安装 NumPy 时 adj 为
+        uint8 数组，否则为嵌套列表
+    """
+    variables = sorted(csp.variables, key=str)
+    var_to_idx = {var: idx for idx, var in enumerate(variables)}
+    n = len(variables)
+    rows = []
+    cols = []
+    for var, neighbors in csp._adjacency.items():
+        row = var_to_idx[var]
+        for neighbor in neighbors:
+            rows.append(row)
+            cols.append(var_to_idx[neighbor])
+
+    if np is not None:
+        adj = np.zeros((n, n), dtype=np.uint8)
+        adj[rows, cols] = 1
+        return var_to_idx, adj
+
+    adj = [[0] * n for _ in range(n)]
+    for row, col in zip(rows, cols):
+        adj[row][col] = 1
+    return var_to_idx, adj
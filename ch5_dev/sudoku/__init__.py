@@ -0,0 +1,10 @@
+"""
+Sudoku CSP models and solvers.
+
+Importing the package loads the Numba backtracking kernel; ``_solve_numba``
+warms it up once at import (from the on-disk cache after the first compile)
+so later solver instances start instantly. See ``_solve_numba`` for the
+``NUMBA_CACHE_DIR`` setting.
+"""
+
+from . import _solve_numba
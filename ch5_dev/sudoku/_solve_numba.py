@@ -0,0 +1,149 @@
+"""
+Numeric Sudoku backtracking kernel.
+
+The kernel works purely on flat integer buffers so it can be compiled with
+``numba.njit`` when Numba (and NumPy) are installed:
+
+- ``grid``: 81 cell values, 0 for an empty cell
+- ``row_mask`` / ``col_mask`` / ``box_mask``: 9 used-digit bitmasks each
+- ``domains``: 81 candidate bitmasks (bit ``v-1`` set when digit ``v`` is allowed)
+- ``counters``: [attempts, depth, max_depth, constraint_checks, assigned]
+  (slot indices from ``csp._sudoku_counters``, shared with ``csp._ccore``)
+
+Without Numba the same functions run as plain Python, and ``NUMBA_AVAILABLE``
+tells callers whether the compiled path is worth using.
+
+The compiled kernel is pinned to a single signature (C-contiguous int8 grid,
+uint16 masks/domains, int64 counters), so it is compiled eagerly and the
+on-disk cache holds exactly one entry. Set ``NUMBA_CACHE_DIR`` to a persistent
+directory (e.g. a CI cache path) to reuse that compiled entry across runs.
+"""
+
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:  # pragma: no cover - optional acceleration
+    np = None
+    njit = None
+
+from csp._sudoku_counters import ASSIGNED, ATTEMPTS, CONSTRAINT_CHECKS, DEPTH, MAX_DEPTH, N_COUNTERS
+
+NUMBA_AVAILABLE = njit is not None
+
+KERNEL_SIGNATURE = "boolean(int8[::1], uint16[::1], uint16[::1], uint16[::1], uint16[::1], int64[::1])"
+
+
+
+def _solve(grid, row_mask, col_mask, box_mask, domains, counters):
+    """
+    First-empty-cell backtracking with an explicit depth-indexed trail.
+
+    Returns True when the grid is complete. Iteration (rather than recursion)
+    keeps the kernel friendly to ``njit(cache=True)``.
+    """
+    trail_idx = [0] * 82
+    trail_tried = [0] * 82
+
+    level = 0
+    descend = True
+    while True:
+        if descend:
+            counters[ATTEMPTS] += 1
+            counters[DEPTH] = level + 1
+            if level + 1 > counters[MAX_DEPTH]:
+                counters[MAX_DEPTH] = level + 1
+
+            if counters[ASSIGNED] == 81:
+                counters[DEPTH] = 0
+                return True
+
+            idx = 0
+            while grid[idx] != 0:
+                idx += 1
+            trail_idx[level] = idx
+            trail_tried[level] = 0
+        else:
+            idx = trail_idx[level]
+            bit = 1 << (grid[idx] - 1)
+            grid[idx] = 0
+            r = idx // 9
+            c = idx % 9
+            b = (r // 3) * 3 + c // 3
+            row_mask[r] ^= bit
+            col_mask[c] ^= bit
+            box_mask[b] ^= bit
+            counters[ASSIGNED] -= 1
+
+        r = idx // 9
+        c = idx % 9
+        b = (r // 3) * 3 + c // 3
+        candidates = domains[idx] & ~trail_tried[level]
+        descend = False
+        for value in range(1, 10):
+            bit = 1 << (value - 1)
+            if not candidates & bit:
+                continue
+            trail_tried[level] |= bit
+            counters[CONSTRAINT_CHECKS] += 3
+            if (row_mask[r] | col_mask[c] | box_mask[b]) & bit:
+                continue
+
+            grid[idx] = value
+            row_mask[r] |= bit
+            col_mask[c] |= bit
+            box_mask[b] |= bit
+            counters[ASSIGNED] += 1
+            level += 1
+            descend = True
+            break
+
+        if not descend:
+            if level == 0:
+                counters[DEPTH] = 0
+                return False
+            level -= 1
+
+
+if NUMBA_AVAILABLE:
+    _solve = njit(KERNEL_SIGNATURE, cache=True)(_solve)
+
+
+def solve_kernel(grid, row_mask, col_mask, box_mask, domains, counters):
+    """Run the (possibly compiled) kernel on prepared buffers."""
+    return _solve(grid, row_mask, col_mask, box_mask, domains, counters)
+
+
+def as_kernel_buffers(grid, row_mask, col_mask, box_mask, domains, counters):
+    """Copy Python sequences into the typed NumPy buffers the compiled kernel expects."""
+    return (
+        np.ascontiguousarray(grid, dtype=np.int8),
+        np.ascontiguousarray(row_mask, dtype=np.uint16),
+        np.ascontiguousarray(col_mask, dtype=np.uint16),
+        np.ascontiguousarray(box_mask, dtype=np.uint16),
+        np.ascontiguousarray(domains, dtype=np.uint16),
+        np.ascontiguousarray(counters, dtype=np.int64),
+    )
+
+
+def _warmup() -> None:
+    """Run the kernel once on a solved (empty-trail) state so the cached entry is loaded up front."""
+    grid = np.zeros(81, dtype=np.int8)
+    masks = [np.zeros(9, dtype=np.uint16) for _ in range(3)]
+    domains = np.full(81, 0x1FF, dtype=np.uint16)
+    counters = np.zeros(N_COUNTERS, dtype=np.int64)
+    counters[ASSIGNED] = 81
+    _solve(grid, masks[0], masks[1], masks[2], domains, counters)
+
+
+_warmed_up = False
+
+
+def warmup() -> None:
+    """Load the compiled kernel once per process; a no-op without Numba."""
+    global _warmed_up
+    if NUMBA_AVAILABLE and not _warmed_up:
+        _warmup()
+        _warmed_up = True
+
+
+warmup()
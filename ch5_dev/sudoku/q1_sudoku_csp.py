@@ -5,14 +5,16 @@ This module creates a CSP model for standard 9x9 Sudoku puzzles.
 It includes the complete problem definition with variables, domains, and constraints.
 """
 
+import contextlib
 import sys
 import os
-from typing import Dict, Tuple
+from typing import Dict, FrozenSet, List, Set, Tuple, Union
 
 # Add parent directory to path to import csp module
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from csp import CSP, Constraint, Variable, Value, Domain, Scope, Relation
+from csp._sudoku_numba import all_different_bitmask, compile_check
 
 
 def all_different(*values: Value) -> bool:
@@ -28,6 +30,72 @@ def all_different(*values: Value) -> bool:
     return len(set(values)) == len(values)
 
 
+# Row-major cell order; solvers work on the int index and convert back only for output
+SUDOKU_CELLS: Tuple[Tuple[int, int], ...] = tuple((r, c) for r in range(1, 10) for c in range(1, 10))
+CELL_INDEX: Dict[Tuple[int, int], int] = {cell: idx for idx, cell in enumerate(SUDOKU_CELLS)}
+
+# Puzzle given either as {(row, col): digit} or as 81 row-major bytes (0 = empty)
+FlatPuzzle = Union[bytes, bytearray]
+Puzzle = Union[Dict[Tuple[int, int], int], FlatPuzzle]
+
+# Shared single-value domains for givens, indexed by digit
+GIVEN_DOMAINS: Tuple[frozenset, ...] = tuple(frozenset((v,)) for v in range(10))
+
+# 0-based row / column / box number of every cell, looked up by index
+ROW_OF: Tuple[int, ...] = tuple(r - 1 for r, _ in SUDOKU_CELLS)
+COL_OF: Tuple[int, ...] = tuple(c - 1 for _, c in SUDOKU_CELLS)
+BOX_OF: Tuple[int, ...] = tuple((r - 1) // 3 * 3 + (c - 1) // 3 for r, c in SUDOKU_CELLS)
+
+
+def build_sudoku_peers() -> Tuple[Tuple[int, ...], ...]:
+    """
+    Precompute the 20 peers (same row, column or box) of every cell
+
+    Cells are indexed row-major: idx = (r-1)*9 + (c-1).
+
+    Returns:
+        Tuple[Tuple[int, ...], ...]: Sorted peer indices for each of the 81 cells
+    """
+    peers: List[Tuple[int, ...]] = []
+    for idx in range(81):
+        row, col, box = ROW_OF[idx], COL_OF[idx], BOX_OF[idx]
+        cell_peers = tuple(
+            other
+            for other in range(81)
+            if other != idx and (ROW_OF[other] == row or COL_OF[other] == col or BOX_OF[other] == box)
+        )
+        peers.append(cell_peers)
+    return tuple(peers)
+
+
+# Static for the standard grid, so built once and shared by every Sudoku CSP
+SUDOKU_PEERS = build_sudoku_peers()
+
+
+def add_all_different(
+    csp: CSP,
+    cells: Tuple[Tuple[int, int], ...],
+    seen_scopes: Set[FrozenSet[Tuple[int, int]]],
+) -> bool:
+    """
+    Add an all-different constraint over ``cells`` unless one over the same cells exists
+
+    Args:
+        csp (CSP): The Sudoku CSP problem
+        cells (Tuple[Tuple[int, int], ...]): Constraint scope
+        seen_scopes (Set[FrozenSet[Tuple[int, int]]]): Scopes already added, updated in place
+
+    Returns:
+        bool: True if the constraint was added, False if it was a duplicate
+    """
+    key = frozenset(cells)
+    if key in seen_scopes:
+        return False
+    seen_scopes.add(key)
+    csp.add_constraint(Constraint(cells, all_different_bitmask))
+    return True
+
+
 def create_sudoku_csp() -> CSP:
     """
     Create a CSP model for standard 9x9 Sudoku problem
@@ -43,28 +111,28 @@ def create_sudoku_csp() -> CSP:
     csp = CSP()
 
     # 1. Variable Set X: All 81 cells in the 9x9 grid
-    variables = [(r, c) for r in range(1, 10) for c in range(1, 10)]
+    variables = list(SUDOKU_CELLS)
 
     # 2. Domain Set D: Each variable can take values 1-9
-    domain = set(range(1, 10))
+    # Immutable and shared by all cells; solvers that prune copy it first
+    domain = frozenset(range(1, 10))
 
     # Add all variables with their domains
     for var in variables:
         csp.add_variable(var, domain)
 
     # 3. Constraint Set C: Row, Column, and Box constraints
+    seen_scopes: Set[FrozenSet[Tuple[int, int]]] = set()
 
     # Row constraints (9 constraints)
     for r in range(1, 10):
         row_cells = tuple((r, c) for c in range(1, 10))
-        row_constraint = Constraint(row_cells, all_different)
-        csp.add_constraint(row_constraint)
+        add_all_different(csp, row_cells, seen_scopes)
 
     # Column constraints (9 constraints)
     for c in range(1, 10):
         col_cells = tuple((r, c) for r in range(1, 10))
-        col_constraint = Constraint(col_cells, all_different)
-        csp.add_constraint(col_constraint)
+        add_all_different(csp, col_cells, seen_scopes)
 
     # Box constraints (9 constraints)
     # Each box is a 3x3 subgrid
@@ -76,31 +144,63 @@ def create_sudoku_csp() -> CSP:
                     r = box_row * 3 + dr + 1
                     c = box_col * 3 + dc + 1
                     box_cells.append((r, c))
-            box_constraint = Constraint(tuple(box_cells), all_different)
-            csp.add_constraint(box_constraint)
+            add_all_different(csp, tuple(box_cells), seen_scopes)
+
+    # Index map and peer table for solvers that work on flat cell indices
+    csp._cell_index = CELL_INDEX
+    csp._peers = SUDOKU_PEERS
+    # Whole-assignment consistency check specialised to these 27 scopes
+    csp._fast_check = compile_check(csp.constraints)
 
     return csp
 
 
-def apply_puzzle_constraints(csp: CSP, puzzle: Dict[Tuple[int, int], int]) -> CSP:
+def apply_puzzle_constraints(csp: CSP, puzzle: Puzzle) -> CSP:
     """
     Apply initial puzzle constraints by modifying variable domains
 
     Args:
         csp (CSP): The Sudoku CSP problem
-        puzzle (Dict[Tuple[int, int], int]): Initial puzzle state (filled cells)
+        puzzle (Puzzle): Initial puzzle state, as a dict of filled cells or a
+            flat 81-byte buffer (0 = empty)
 
     Returns:
         CSP: Modified CSP with initial constraints applied
     """
-    for (row, col), value in puzzle.items():
-        # Create a domain with only the given value
-        single_value_domain = {value}
-        csp.domains[(row, col)] = single_value_domain
+    if isinstance(puzzle, (bytes, bytearray)):
+        # Walk the flat buffer directly; no per-cell tuple keys to hash
+        givens = ((SUDOKU_CELLS[idx], value) for idx, value in enumerate(puzzle) if value)
+    else:
+        givens = puzzle.items()
+
+    for cell, value in givens:
+        # Use a domain with only the given value
+        csp.domains[cell] = GIVEN_DOMAINS[value]
 
     return csp
 
 
+def puzzle_from_flat(flat: FlatPuzzle) -> Dict[Tuple[int, int], int]:
+    """
+    Convert a flat 81-byte puzzle into the {(row, col): digit} form used by the solvers
+    """
+    return {SUDOKU_CELLS[idx]: value for idx, value in enumerate(flat) if value}
+
+
+# Sample puzzle, row-major, 0 = empty
+PUZZLE_FLAT = bytes((
+    5, 3, 0, 0, 7, 0, 0, 0, 0,
+    6, 0, 0, 1, 9, 5, 0, 0, 0,
+    0, 9, 8, 0, 0, 0, 0, 6, 0,
+    8, 0, 0, 0, 6, 0, 0, 0, 3,
+    4, 0, 0, 8, 0, 3, 0, 0, 1,
+    7, 0, 0, 0, 2, 0, 0, 0, 6,
+    0, 6, 2, 0, 0, 0, 0, 8, 0,
+    0, 0, 0, 4, 1, 9, 0, 0, 5,
+    0, 0, 0, 0, 8, 0, 0, 7, 9,
+))
+
+
 def get_sample_sudoku_puzzle() -> Dict[Tuple[int, int], int]:
     """
     Return a sample Sudoku puzzle (moderately difficult)
@@ -108,17 +208,7 @@ def get_sample_sudoku_puzzle() -> Dict[Tuple[int, int], int]:
     0 represents empty cells in the visual representation
     The puzzle has a unique solution
     """
-    puzzle = {
-        (1, 1): 5, (1, 2): 3, (1, 5): 7,
-        (2, 1): 6, (2, 4): 1, (2, 5): 9, (2, 6): 5,
-        (3, 2): 9, (3, 3): 8, (3, 8): 6,
-        (4, 1): 8, (4, 5): 6, (4, 9): 3,
-        (5, 1): 4, (5, 4): 8, (5, 6): 3, (5, 9): 1,
-        (6, 1): 7, (6, 5): 2, (6, 9): 6,
-        (7, 2): 6, (7, 3): 2, (7, 8): 8,
-        (8, 4): 4, (8, 5): 1, (8, 6): 9, (8, 9): 5,
-        (9, 5): 8, (9, 8): 7, (9, 9): 9
-    }
+    puzzle = puzzle_from_flat(PUZZLE_FLAT)
 
 #     puzzle = {
 #     (1, 1): 5, (1, 2): 3, (1, 3): 4, (1, 4): 6, (1, 5): 7, (1, 6): 8, (1, 7): 9, (1, 8): 1, (1, 9): 2,
@@ -135,15 +225,17 @@ def get_sample_sudoku_puzzle() -> Dict[Tuple[int, int], int]:
     return puzzle
 
 
-def visualize_sudoku_puzzle(puzzle: Dict[Tuple[int, int], int]) -> None:
+def visualize_sudoku_puzzle(puzzle: Puzzle) -> None:
     """
     Visualize a Sudoku puzzle in a readable format
 
     Args:
-        puzzle (Dict[Tuple[int, int], int]): Puzzle state
+        puzzle (Puzzle): Puzzle state, as a dict of filled cells or a flat 81-byte buffer
     """
-    print("Sudoku Puzzle:")
-    print("┌─────────┬─────────┬─────────┐")
+    if isinstance(puzzle, (bytes, bytearray)):
+        puzzle = puzzle_from_flat(puzzle)
+
+    lines = ["Sudoku Puzzle:", "┌─────────┬─────────┬─────────┐"]
 
     for r in range(1, 10):
         row_str = "│"
@@ -151,18 +243,20 @@ def visualize_sudoku_puzzle(puzzle: Dict[Tuple[int, int], int]) -> None:
             if c in [4, 7]:
                 row_str += " │"
 
-            if (r, c) in puzzle:
-                row_str += f" {puzzle[(r, c)]}"
-            else:
-                row_str += " ."
+            value = puzzle.get((r, c))
+            row_str += f" {value}" if value is not None else " ."
 
         row_str += " │"
-        print(row_str)
+        lines.append(row_str)
 
         if r in [3, 6]:
-            print("├─────────┼─────────┼─────────┤")
+            lines.append("├─────────┼─────────┼─────────┤")
+
+    lines.append("└─────────┴─────────┴─────────┘")
 
-    print("└─────────┴─────────┴─────────┘")
+    # Build the grid first and write it once to avoid a flush per line
+    with contextlib.suppress(BrokenPipeError):
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 def main():
@@ -18,6 +18,10 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from csp.algorithms.inference_backtracking import InferenceBacktrackingSolver
 from q1_sudoku_csp import (
+    BOX_OF,
+    CELL_INDEX,
+    COL_OF,
+    ROW_OF,
     apply_puzzle_constraints,
     create_sudoku_csp,
     get_sample_sudoku_puzzle,
@@ -40,6 +44,44 @@ DEFAULT_HEURISTIC_FLAGS = {
     "use_lcv": True,
 }
 
+# Units touching each cell (row, 9 + col, 18 + box) for the 9x9 mask path.
+CELL_UNITS: Dict[SudokuCell, Tuple[int, int, int]] = {
+    cell: (ROW_OF[idx], 9 + COL_OF[idx], 18 + BOX_OF[idx]) for cell, idx in CELL_INDEX.items()
+}
+
+
+def _domain_mask(domain: Iterable[int]) -> int:
+    mask = 0
+    for value in domain:
+        mask |= 1 << (value - 1)
+    return mask
+
+
+def _unit_state(assignment: SudokuGrid) -> Tuple[List[int], List[int]]:
+    """Return per-unit (digit mask, assigned count) for the 27 Sudoku units."""
+    masks = [0] * 27
+    counts = [0] * 27
+    for cell, value in assignment.items():
+        bit = 1 << (value - 1)
+        for unit in CELL_UNITS[cell]:
+            masks[unit] |= bit
+            counts[unit] += 1
+    return masks, counts
+
+
+def _blocked_mask(cell: SudokuCell, masks: List[int], counts: List[int]) -> int:
+    """
+    Digits ``csp.is_consistent`` would reject for an unassigned ``cell``.
+
+    An all-different unit only fails once its scope is fully assigned, i.e.
+    when the other eight cells already hold values.
+    """
+    blocked = 0
+    for unit in CELL_UNITS[cell]:
+        if counts[unit] == 8:
+            blocked |= masks[unit]
+    return blocked
+
 
 class HeuristicInferenceBacktrackingSolver(InferenceBacktrackingSolver):
     """
@@ -68,23 +110,41 @@ class HeuristicInferenceBacktrackingSolver(InferenceBacktrackingSolver):
     def _prepare(self, csp) -> None:  # type: ignore[override]
         super()._prepare(csp)
         self._reset_heuristic_counters()
+        self._use_masks = getattr(csp, "_cell_index", None) is CELL_INDEX
+        self._metrics.update(
+            use_mrv=self.use_mrv,
+            use_degree=self.use_degree,
+            use_lcv=self.use_lcv,
+            mrv_applications=0,
+            degree_applications=0,
+            lcv_applications=0,
+        )
 
     def _select_unassigned_variable(self, assignment):  # type: ignore[override]
         if self.csp is None:
             raise RuntimeError("Solver must be prepared with a CSP before searching.")
 
-        candidates: List[Tuple[SudokuCell, List[int], int]] = []
+        if self._use_masks:
+            masks, counts = _unit_state(assignment)
+
+        candidates: List[Tuple[SudokuCell, int, int]] = []
         for var in sorted(self.csp.variables, key=str):
             if var in assignment:
                 continue
 
-            legal_values: List[int] = []
-            for value in self.current_domains[var]:
-                if self.csp.is_consistent(var, value, assignment):
-                    legal_values.append(value)
+            if self._use_masks:
+                # Popcount of the candidate mask replaces one is_consistent call per value.
+                legal_mask = _domain_mask(self.current_domains[var]) & ~_blocked_mask(var, masks, counts)
+                legal_count = legal_mask.bit_count()
+            else:
+                legal_count = sum(
+                    1
+                    for value in self.current_domains[var]
+                    if self.csp.is_consistent(var, value, assignment)
+                )
 
             degree = sum(1 for neighbor in self.neighbors.get(var, []) if neighbor not in assignment)
-            candidates.append((var, legal_values, degree))
+            candidates.append((var, legal_count, degree))
 
         if not candidates:
             return None
@@ -97,8 +157,8 @@ class HeuristicInferenceBacktrackingSolver(InferenceBacktrackingSolver):
 
         if self.use_mrv and filtered:
             self.mrv_applications += 1
-            min_domain = min(len(item[1]) for item in filtered)
-            filtered = [item for item in filtered if len(item[1]) == min_domain]
+            min_domain = min(item[1] for item in filtered)
+            filtered = [item for item in filtered if item[1] == min_domain]
 
         filtered.sort(key=lambda item: str(item[0]))
         selected_var, _, _ = filtered[0]
@@ -112,35 +172,65 @@ class HeuristicInferenceBacktrackingSolver(InferenceBacktrackingSolver):
         if self.csp is None:
             raise RuntimeError("Solver must be prepared with a CSP before searching.")
 
-        scored: List[Tuple[int, int]] = []
-        for value in values:
-            assignment[var] = value
-            impact = 0
-            for neighbor in self.neighbors.get(var, []):
-                if neighbor in assignment:
-                    continue
-                for neighbor_value in self.current_domains[neighbor]:
-                    if not self.csp.is_consistent(neighbor, neighbor_value, assignment):
-                        impact += 1
-            del assignment[var]
-            scored.append((impact, value))
+        if self._use_masks:
+            scored = self._score_values_by_mask(var, values, assignment)
+        else:
+            scored = []
+            for value in values:
+                assignment[var] = value
+                impact = 0
+                for neighbor in self.neighbors.get(var, []):
+                    if neighbor in assignment:
+                        continue
+                    for neighbor_value in self.current_domains[neighbor]:
+                        if not self.csp.is_consistent(neighbor, neighbor_value, assignment):
+                            impact += 1
+                del assignment[var]
+                scored.append((impact, value))
 
         self.lcv_applications += 1
         scored.sort(key=lambda item: (item[0], str(item[1])))
         return [value for _, value in scored]
 
+    def _score_values_by_mask(self, var, values, assignment) -> List[Tuple[int, int]]:
+        """LCV impact per value: neighbour domain values ruled out once ``var = value``."""
+        masks, counts = _unit_state(assignment)
+        var_units = CELL_UNITS[var]
+        for unit in var_units:
+            counts[unit] += 1
+
+        open_neighbors = [
+            (neighbor, _domain_mask(self.current_domains[neighbor]))
+            for neighbor in self.neighbors.get(var, [])
+            if neighbor not in assignment
+        ]
+
+        scored: List[Tuple[int, int]] = []
+        for value in values:
+            bit = 1 << (value - 1)
+            impact = 0
+            for neighbor, domain_mask in open_neighbors:
+                blocked = 0
+                for unit in CELL_UNITS[neighbor]:
+                    if counts[unit] != 8:
+                        continue
+                    if unit not in var_units:
+                        blocked |= masks[unit]
+                    elif masks[unit] & bit:
+                        # ``value`` already clashes inside the completed unit, so
+                        # every value of the neighbour is rejected.
+                        blocked = -1
+                    else:
+                        blocked |= masks[unit] | bit
+                impact += (domain_mask & blocked).bit_count()
+            scored.append((impact, value))
+        return scored
+
     def solve_with_metrics(self, csp):  # type: ignore[override]
         solution, metrics = super().solve_with_metrics(csp)
-        metrics.update(
-            {
-                "use_mrv": self.use_mrv,
-                "use_degree": self.use_degree,
-                "use_lcv": self.use_lcv,
-                "mrv_applications": int(self.mrv_applications),
-                "degree_applications": int(self.degree_applications),
-                "lcv_applications": int(self.lcv_applications),
-            }
-        )
+        metrics["mrv_applications"] = int(self.mrv_applications)
+        metrics["degree_applications"] = int(self.degree_applications)
+        metrics["lcv_applications"] = int(self.lcv_applications)
         return solution, metrics
 
 
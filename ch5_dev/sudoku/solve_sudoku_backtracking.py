@@ -5,10 +5,12 @@ This script uses basic backtracking search to solve Sudoku puzzles.
 It measures and reports performance metrics including time, space, and attempt counts.
 """
 
+import argparse
 import sys
 import os
 import time
 import tracemalloc
+from array import array
 from typing import Dict, Optional, Tuple
 
 # Add parent directory to path to import csp module
@@ -16,7 +18,39 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from csp import CSP, Variable, Value
 from csp.algorithms.backtracking import backtracking_search
-from q1_sudoku_csp import create_sudoku_csp, get_sample_sudoku_puzzle, apply_puzzle_constraints
+try:
+    import resource
+except ImportError:  # not available on Windows; fall back to tracemalloc
+    resource = None
+
+from q1_sudoku_csp import (
+    BOX_OF,
+    CELL_INDEX,
+    COL_OF,
+    ROW_OF,
+    SUDOKU_CELLS,
+    apply_puzzle_constraints,
+    create_sudoku_csp,
+    get_sample_sudoku_puzzle,
+)
+from sudoku import _solve_numba
+
+try:
+    from csp import _ccore  # optional Cython build: cythonize -i csp/_ccore.pyx
+except ImportError:
+    _ccore = None
+
+
+# Zero templates used to reset the pooled search buffers in place
+_ZERO_CELLS = array('b', bytes(81))
+_ZERO_UNITS = array('H', bytes(18))
+_ZERO_COUNTERS = array('q', bytes(8 * _solve_numba.N_COUNTERS))
+
+
+def _peak_rss_bytes() -> int:
+    """Peak resident set size of this process (ru_maxrss is KiB on Linux, bytes on macOS)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
 
 
 class InstrumentedBacktracking:
@@ -24,16 +58,30 @@ class InstrumentedBacktracking:
     Wrapper class to instrument backtracking search with performance metrics
     """
 
-    def __init__(self):
+    def __init__(self, detailed_memory: bool = False):
+        # tracemalloc hooks every allocation, so it is only enabled on request;
+        # by default the process peak RSS is read once after the search
+        self.detailed_memory = detailed_memory or resource is None
         self.attempt_count = 0
         self.recursion_depth = 0
         self.max_recursion_depth = 0
         self.constraint_checks = 0
         self.csp = None
         self.progress_interval = 10000  # Report progress every 10,000 attempts
+        self._ticks_left = self.progress_interval
         self.last_progress_time = time.time()
         self.start_time = None
 
+        # 9x9 fast-path buffers, allocated once and reset in place on every solve
+        self.grid = array('b', bytes(81))
+        self.row_mask = array('H', bytes(18))
+        self.col_mask = array('H', bytes(18))
+        self.box_mask = array('H', bytes(18))
+        self.domain_masks = array('H', bytes(162))
+        self.trail_idx = array('b', bytes(81))
+        self.trail_tried = array('H', bytes(162))
+        self.kernel_counters = array('q', bytes(8 * _solve_numba.N_COUNTERS))
+
     def solve_with_metrics(self, csp: CSP) -> Optional[Dict[Variable, Value]]:
         """
         Solve CSP using basic backtracking with performance measurement
@@ -43,9 +91,12 @@ class InstrumentedBacktracking:
         self.recursion_depth = 0
         self.max_recursion_depth = 0
         self.constraint_checks = 0
+        # Countdown to the next progress report (avoids a modulo per attempt)
+        self._ticks_left = self.progress_interval
 
-        # Start memory tracing and timing
-        tracemalloc.start()
+        # Start memory tracing (only in detailed mode) and timing
+        if self.detailed_memory:
+            tracemalloc.start()
         start_time = time.time()
         self.start_time = start_time
         self.last_progress_time = start_time
@@ -55,13 +106,23 @@ class InstrumentedBacktracking:
         print("-" * 50)
 
         # Solve using instrumented backtracking
-        assignment = {}
-        solution = self._instrumented_recursive_backtrack(assignment)
+        if getattr(csp, '_cell_index', None) is CELL_INDEX:
+            solution = self._solve_bitmask()
+        else:
+            # Domains are never pruned here, so freeze each one as a tuple up front
+            self.domain_values = {var: tuple(domain) for var, domain in csp.domains.items()}
+            self._assigned = 0
+            self._total_variables = len(csp.variables)
+            assignment = {}
+            solution = self._instrumented_recursive_backtrack(assignment)
 
         # Calculate metrics
         end_time = time.time()
-        current, peak = tracemalloc.get_traced_memory()
-        tracemalloc.stop()
+        if self.detailed_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        else:
+            peak = _peak_rss_bytes()
 
         time_elapsed = end_time - start_time
         memory_peak = peak / 1024 / 1024  # Convert to MB
@@ -118,16 +179,23 @@ class InstrumentedBacktracking:
         """
         Instrumented version of recursive backtracking that tracks performance metrics
         """
+        # Bind per-call lookups to locals; the value loop below is the hot path
+        csp = self.csp
+        is_consistent = csp.is_consistent
+        nconstraints = len(csp.constraints)
+
         self.attempt_count += 1
         self.recursion_depth += 1
         self.max_recursion_depth = max(self.max_recursion_depth, self.recursion_depth)
 
         # Report progress periodically
-        if self.attempt_count % self.progress_interval == 0:
+        self._ticks_left -= 1
+        if not self._ticks_left:
+            self._ticks_left = self.progress_interval
             self._report_progress()
 
-        # Base case: if assignment is complete, return solution
-        if self.csp.is_complete(assignment):
+        # Base case: every variable assigned (tracked by counter, no is_complete scan)
+        if self._assigned == self._total_variables:
             self.recursion_depth -= 1
             return assignment
 
@@ -138,12 +206,14 @@ class InstrumentedBacktracking:
             return None
 
         # Try each value in the domain
-        for value in self.csp.domains[var]:
+        domain_vals = self.domain_values[var]
+        for value in domain_vals:
             # Check consistency
-            self.constraint_checks += len(self.csp.constraints)
-            if self.csp.is_consistent(var, value, assignment):
+            self.constraint_checks += nconstraints
+            if is_consistent(var, value, assignment):
                 # Make assignment
                 assignment[var] = value
+                self._assigned += 1
 
                 # Recursive call
                 result = self._instrumented_recursive_backtrack(assignment)
@@ -155,13 +225,169 @@ class InstrumentedBacktracking:
 
                 # Backtrack
                 del assignment[var]
+                self._assigned -= 1
 
         self.recursion_depth -= 1
         return None
 
+    def _solve_bitmask(self) -> Optional[Dict[Variable, Value]]:
+        """
+        9x9 fast path: flat int8 grid plus uint16 row/col/box masks.
+
+        A consistency check is three ``&`` operations instead of a scan over
+        every constraint; completeness is tracked with an assigned-cell counter.
+        """
+        self.grid[:] = _ZERO_CELLS
+        self.row_mask[:] = _ZERO_UNITS
+        self.col_mask[:] = _ZERO_UNITS
+        self.box_mask[:] = _ZERO_UNITS
+        self.cell_values = [tuple(sorted(self.csp.domains[cell])) for cell in SUDOKU_CELLS]
+        for idx, values in enumerate(self.cell_values):
+            self.domain_masks[idx] = sum(1 << (v - 1) for v in values)
+        self.assigned = 0
+
+        # Puzzle singletons seed the masks; clashing givens mean no solution.
+        for idx, values in enumerate(self.cell_values):
+            if len(values) != 1:
+                continue
+            value = values[0]
+            bit = 1 << (value - 1)
+            r, c, b = ROW_OF[idx], COL_OF[idx], BOX_OF[idx]
+            self.constraint_checks += 3
+            if (self.row_mask[r] | self.col_mask[c] | self.box_mask[b]) & bit:
+                return None
+            self.grid[idx] = value
+            self.row_mask[r] |= bit
+            self.col_mask[c] |= bit
+            self.box_mask[b] |= bit
+            self.assigned += 1
+
+        if _ccore is not None:
+            solved = self._run_ccore_kernel()
+        elif _solve_numba.NUMBA_AVAILABLE:
+            solved = self._run_compiled_kernel()
+        else:
+            solved = self._instrumented_bitmask_search()
+        if not solved:
+            return None
+        return {cell: self.grid[idx] for idx, cell in enumerate(SUDOKU_CELLS)}
+
+    def _run_ccore_kernel(self) -> bool:
+        """Run the Cython kernel directly on the solver's array buffers."""
+        counters = self.kernel_counters
+        counters[:] = _ZERO_COUNTERS
+        counters[_solve_numba.CONSTRAINT_CHECKS] = self.constraint_checks
+        counters[_solve_numba.ASSIGNED] = self.assigned
+        solved = bool(_ccore.solve_sudoku(
+            self.domain_masks, self.row_mask, self.col_mask, self.box_mask, self.grid, counters
+        ))
+
+        self.attempt_count = counters[_solve_numba.ATTEMPTS]
+        self.max_recursion_depth = counters[_solve_numba.MAX_DEPTH]
+        self.constraint_checks = counters[_solve_numba.CONSTRAINT_CHECKS]
+        self.assigned = counters[_solve_numba.ASSIGNED]
+        return solved
+
+    def _run_compiled_kernel(self) -> bool:
+        """
+        Hand the prepared state to the Numba kernel and copy results back.
+
+        Progress lines are not emitted here; the compiled search cannot call
+        back into Python.
+        """
+        counters = [0] * _solve_numba.N_COUNTERS
+        counters[_solve_numba.CONSTRAINT_CHECKS] = self.constraint_checks
+        counters[_solve_numba.ASSIGNED] = self.assigned
+        grid, rows, cols, boxes, doms, counts = _solve_numba.as_kernel_buffers(
+            self.grid, self.row_mask, self.col_mask, self.box_mask, self.domain_masks, counters
+        )
+        solved = bool(_solve_numba.solve_kernel(grid, rows, cols, boxes, doms, counts))
+
+        self.grid[:] = array('b', grid.tolist())
+        self.attempt_count = int(counts[_solve_numba.ATTEMPTS])
+        self.max_recursion_depth = int(counts[_solve_numba.MAX_DEPTH])
+        self.constraint_checks = int(counts[_solve_numba.CONSTRAINT_CHECKS])
+        self.assigned = int(counts[_solve_numba.ASSIGNED])
+        return solved
+
+    def _instrumented_bitmask_search(self) -> bool:
+        """
+        Iterative backtracking over the bitmask state (same metrics as the dict version).
+
+        Each search level keeps the cell it branched on and the candidate bits
+        already tried in depth-indexed trail arrays, so no Python frame is
+        pushed per assignment.
+        """
+        grid = self.grid
+        row_mask, col_mask, box_mask = self.row_mask, self.col_mask, self.box_mask
+        domain_masks = self.domain_masks
+        trail_idx = self.trail_idx
+        trail_tried = self.trail_tried
+        progress_interval = self.progress_interval
+        ticks_left = self._ticks_left
+
+        level = 0
+        descend = True
+        while True:
+            if descend:
+                self.attempt_count += 1
+                if level + 1 > self.max_recursion_depth:
+                    self.max_recursion_depth = level + 1
+                ticks_left -= 1
+                if not ticks_left:
+                    ticks_left = progress_interval
+                    self.recursion_depth = level + 1
+                    self._report_progress()
+
+                if self.assigned == 81:
+                    self.recursion_depth = 0
+                    self._ticks_left = ticks_left
+                    return True
+
+                idx = grid.index(0)
+                trail_idx[level] = idx
+                trail_tried[level] = 0
+            else:
+                # Returning from a failed child: undo this level's assignment.
+                idx = trail_idx[level]
+                bit = 1 << (grid[idx] - 1)
+                grid[idx] = 0
+                row_mask[ROW_OF[idx]] ^= bit
+                col_mask[COL_OF[idx]] ^= bit
+                box_mask[BOX_OF[idx]] ^= bit
+                self.assigned -= 1
+
+            r, c, b = ROW_OF[idx], COL_OF[idx], BOX_OF[idx]
+            candidates = domain_masks[idx] & ~trail_tried[level]
+            descend = False
+            while candidates:
+                bit = candidates & -candidates
+                candidates ^= bit
+                trail_tried[level] |= bit
+                self.constraint_checks += 3
+                if (row_mask[r] | col_mask[c] | box_mask[b]) & bit:
+                    continue
+
+                grid[idx] = bit.bit_length()
+                row_mask[r] |= bit
+                col_mask[c] |= bit
+                box_mask[b] |= bit
+                self.assigned += 1
+                level += 1
+                descend = True
+                break
+
+            if not descend:
+                if level == 0:
+                    self.recursion_depth = 0
+                    self._ticks_left = ticks_left
+                    return False
+                level -= 1
+
     def _select_unassigned_variable(self, assignment: Dict[Variable, Value]) -> Optional[Variable]:
         """Select the first unassigned variable"""
-        for var in self.csp.variables:
+        variables = self.csp.variables
+        for var in variables:
             if var not in assignment:
                 return var
         return None
@@ -225,10 +451,8 @@ def analyze_solution_complexity(solution: Dict[Tuple[int, int], int],
             row_counts.setdefault(r, set()).add(value)
             # Count by columns
             col_counts.setdefault(c, set()).add(value)
-            # Count by boxes
-            box_row, box_col = (r-1)//3, (c-1)//3
-            box_key = (box_row, box_col)
-            box_counts.setdefault(box_key, set()).add(value)
+            # Count by boxes (0-8, row-major)
+            box_counts.setdefault(BOX_OF[CELL_INDEX[(r, c)]], set()).add(value)
 
         # Check for duplicates
         valid = True
@@ -246,6 +470,14 @@ def main():
     """
     Main function to solve Sudoku using basic backtracking
     """
+    parser = argparse.ArgumentParser(description="Solve the sample Sudoku with basic backtracking")
+    parser.add_argument(
+        "--detailed-memory",
+        action="store_true",
+        help="trace Python allocations with tracemalloc (slower) instead of reading peak RSS",
+    )
+    args = parser.parse_args()
+
     print("Sudoku Solver - Basic Backtracking")
     print("=" * 40)
 
@@ -276,7 +508,7 @@ def main():
     print(f"\nSolving with Basic Backtracking...")
     print("(This may take some time for 9x9 Sudoku...)")
 
-    solver = InstrumentedBacktracking()
+    solver = InstrumentedBacktracking(detailed_memory=args.detailed_memory)
     solution, metrics = solver.solve_with_metrics(csp_with_puzzle)
 
     # Display results
@@ -0,0 +1,217 @@
+"""
+Sudoku Solver - Best-First Search
+
+Alternative to depth-first backtracking: every open search state lives in a
+priority queue and the most constrained one (fewest remaining candidates in
+total, deeper states first on ties) is expanded next. States are compact -
+81 candidate bitmasks plus the filled grid - and forward checking over the
+precomputed peer table prunes each child before it is queued.
+
+The metrics dictionary matches ``InstrumentedHeuristicBacktracking`` so the
+existing printers in ``sudoku_solver.py`` can be reused.
+"""
+
+import heapq
+import os
+import sys
+import time
+import tracemalloc
+from itertools import count
+from typing import Any, Dict, List, Optional, Tuple
+
+# Add parent directory to path to import csp module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from csp import CSP, Variable, Value
+from q1_sudoku_csp import CELL_INDEX, SUDOKU_CELLS, SUDOKU_PEERS
+from solve_sudoku_backtracking import _peak_rss_bytes, resource
+
+SearchState = Tuple[int, int, int, List[int], bytearray]
+
+
+class InstrumentedBestFirst:
+    """
+    Best-first Sudoku search that records the same metrics as the backtracking solvers.
+    """
+
+    def __init__(
+        self,
+        *,
+        progress_interval: int = 10000,
+        name: str = "Best-First Search",
+        detailed_memory: bool = False,
+    ) -> None:
+        self.progress_interval = progress_interval
+        self.name = name
+        # Same memory metric as InstrumentedBacktracking: peak RSS by default,
+        # tracemalloc (which hooks every child-state copy) only on request
+        self.detailed_memory = detailed_memory or resource is None
+        self.csp: Optional[CSP] = None
+        self._reset_counters()
+
+    def _reset_counters(self) -> None:
+        self.attempt_count = 0
+        self.max_recursion_depth = 0
+        self.constraint_checks = 0
+        self.domain_reductions = 0
+        self.variable_selections = 0
+        self.mrv_applications = 0
+        self.max_frontier = 0
+        self.start_time = 0.0
+        self.initial_assignment_size = 0
+
+    def solve_with_metrics(
+        self,
+        csp: CSP,
+        initial_assignment: Optional[Dict[Variable, Value]] = None,
+    ) -> Tuple[Optional[Dict[Variable, Value]], Dict[str, Any]]:
+        """
+        Run best-first search on a standard 9x9 Sudoku CSP and capture search metrics.
+        """
+        if getattr(csp, "_cell_index", None) is not CELL_INDEX:
+            raise ValueError("Best-first search requires a CSP built by create_sudoku_csp().")
+
+        self.csp = csp
+        self._reset_counters()
+
+        if self.detailed_memory:
+            tracemalloc.start()
+        self.start_time = time.time()
+
+        root = self._initial_state(initial_assignment or {})
+        solution = self._search(root) if root is not None else None
+
+        end_time = time.time()
+        if self.detailed_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        else:
+            peak = _peak_rss_bytes()
+
+        metrics: Dict[str, Any] = {
+            "time_seconds": end_time - self.start_time,
+            "memory_peak_mb": peak / 1024 / 1024,
+            "attempt_count": self.attempt_count,
+            "max_recursion_depth": self.max_recursion_depth,
+            "constraint_checks": self.constraint_checks,
+            "domain_reductions": self.domain_reductions,
+            "variable_selections": self.variable_selections,
+            "mrv_applications": self.mrv_applications,
+            "degree_applications": 0,
+            "lcv_applications": 0,
+            "selection_attempt_ratio": self.variable_selections / max(1, self.attempt_count),
+            "total_variables": len(csp.variables),
+            "constraints": len(csp.constraints),
+            "avg_domain_size": sum(len(csp.domains[var]) for var in csp.variables) / len(csp.variables),
+            "efficiency": self.constraint_checks / self.attempt_count if self.attempt_count else 0.0,
+            "use_mrv": True,
+            "use_degree": False,
+            "use_lcv": False,
+            "solver_name": self.name,
+            "progress_interval": self.progress_interval,
+            "solution_found": solution is not None,
+            "initial_assignment_size": self.initial_assignment_size,
+            "max_frontier": self.max_frontier,
+        }
+        return solution, metrics
+
+    # ------------------------------------------------------------------ Search
+
+    def _initial_state(self, initial_assignment: Dict[Variable, Value]) -> Optional[Tuple[List[int], bytearray]]:
+        """Build root masks from the CSP domains and place givens / singletons."""
+        domains = [0] * 81
+        for idx, cell in enumerate(SUDOKU_CELLS):
+            for value in self.csp.domains[cell]:
+                domains[idx] |= 1 << (value - 1)
+
+        for var, value in initial_assignment.items():
+            if var not in CELL_INDEX:
+                raise ValueError(f"Initial assignment contains unknown variable: {var}")
+            idx = CELL_INDEX[var]
+            if not domains[idx] & (1 << (value - 1)):
+                raise ValueError(
+                    f"Initial assignment for {var} uses value {value} which is outside its domain."
+                )
+            domains[idx] = 1 << (value - 1)
+
+        grid = bytearray(81)
+        for idx in range(81):
+            mask = domains[idx]
+            if mask and not mask & (mask - 1):
+                if not self._place(domains, grid, idx, mask):
+                    return None
+        self.initial_assignment_size = sum(1 for value in grid if value)
+        return domains, grid
+
+    def _place(self, domains: List[int], grid: bytearray, idx: int, bit: int) -> bool:
+        """Assign ``bit`` to cell ``idx`` and forward-check its peers; False on a wipe-out."""
+        grid[idx] = bit.bit_length()
+        domains[idx] = bit
+        for peer in SUDOKU_PEERS[idx]:
+            self.constraint_checks += 1
+            mask = domains[peer]
+            if mask & bit:
+                mask ^= bit
+                if not mask:
+                    return False
+                domains[peer] = mask
+        return True
+
+    def _search(self, root: Tuple[List[int], bytearray]) -> Optional[Dict[Variable, Value]]:
+        tie_breaker = count()
+        domains, grid = root
+        frontier: List[SearchState] = [(self._score(domains), 0, next(tie_breaker), domains, grid)]
+
+        while frontier:
+            _, neg_depth, _, domains, grid = heapq.heappop(frontier)
+            depth = -neg_depth
+            self.attempt_count += 1
+            self.max_recursion_depth = max(self.max_recursion_depth, depth + 1)
+            if self.progress_interval > 0 and self.attempt_count % self.progress_interval == 0:
+                self._report_progress(len(frontier), depth)
+
+            # MRV: open cell with the fewest remaining candidates
+            best_idx = -1
+            best_count = 10
+            for idx in range(81):
+                if grid[idx]:
+                    continue
+                remaining = domains[idx].bit_count()
+                if remaining < best_count:
+                    best_idx, best_count = idx, remaining
+            if best_idx < 0:
+                return {cell: grid[idx] for idx, cell in enumerate(SUDOKU_CELLS)}
+
+            self.variable_selections += 1
+            self.mrv_applications += 1
+            candidates = domains[best_idx]
+            while candidates:
+                bit = candidates & -candidates
+                candidates ^= bit
+                child_domains = domains[:]
+                child_grid = grid[:]
+                self.domain_reductions += 1
+                if self._place(child_domains, child_grid, best_idx, bit):
+                    heapq.heappush(
+                        frontier,
+                        (self._score(child_domains), -(depth + 1), next(tie_breaker), child_domains, child_grid),
+                    )
+            self.max_frontier = max(self.max_frontier, len(frontier))
+
+        return None
+
+    @staticmethod
+    def _score(domains: List[int]) -> int:
+        """Total remaining candidates across the grid (lower is closer to a solution)."""
+        return sum(mask.bit_count() for mask in domains)
+
+    def _report_progress(self, frontier_size: int, depth: int) -> None:
+        elapsed = time.time() - self.start_time
+        rate = self.attempt_count / elapsed if elapsed > 0 else 0
+        print(
+            f"[PROGRESS] Expanded: {self.attempt_count:,} | "
+            f"Time: {elapsed:.1f}s | "
+            f"Rate: {rate:,.0f}/s | "
+            f"Frontier: {frontier_size:,} | "
+            f"Depth: {depth}"
+        )
@@ -66,9 +66,10 @@ def print_sudoku_grid(grid: Optional[Assignment], title: str) -> None:
     line_sep = "+-------+-------+-------+"
     print(line_sep)
     for r in range(1, 10):
+        # One lookup per cell; 0 / missing cells render as "."
         row_values = [
-            str(grid.get((r, c), ".")) if grid.get((r, c), 0) != 0 else "."
-            for c in range(1, 10)
+            str(value) if value else "."
+            for value in (grid.get((r, c), 0) for c in range(1, 10))
         ]
         print("| {} {} {} | {} {} {} | {} {} {} |".format(*row_values))
         if r % 3 == 0:
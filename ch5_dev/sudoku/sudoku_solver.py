@@ -19,6 +19,7 @@ from q1_sudoku_csp import (
     create_sudoku_csp,
     get_sample_sudoku_puzzle,
 )
+from solve_sudoku_best_first import InstrumentedBestFirst
 
 SudokuCell = Tuple[int, int]
 Assignment = Dict[SudokuCell, int]
@@ -33,20 +34,29 @@ def solve_sudoku_puzzle(
     use_lcv: bool = True,
     progress_interval: int = 10000,
     solver_name: str = "Sudoku Heuristic Solver",
+    method: str = "backtracking",
 ) -> Tuple[Optional[Assignment], Metrics]:
     """
     Solve a Sudoku puzzle using the instrumented heuristic backtracking solver.
+
+    ``method="best_first"`` switches to ``InstrumentedBestFirst`` (the heuristic
+    flags are ignored there); the metrics dictionary has the same keys.
     """
     csp = create_sudoku_csp()
     apply_puzzle_constraints(csp, puzzle)
 
-    solver = InstrumentedHeuristicBacktracking(
-        use_mrv=use_mrv,
-        use_degree=use_degree,
-        use_lcv=use_lcv,
-        progress_interval=progress_interval,
-        name=solver_name,
-    )
+    if method == "best_first":
+        solver = InstrumentedBestFirst(progress_interval=progress_interval, name=solver_name)
+    elif method == "backtracking":
+        solver = InstrumentedHeuristicBacktracking(
+            use_mrv=use_mrv,
+            use_degree=use_degree,
+            use_lcv=use_lcv,
+            progress_interval=progress_interval,
+            name=solver_name,
+        )
+    else:
+        raise ValueError(f"Unknown solving method: {method}")
 
     solution, metrics = solver.solve_with_metrics(csp, initial_assignment=puzzle)
     typed_solution = solution if solution is None else dict(solution)
@@ -64,9 +74,10 @@ def print_sudoku_grid(grid: Optional[Assignment], title: str) -> None:
     line_sep = "+-------+-------+-------+"
     print(line_sep)
     for r in range(1, 10):
+        # One lookup per cell; 0 / missing cells render as "."
         row_values = [
-            str(grid.get((r, c), ".")) if grid.get((r, c), 0) != 0 else "."
-            for c in range(1, 10)
+            str(value) if value else "."
+            for value in (grid.get((r, c), 0) for c in range(1, 10))
         ]
         print("| {} {} {} | {} {} {} | {} {} {} |".format(*row_values))
         if r % 3 == 0:
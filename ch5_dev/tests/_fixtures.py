@@ -0,0 +1,224 @@
+"""
+Shared CSP builders for the ch5_dev tests.
+
+The Australia map colouring and 9x9 Sudoku models used to live inside their
+demo test modules, and other tests imported them from there (pulling in
+networkx/matplotlib along the way). They now live here, with no side effects
+at import time.
+"""
+
+from functools import lru_cache
+from typing import Dict, FrozenSet, Tuple
+
+from csp import CSP, Constraint, Value, Variable
+from csp._sudoku_numba import all_different_bitmask, compile_check
+
+
+_AUSTRALIA_VARIABLES = ("WA", "NT", "QLD", "NSW", "VIC", "SA", "TAS")
+_COLORS = frozenset({"Red", "Green", "Blue"})  # Using English color names
+
+# Based on actual Australia map adjacency
+_AUSTRALIA_EDGES = (
+    ("WA", "NT"),
+    ("WA", "SA"),
+    ("NT", "SA"),
+    ("NT", "QLD"),
+    ("SA", "QLD"),
+    ("SA", "NSW"),
+    ("SA", "VIC"),
+    ("QLD", "NSW"),
+    ("NSW", "VIC"),
+    ("VIC", "TAS"),  # corrected VIC-TAS constraint
+)
+
+# Adjacent regions must have different colors; one relation object shared by every edge
+_NEQ_REL = frozenset((a, b) for a in _COLORS for b in _COLORS if a != b)
+
+
+def create_australia_map_csp() -> CSP:
+    """
+    Create the CSP model for Australia map coloring problem
+
+    Variable set X = {WA, NT, QLD, NSW, VIC, SA, TAS}
+    Domain set D_v = {Red, Green, Blue} for all v in X
+    Constraint set C contains all binary constraints for adjacent regions with different colors
+
+    Returns:
+        CSP: Configured Australia map coloring CSP problem
+    """
+    csp = CSP()
+
+    for var in _AUSTRALIA_VARIABLES:
+        csp.add_variable(var, _COLORS)
+
+    for var1, var2 in _AUSTRALIA_EDGES:
+        csp.add_constraint(Constraint((var1, var2), _NEQ_REL))
+
+    return csp
+
+
+# Australia map with the NSW/Q/V/T abbreviations, used by the inference tests;
+# WA and T are pinned to "red" in every instance (see instantiate_australia_csp)
+AustraliaTemplate = Tuple[
+    Dict[Variable, Tuple[Variable, ...]],
+    FrozenSet[Value],
+    Tuple[Tuple[Variable, Variable], ...],
+    FrozenSet[Tuple[Value, Value]],
+]
+
+
+@lru_cache(maxsize=1)
+def australia_csp_template() -> AustraliaTemplate:
+    """Immutable pieces of the Australia CSP, built once per test session."""
+    adjacency: Dict[Variable, Tuple[Variable, ...]] = {
+        "WA": ("NT", "SA"),
+        "NT": ("WA", "SA", "Q"),
+        "SA": ("WA", "NT", "Q", "NSW", "V"),
+        "Q": ("NT", "SA", "NSW"),
+        "NSW": ("Q", "SA", "V"),
+        "V": ("SA", "NSW"),
+        "T": (),
+    }
+
+    colors = frozenset({"red", "green", "blue"})
+
+    # Shared allowed-pair relation: adjacent regions take different colours
+    not_equal = frozenset((a, b) for a in colors for b in colors if a != b)
+
+    # The adjacency lists are symmetric, so each edge is taken once from its smaller end
+    edges = [
+        (region, neighbour)
+        for region, neighbours in adjacency.items()
+        for neighbour in neighbours
+        if region < neighbour
+    ]
+
+    return adjacency, colors, tuple(edges), not_equal
+
+
+def instantiate_australia_csp(template: AustraliaTemplate) -> CSP:
+    """Fresh mutable CSP from the cached template (domains are per-instance sets)."""
+    adjacency, colors, edges, not_equal = template
+    csp = CSP()
+    for region in adjacency:
+        csp.add_variable(region, set(colors))
+
+    # Symmetry breaking: colours are interchangeable, so fixing WA loses no
+    # solutions up to renaming; T has no neighbours and any colour works.
+    csp.domains["WA"] = {"red"}
+    csp.domains["T"] = {"red"}
+    for edge in edges:
+        csp.add_constraint(Constraint(edge, not_equal))
+    return csp
+
+
+def build_pinned_australia_csp() -> Tuple[CSP, Dict[Variable, Tuple[Variable, ...]]]:
+    """Fresh pinned Australia CSP together with its adjacency lists."""
+    template = australia_csp_template()
+    return instantiate_australia_csp(template), template[0]
+
+
+def assert_valid_coloring(csp: CSP, adjacency: Dict[Variable, Tuple[Variable, ...]], solution: Dict[Variable, Value]) -> None:
+    """The solution satisfies the CSP and no two neighbours share a colour."""
+    assert csp.is_solution(solution)
+    for region, neighbours in adjacency.items():
+        for neighbour in neighbours:
+            assert solution[region] != solution[neighbour]
+
+
+def create_sudoku_csp() -> CSP:
+    """
+    Create a CSP model for standard 9x9 Sudoku problem
+
+    Variable set X = {(r, c) | r, c ∈ {1, 2, ..., 9}}
+    Domain set D = {{1, 2, ..., 9} | v ∈ X}
+    Constraint set C = C_rows ∪ C_cols ∪ C_boxes
+
+    Returns:
+        CSP: Configured Sudoku CSP problem
+    """
+    # Create CSP instance
+    csp = CSP()
+
+    # 1. Variable Set X: All 81 cells in the 9x9 grid
+    variables = [(r, c) for r in range(1, 10) for c in range(1, 10)]
+
+    # 2. Domain Set D: Each variable can take values 1-9
+    domain = set(range(1, 10))
+
+    # Add all variables with their domains
+    for var in variables:
+        csp.add_variable(var, domain)
+
+    # 3. Constraint Set C: Row, Column, and Box constraints
+
+    # Row constraints (9 constraints)
+    for r in range(1, 10):
+        row_cells = tuple((r, c) for c in range(1, 10))
+        row_constraint = Constraint(row_cells, all_different_bitmask)
+        csp.add_constraint(row_constraint)
+
+    # Column constraints (9 constraints)
+    for c in range(1, 10):
+        col_cells = tuple((r, c) for r in range(1, 10))
+        col_constraint = Constraint(col_cells, all_different_bitmask)
+        csp.add_constraint(col_constraint)
+
+    # Box constraints (9 constraints)
+    # Each box is a 3x3 subgrid
+    for box_row in range(3):  # 0, 1, 2
+        for box_col in range(3):  # 0, 1, 2
+            box_cells = []
+            for dr in range(3):
+                for dc in range(3):
+                    r = box_row * 3 + dr + 1
+                    c = box_col * 3 + dc + 1
+                    box_cells.append((r, c))
+            box_constraint = Constraint(tuple(box_cells), all_different_bitmask)
+            csp.add_constraint(box_constraint)
+
+    # Whole-assignment consistency check specialised to these 27 scopes
+    csp._fast_check = compile_check(csp.constraints)
+
+    return csp
+
+
+def apply_puzzle_constraints(csp: CSP, puzzle: Dict[Tuple[int, int], int]) -> CSP:
+    """
+    Apply initial puzzle constraints by modifying variable domains
+
+    Args:
+        csp (CSP): The Sudoku CSP problem
+        puzzle (Dict[Tuple[int, int], int]): Initial puzzle state (filled cells)
+
+    Returns:
+        CSP: Modified CSP with initial constraints applied
+    """
+    for (row, col), value in puzzle.items():
+        # Create a domain with only the given value
+        single_value_domain = {value}
+        csp.domains[(row, col)] = single_value_domain
+
+    return csp
+
+
+def get_sample_sudoku_puzzle() -> Dict[Tuple[int, int], int]:
+    """
+    Return a sample Sudoku puzzle (moderately difficult)
+
+    0 represents empty cells in the visual representation
+    The puzzle has a unique solution
+    """
+    puzzle = {
+        (1, 1): 5, (1, 2): 3, (1, 5): 7,
+        (2, 1): 6, (2, 4): 1, (2, 5): 9, (2, 6): 5,
+        (3, 2): 9, (3, 3): 8, (3, 8): 6,
+        (4, 1): 8, (4, 5): 6, (4, 9): 3,
+        (5, 1): 4, (5, 4): 8, (5, 6): 3, (5, 9): 1,
+        (6, 1): 7, (6, 5): 2, (6, 9): 6,
+        (7, 2): 6, (7, 3): 2, (7, 8): 8,
+        (8, 4): 4, (8, 5): 1, (8, 6): 9, (8, 9): 5,
+        (9, 5): 8, (9, 8): 7, (9, 9): 9
+    }
+
+    return puzzle
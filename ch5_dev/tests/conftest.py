@@ -0,0 +1,17 @@
+"""
+Pytest configuration shared by every test module under ``tests/``.
+
+Puts ``ch5_dev`` (for ``import csp`` / ``import tests._fixtures``) and the
+repository root (for ``import ch5_dev...``) on ``sys.path`` once, so the
+individual test files no longer patch the path themselves.
+"""
+
+import os
+import sys
+
+CH5_DEV_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_ROOT = os.path.dirname(CH5_DEV_DIR)
+
+for path in (CH5_DEV_DIR, REPO_ROOT):
+    if path not in sys.path:
+        sys.path.append(path)
@@ -6,53 +6,13 @@ These tests reuse the Australia map colouring CSP to exercise:
 2. The full combination of forward checking, propagation, and arc consistency.
 """
 
-from typing import Dict, Tuple
-
-from ch5_dev.csp.csp_core import CSP, Constraint, Variable, Value
+from ch5_dev.csp.csp_core import CSP, Constraint
 from ch5_dev.csp.algorithms.inference_backtracking import inference_backtracking_with_metrics
-
-
-def _build_australia_csp() -> Tuple[CSP, Dict[Variable, Tuple[Variable, ...]]]:
-    adjacency: Dict[Variable, Tuple[Variable, ...]] = {
-        "WA": ("NT", "SA"),
-        "NT": ("WA", "SA", "Q"),
-        "SA": ("WA", "NT", "Q", "NSW", "V"),
-        "Q": ("NT", "SA", "NSW"),
-        "NSW": ("Q", "SA", "V"),
-        "V": ("SA", "NSW"),
-        "T": (),
-    }
-
-    colors = {"red", "green", "blue"}
-    csp = CSP()
-
-    for region in adjacency:
-        csp.add_variable(region, set(colors))
-
-    def not_equal(x: Value, y: Value) -> bool:
-        return x != y
-
-    seen = set()
-    for region, neighbours in adjacency.items():
-        for neighbour in neighbours:
-            edge = tuple(sorted((region, neighbour)))
-            if edge in seen:
-                continue
-            seen.add(edge)
-            csp.add_constraint(Constraint((region, neighbour), not_equal))
-
-    return csp, adjacency
-
-
-def _assert_valid_solution(csp: CSP, adjacency: Dict[Variable, Tuple[Variable, ...]], solution: Dict[Variable, Value]) -> None:
-    assert csp.is_solution(solution)
-    for region, neighbours in adjacency.items():
-        for neighbour in neighbours:
-            assert solution[region] != solution[neighbour]
+from tests._fixtures import assert_valid_coloring, build_pinned_australia_csp
 
 
 def test_arc_consistency_demo() -> None:
-    csp, adjacency = _build_australia_csp()
+    csp, adjacency = build_pinned_australia_csp()
     solution, metrics = inference_backtracking_with_metrics(
         csp,
         techniques=("arc_consistency",),
@@ -61,11 +21,11 @@ def test_arc_consistency_demo() -> None:
     assert solution is not None, "arc consistency failed to find a solution"
     assert "arc_consistency" in metrics["techniques"]
     assert metrics["arc_revisions"] >= 1
-    _assert_valid_solution(csp, adjacency, solution)
+    assert_valid_coloring(csp, adjacency, solution)
 
 
 def test_full_inference_stack_demo() -> None:
-    csp, adjacency = _build_australia_csp()
+    csp, adjacency = build_pinned_australia_csp()
     solution, metrics = inference_backtracking_with_metrics(
         csp,
         techniques=("forward_checking", "constraint_propagation", "arc_consistency"),
@@ -78,14 +38,45 @@ def test_full_inference_stack_demo() -> None:
     assert metrics["forward_check_prunes"] >= 1
     assert metrics["propagation_steps"] >= 0
     assert metrics["arc_revisions"] >= 0
-    _assert_valid_solution(csp, adjacency, solution)
+    assert_valid_coloring(csp, adjacency, solution)
+
+
+def test_initial_ac3_solves_without_backtracking() -> None:
+    csp, adjacency = build_pinned_australia_csp()
+    csp.domains["WA"] = {"red"}
+    csp.domains["SA"] = {"green"}
+    solution, metrics = inference_backtracking_with_metrics(
+        csp,
+        techniques=("arc_consistency",),
+        initial_ac3=True,
+    )
+
+    assert solution is not None
+    assert metrics["ac3_revisions"] >= 4  # NT, Q, NSW and V collapse to one colour
+    assert metrics["backtracks"] == 0
+    assert_valid_coloring(csp, adjacency, solution)
+
+
+def test_support_masks_match_predicate_revise() -> None:
+    csp, _ = build_pinned_australia_csp()
+    predicate_csp = CSP()
+    for var in csp.variables:
+        predicate_csp.add_variable(var, csp.domains[var])
+    for constraint in csp.constraints:
+        predicate_csp.add_constraint(Constraint(constraint.scope, lambda x, y: x != y))
+
+    _, relation_metrics = inference_backtracking_with_metrics(csp, techniques=("arc_consistency",))
+    _, predicate_metrics = inference_backtracking_with_metrics(predicate_csp, techniques=("arc_consistency",))
+
+    assert relation_metrics["arc_revisions"] == predicate_metrics["arc_revisions"]
+    assert relation_metrics["nodes_expanded"] == predicate_metrics["nodes_expanded"]
 
 
 def run_demo() -> None:
     """
     Convenience entry point: run the solver with all inference techniques enabled.
     """
-    csp, _ = _build_australia_csp()
+    csp, adjacency = build_pinned_australia_csp()
     solution, metrics = inference_backtracking_with_metrics(
         csp,
         techniques=("forward_checking", "constraint_propagation", "arc_consistency"),
@@ -95,7 +86,8 @@ def run_demo() -> None:
         return
 
     print("Australia map colouring solution (FC + CP + AC-3):")
-    for region in sorted(solution):
+    # Adjacency keys are in the fixed region order, so no sort is needed
+    for region in adjacency:
         print(f"  {region}: {solution[region]}")
 
     print("\nMetrics:")
@@ -7,74 +7,13 @@ This test script implements the CSP model for Australia map coloring problem, in
 3. Basic CSP model validation
 """
 
-import sys
 import os
 
-# 添加父目录到路径，以便导入csp模块
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from csp import CSP, Constraint, Variable, Value, Domain, Scope, Relation
-import networkx as nx
-import matplotlib.pyplot as plt
+from tests._fixtures import create_australia_map_csp
 from typing import Set, Tuple
 
 
-def create_australia_map_csp() -> CSP:
-    """
-    Create the CSP model for Australia map coloring problem
-
-    Variable set X = {WA, NT, QLD, NSW, VIC, SA, TAS}
-    Domain set D_v = {Red, Green, Blue} for all v in X
-    Constraint set C contains all binary constraints for adjacent regions with different colors
-
-    Returns:
-        CSP: Configured Australia map coloring CSP problem
-    """
-    # Create CSP instance
-    csp = CSP()
-
-    # Define variables and domains
-    variables = ["WA", "NT", "QLD", "NSW", "VIC", "SA", "TAS"]
-    colors = {"Red", "Green", "Blue"}  # Using English color names
-
-    # Add all variables and their domains
-    for var in variables:
-        csp.add_variable(var, colors)
-
-    # Define adjacency relations (constraint scopes)
-    # Based on actual Australia map adjacency
-    adjacent_pairs = [
-        ("WA", "NT"),    # Constraint 1: WA adjacent to NT
-        ("WA", "SA"),    # Constraint 2: WA adjacent to SA
-        ("NT", "SA"),    # Constraint 3: NT adjacent to SA
-        ("NT", "QLD"),   # Constraint 4: NT adjacent to QLD
-        ("SA", "QLD"),   # Constraint 5: SA adjacent to QLD
-        ("SA", "NSW"),   # Constraint 6: SA adjacent to NSW
-        ("SA", "VIC"),   # Constraint 7: SA adjacent to VIC
-        ("QLD", "NSW"),  # Constraint 8: QLD adjacent to NSW
-        ("NSW", "VIC"),  # Constraint 9: NSW adjacent to VIC
-        ("VIC", "TAS")   # Constraint 10: VIC adjacent to TAS (corrected constraint)
-    ]
-
-    # Create constraints: adjacent regions must have different colors
-    for var1, var2 in adjacent_pairs:
-        # Create constraint scope
-        scope = (var1, var2)
-
-        # Create constraint relation: combinations with different colors only
-        relation = set()
-        for color1 in colors:
-            for color2 in colors:
-                if color1 != color2:  # Adjacent regions must have different colors
-                    relation.add((color1, color2))
-
-        # Create and add constraint
-        constraint = Constraint(scope, relation)
-        csp.add_constraint(constraint)
-
-    return csp
-
-
 def visualize_csp_graph(csp: CSP, save_path: str = None) -> None:
     """
     Visualize the constraint relation graph of CSP problem
@@ -83,23 +22,25 @@ def visualize_csp_graph(csp: CSP, save_path: str = None) -> None:
         csp (CSP): CSP problem to visualize
         save_path (str): Image save path, if None then display directly
     """
+    # Plotting dependencies are only needed here; importing them lazily keeps
+    # test collection free of the networkx/matplotlib start-up cost
+    import networkx as nx
+    import matplotlib.pyplot as plt
+
     # Create undirected graph
     G = nx.Graph()
 
     # Add all variables as nodes
-    for var in csp.variables:
-        G.add_node(var)
-
-    # Add constraint relations as edges
-    edges = set()
-    for constraint in csp.constraints:
-        if len(constraint.scope) == 2:  # Only handle binary constraints
-            var1, var2 = constraint.scope
-            # Add undirected edge (ensure no duplicates)
-            edge = tuple(sorted([var1, var2]))
-            edges.add(edge)
+    G.add_nodes_from(csp.variables)
 
-    G.add_edges_from(edges)
+    # Add constraint relations as edges, read from the CSP's adjacency index
+    # (each undirected edge once, from its smaller endpoint)
+    G.add_edges_from(
+        (var, neighbor)
+        for var, neighbors in csp._adjacency.items()
+        for neighbor in neighbors
+        if var < neighbor
+    )
 
     # Set graph layout
     plt.figure(figsize=(12, 8))
@@ -156,105 +97,48 @@ def test_csp_model():
     """
     Test the completeness and correctness of CSP model
     """
-    print("=" * 60)
-    print("Australia Map Coloring CSP Model Test")
-    print("=" * 60)
-
     # Create CSP model
     csp = create_australia_map_csp()
 
     # Test 1: Check variable set
-    print("\n1. Variable Set Test:")
     expected_variables = {"WA", "NT", "QLD", "NSW", "VIC", "SA", "TAS"}
-    actual_variables = csp.variables
-
-    print(f"   Expected variables: {expected_variables}")
-    print(f"   Actual variables: {actual_variables}")
-    print(f"   ✓ Variable set correct: {expected_variables == actual_variables}")
+    assert csp.variables == expected_variables
 
     # Test 2: Check domain set
-    print("\n2. Domain Set Test:")
     expected_domain = {"Red", "Green", "Blue"}
-    domains_correct = True
-
     for var in csp.variables:
-        actual_domain = csp.domains[var]
-        print(f"   {var}: {actual_domain}")
-        if actual_domain != expected_domain:
-            domains_correct = False
-            print(f"   ✗ {var} domain is incorrect")
+        assert csp.domains[var] == expected_domain, f"Bad domain for {var}: {csp.domains[var]}"
 
-    print(f"   ✓ All variable domains correct: {domains_correct}")
-
-    # Test 3: Check constraint set
-    print("\n3. Constraint Set Test:")
+    # Test 3: Check constraint set (undirected edges as alphabetically ordered name pairs)
     expected_constraints = {
-        frozenset({"WA", "NT"}),
-        frozenset({"WA", "SA"}),
-        frozenset({"NT", "SA"}),
-        frozenset({"NT", "QLD"}),
-        frozenset({"SA", "QLD"}),
-        frozenset({"SA", "NSW"}),
-        frozenset({"SA", "VIC"}),
-        frozenset({"QLD", "NSW"}),
-        frozenset({"NSW", "VIC"}),
-        frozenset({"VIC", "TAS"})  # Corrected VIC-TAS constraint
+        ("NT", "WA"),
+        ("SA", "WA"),
+        ("NT", "SA"),
+        ("NT", "QLD"),
+        ("QLD", "SA"),
+        ("NSW", "SA"),
+        ("SA", "VIC"),
+        ("NSW", "QLD"),
+        ("NSW", "VIC"),
+        ("TAS", "VIC")  # Corrected VIC-TAS constraint
     }
 
-    actual_constraints = set()
-    for constraint in csp.constraints:
-        if len(constraint.scope) == 2:
-            actual_constraints.add(frozenset(constraint.scope))
-
-    print(f"   Expected constraint count: {len(expected_constraints)}")
-    print(f"   Actual constraint count: {len(actual_constraints)}")
+    actual_constraints = {tuple(sorted(constraint.scope)) for constraint in csp.constraints}
 
     missing_constraints = expected_constraints - actual_constraints
     extra_constraints = actual_constraints - expected_constraints
-
-    if missing_constraints:
-        print(f"   ✗ Missing constraints: {missing_constraints}")
-    if extra_constraints:
-        print(f"   ✗ Extra constraints: {extra_constraints}")
-
-    constraints_correct = len(missing_constraints) == 0 and len(extra_constraints) == 0
-    print(f"   ✓ Constraint set complete and correct: {constraints_correct}")
+    assert not missing_constraints, f"Missing constraints: {missing_constraints}"
+    assert not extra_constraints, f"Extra constraints: {extra_constraints}"
 
     # Test 4: Constraint relation verification
-    print("\n4. Constraint Relation Verification:")
     colors = {"Red", "Green", "Blue"}
-    relations_correct = True
-
+    expected_relation_size = len(colors) * (len(colors) - 1)  # 3 * 2 = 6
     for constraint in csp.constraints:
         if len(constraint.scope) == 2:
-            expected_relation_size = len(colors) * (len(colors) - 1)  # 3 * 2 = 6
-            actual_relation_size = len(constraint.relation)
-
-            if actual_relation_size != expected_relation_size:
-                relations_correct = False
-                var1, var2 = constraint.scope
-                print(f"   ✗ Constraint {var1}-{var2} relation size incorrect: expected{expected_relation_size}, actual{actual_relation_size}")
-
-    print(f"   ✓ All constraint relations correct: {relations_correct}")
-
-    # Overall test results
-    print("\n" + "=" * 60)
-    print("Test Summary:")
-    all_tests_passed = (expected_variables == actual_variables and
-                       domains_correct and
-                       constraints_correct and
-                       relations_correct)
-
-    if all_tests_passed:
-        print("🎉 All tests passed! CSP model is complete and correct.")
-        print("✓ Includes corrected VIC-TAS constraint")
-        print("✓ Variables, domains, and constraint sets all meet expectations")
-    else:
-        print("❌ Some tests failed, please check model implementation.")
-
-    print("=" * 60)
-
-    return csp
+            assert len(constraint.relation) == expected_relation_size, (
+                f"Constraint {constraint.scope} relation size incorrect: "
+                f"expected {expected_relation_size}, actual {len(constraint.relation)}"
+            )
 
 
 def main():
@@ -262,7 +146,9 @@ def main():
     Main function: run tests and visualization
     """
     # Run CSP model test
-    csp = test_csp_model()
+    test_csp_model()
+    print("All CSP model checks passed (includes corrected VIC-TAS constraint)")
+    csp = create_australia_map_csp()
 
     # Visualize constraint graph
     print("\nGenerating constraint visualization graph...")
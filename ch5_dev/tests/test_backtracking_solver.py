@@ -5,58 +5,20 @@ This test script demonstrates the backtracking solver functionality using
 both the Australia map coloring and Sudoku problems.
 """
 
-import sys
-import os
-from typing import Dict, Tuple
-
-# Add parent directory to path to import csp module
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pytest
 
 from csp import CSP, Constraint, backtracking_search
+from csp.algorithms.backtrack_numba import solve_masks
+from tests._fixtures import create_australia_map_csp, create_sudoku_csp
 
-# Import helper functions from existing test files
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-sys.path.append(os.path.dirname(__file__))
-
-try:
-    from test_australia_map_coloring import create_australia_map_csp
-    from test_sudoku_csp import create_sudoku_csp, get_sample_sudoku_puzzle, apply_puzzle_constraints
-except ImportError:
-    # Fallback implementations if imports fail
-    def create_australia_map_csp():
-        """Fallback Australia map coloring CSP"""
-        csp = CSP()
-        variables = ["WA", "NT", "QLD", "NSW", "VIC", "SA", "TAS"]
-        colors = {"Red", "Green", "Blue"}
-
-        for var in variables:
-            csp.add_variable(var, colors)
-
-        # Add adjacency constraints
-        adjacent_pairs = [
-            ("WA", "NT"), ("WA", "SA"), ("NT", "SA"), ("NT", "QLD"),
-            ("SA", "QLD"), ("SA", "NSW"), ("SA", "VIC"), ("QLD", "NSW"),
-            ("NSW", "VIC"), ("VIC", "TAS")
-        ]
-
-        def different_colors(c1, c2):
-            return c1 != c2
-
-        for var1, var2 in adjacent_pairs:
-            constraint = Constraint((var1, var2), different_colors)
-            csp.add_constraint(constraint)
-
-        return csp
-
-    def create_sudoku_csp():
-        """Fallback Sudoku CSP - return empty to avoid complexity"""
-        return None
-
-    def get_sample_sudoku_puzzle():
-        return {}
-
-    def apply_puzzle_constraints(csp, puzzle):
-        return csp
+# 4-Queens truth table, built once at import: whether rows r1, r2 clash depends
+# only on the column offset dc, so QUEEN_RELATIONS[dc] holds the allowed
+# (r1, r2) pairs for every queen pair that far apart.
+QUEEN_ROWS = frozenset({1, 2, 3, 4})
+QUEEN_RELATIONS = {
+    dc: frozenset((r1, r2) for r1 in QUEEN_ROWS for r2 in QUEEN_ROWS if r1 != r2 and abs(r1 - r2) != dc)
+    for dc in range(1, len(QUEEN_ROWS))
+}
 
 
 def test_australia_map_coloring_solver():
@@ -69,6 +31,10 @@ def test_australia_map_coloring_solver():
 
     # Create the CSP problem
     csp = create_australia_map_csp()
+
+    # Symmetry breaking: colours are interchangeable, so fixing WA loses no
+    # solutions up to renaming (TAS borders VIC here, so it stays free)
+    csp.domains["WA"] = {"Red"}
     print(f"Created Australia map coloring CSP with {len(csp.variables)} variables and {len(csp.constraints)} constraints")
 
     # Solve using basic backtracking
@@ -79,7 +45,7 @@ def test_australia_map_coloring_solver():
         if solution:
             print("SUCCESS: Solution found!")
             print("Solution assignment:")
-            for var in sorted(solution.keys()):
+            for var in csp._id2var:  # variables in the order they were added
                 print(f"  {var}: {solution[var]}")
 
             # Verify the solution
@@ -135,8 +101,7 @@ def test_simple_coloring_problem():
         csp.add_variable(var, colors)
 
     # Constraints: all pairs must have different colors
-    def all_different(value1, value2):
-        return value1 != value2
+    all_different = frozenset((c1, c2) for c1 in colors for c2 in colors if c1 != c2)
 
     pairs = [('A', 'B'), ('A', 'C'), ('B', 'C')]
     for var1, var2 in pairs:
@@ -169,6 +134,13 @@ def test_simple_coloring_problem():
     return csp
 
 
+def _add_all_diff_binary(csp, cells, neq_relation):
+    """Add an all-different unit as pairwise binary != constraints"""
+    for i in range(len(cells)):
+        for j in range(i + 1, len(cells)):
+            csp.add_constraint(Constraint((cells[i], cells[j]), neq_relation))
+
+
 def test_sudoku_solver():
     """
     Test backtracking solver with a simple 4x4 Sudoku variant
@@ -187,21 +159,18 @@ def test_sudoku_solver():
     for var in variables:
         csp.add_variable(var, domain)
 
-    # All-different constraint function
-    def all_different_4(*values):
-        return len(set(values)) == len(values)
+    # All-different units are decomposed into binary != constraints sharing one relation
+    neq_relation = frozenset((a, b) for a in domain for b in domain if a != b)
 
     # Row constraints (4 rows)
     for r in range(1, 5):
         row_cells = tuple((r, c) for c in range(1, 5))
-        constraint = Constraint(row_cells, all_different_4)
-        csp.add_constraint(constraint)
+        _add_all_diff_binary(csp, row_cells, neq_relation)
 
     # Column constraints (4 columns)
     for c in range(1, 5):
         col_cells = tuple((r, c) for r in range(1, 5))
-        constraint = Constraint(col_cells, all_different_4)
-        csp.add_constraint(constraint)
+        _add_all_diff_binary(csp, col_cells, neq_relation)
 
     # Box constraints (4 boxes of 2x2)
     for box_row in range(2):
@@ -212,8 +181,7 @@ def test_sudoku_solver():
                     r = box_row * 2 + dr + 1
                     c = box_col * 2 + dc + 1
                     box_cells.append((r, c))
-            constraint = Constraint(tuple(box_cells), all_different_4)
-            csp.add_constraint(constraint)
+            _add_all_diff_binary(csp, tuple(box_cells), neq_relation)
 
     print(f"Created 4x4 Sudoku CSP with {len(csp.variables)} variables and {len(csp.constraints)} constraints")
 
@@ -248,9 +216,23 @@ def test_sudoku_solver():
     except Exception as e:
         print(f"ERROR: {e}")
 
+    _check_packed_kernel(csp, solution)
+
     return csp
 
 
+def _check_packed_kernel(csp, reference):
+    """Solve the packed integer form and compare against the Python backtracker."""
+    packed = csp.to_numba_arrays()
+    assignment = [-1] * len(packed.variables)
+    found = solve_masks(packed.domain, packed.edges, packed.support, assignment)
+    print(f"\nPacked kernel: {len(packed.edges)} arcs, solution found: {found}")
+
+    assert found == (reference is not None)
+    if found:
+        assert csp.is_solution(packed.decode(assignment))
+
+
 def test_nqueens_small():
     """
     Test backtracking solver with small N-Queens problem (N=4)
@@ -265,31 +247,14 @@ def test_nqueens_small():
     # Variables: Q1, Q2, Q3, Q4 (queens in columns 1-4)
     # Values: row positions 1-4
     variables = ['Q1', 'Q2', 'Q3', 'Q4']
-    rows = {1, 2, 3, 4}
 
     for var in variables:
-        csp.add_variable(var, rows)
-
-    # Constraint: no two queens attack each other
-    def non_attacking(queen1_row, queen2_row, queen1_col, queen2_col):
-        """Check if two queens don't attack each other"""
-        # Different rows
-        if queen1_row == queen2_row:
-            return False
-        # Different diagonals
-        if abs(queen1_row - queen2_row) == abs(queen1_col - queen2_col):
-            return False
-        return True
-
-    # Add constraints for all pairs of queens
+        csp.add_variable(var, QUEEN_ROWS)
+
+    # Constraint: no two queens attack each other (shared per-offset truth table)
     for i, q1 in enumerate(variables):
-        for j, q2 in enumerate(variables):
-            if i < j:  # Avoid duplicate constraints
-                constraint = Constraint(
-                    (q1, q2),
-                    lambda r1, r2, c1=i+1, c2=j+1: non_attacking(r1, r2, c1, c2)
-                )
-                csp.add_constraint(constraint)
+        for j, q2 in enumerate(variables[i + 1:], i + 1):
+            csp.add_constraint(Constraint((q1, q2), QUEEN_RELATIONS[j - i]))
 
     print(f"Created 4-Queens CSP with {len(csp.variables)} variables and {len(csp.constraints)} constraints")
 
@@ -324,9 +289,53 @@ def test_nqueens_small():
     except Exception as e:
         print(f"ERROR: {e}")
 
+    _check_packed_kernel(csp, solution)
+
     return csp
 
 
+def test_pack_rejects_large_nary_constraints():
+    """
+    Packing the 9x9 Sudoku model would enumerate 9**9 tuples per all-different
+    constraint; it must fail fast with ValueError instead
+    """
+    with pytest.raises(ValueError, match="value tuples"):
+        create_sudoku_csp().to_numba_arrays()
+
+
+def test_count_solutions_cache_invalidation():
+    """
+    Memoized solution counts must be dropped when the CSP changes
+    """
+    csp = CSP()
+    for var in ('A', 'B', 'C'):
+        csp.add_variable(var, {'Red', 'Green', 'Blue'})
+    different = frozenset((a, b) for a in ('Red', 'Green', 'Blue') for b in ('Red', 'Green', 'Blue') if a != b)
+    csp.add_constraint(Constraint(('A', 'B'), different))
+    csp.add_constraint(Constraint(('B', 'C'), different))
+
+    assert csp.count_solutions() == 12
+    assert csp.count_solutions(max_count=5) == 5
+
+    # New constraint bumps the cache version
+    csp.add_constraint(Constraint(('A', 'C'), different))
+    assert csp.count_solutions() == 6
+
+    # Narrowing a domain in place is also picked up
+    csp.domains['A'] = {'Red'}
+    assert csp.count_solutions() == 2
+
+
+def test_count_solutions_parallel_matches_serial():
+    """
+    Splitting the count over root values gives the same (capped) totals
+    """
+    csp = create_australia_map_csp()
+
+    assert csp.count_solutions_parallel(workers=2) == csp.count_solutions()
+    assert csp.count_solutions_parallel(max_count=10, workers=2) == 10
+
+
 def main():
     """
     Run all backtracking solver tests
@@ -5,16 +5,14 @@ Each heuristic (MRV, degree, LCV) is verified independently to ensure the
 selection or ordering logic matches expectations.
 """
 
-import os
-import sys
 import unittest
-from typing import Dict, Set
+from array import array
+from typing import Dict, Iterator, Optional, Set, Tuple
 
-# Ensure project root is on path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from csp import CSP, Constraint, Variable, Value  # noqa: E402
-from csp.algorithms.heuristic_backtracking import (  # noqa: E402
+from csp import CSP, Constraint, Variable, Value
+from csp.csp_core import adjacency_matrix
+from tests._fixtures import create_sudoku_csp, get_sample_sudoku_puzzle
+from csp.algorithms.heuristic_backtracking import (
     order_domain_values,
     select_unassigned_variable,
 )
@@ -23,13 +21,63 @@ from csp.algorithms.heuristic_backtracking import (  # noqa: E402
 def build_neighbors(csp: CSP) -> Dict[Variable, Set[Variable]]:
     neighbors: Dict[Variable, Set[Variable]] = {var: set() for var in csp.variables}
     for constraint in csp.constraints:
-        scope = constraint.scope
-        for var in scope:
-            others = set(scope) - {var}
-            neighbors[var].update(others)
+        scope_set = set(constraint.scope)
+        for var in scope_set:
+            var_neighbors = neighbors[var]
+            var_neighbors |= scope_set
+            var_neighbors.discard(var)
     return neighbors
 
 
+class FlatAssignment:
+    """
+    Sudoku assignment stored as 81 signed bytes (0 = unassigned) instead of a dict.
+
+    Keys are 1-based ``(r, c)`` cells mapped to ``r * 9 + c - 10``; only the
+    mapping operations the solvers use are provided.
+    """
+
+    def __init__(self, data: Optional[array] = None) -> None:
+        self.data = data if data is not None else array('b', bytes(81))
+        self._count = sum(1 for v in self.data if v)
+
+    @staticmethod
+    def _index(cell: Tuple[int, int]) -> int:
+        r, c = cell
+        return r * 9 + c - 10
+
+    def __contains__(self, cell: Tuple[int, int]) -> bool:
+        return self.data[self._index(cell)] != 0
+
+    def __getitem__(self, cell: Tuple[int, int]) -> int:
+        value = self.data[self._index(cell)]
+        if not value:
+            raise KeyError(cell)
+        return value
+
+    def __setitem__(self, cell: Tuple[int, int], value: int) -> None:
+        idx = self._index(cell)
+        if not self.data[idx]:
+            self._count += 1
+        self.data[idx] = value
+
+    def __delitem__(self, cell: Tuple[int, int]) -> None:
+        idx = self._index(cell)
+        if not self.data[idx]:
+            raise KeyError(cell)
+        self.data[idx] = 0
+        self._count -= 1
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        return ((idx // 9 + 1, idx % 9 + 1) for idx, v in enumerate(self.data) if v)
+
+    def copy(self) -> "FlatAssignment":
+        return FlatAssignment(array('b', self.data))
+
+
 class HeuristicSelectionTests(unittest.TestCase):
     def test_mrv_prefers_smallest_domain(self) -> None:
         csp = CSP()
@@ -69,6 +117,37 @@ class HeuristicSelectionTests(unittest.TestCase):
 
         self.assertEqual(var, "X")
 
+    def test_adjacency_matrix_degrees_match_neighbors(self) -> None:
+        csp = CSP()
+        for var in ("W", "X", "Y", "Z"):
+            csp.add_variable(var, {1, 2, 3})
+        csp.add_constraint(Constraint(("X", "Y"), lambda x, y: x != y))
+        csp.add_constraint(Constraint(("X", "Z"), lambda x, z: x != z))
+        csp.add_constraint(Constraint(("W", "Y", "Z"), lambda w, y, z: w != y != z))
+
+        neighbors = build_neighbors(csp)
+        var_to_idx, adj = adjacency_matrix(csp)
+        for var, idx in var_to_idx.items():
+            self.assertEqual(int(sum(adj[idx])), len(neighbors[var]))
+            self.assertEqual(int(adj[idx][idx]), 0)
+
+        # Unassigned-neighbour degree from the matrix picks the same variable
+        assignment = {"Y": 1}
+        unassigned = [0 if var in assignment else 1 for var in sorted(var_to_idx, key=var_to_idx.get)]
+        degrees = {
+            var: sum(a * u for a, u in zip(adj[idx], unassigned))
+            for var, idx in var_to_idx.items()
+            if var not in assignment
+        }
+        var, _ = select_unassigned_variable(
+            csp,
+            assignment=assignment,
+            neighbors=neighbors,
+            use_mrv=False,
+            use_degree=True,
+        )
+        self.assertEqual(degrees[var], max(degrees.values()))
+
     def test_lcv_orders_values_by_lowest_impact(self) -> None:
         csp = CSP()
         csp.add_variable("X", {1, 2, 3})
@@ -91,5 +170,39 @@ class HeuristicSelectionTests(unittest.TestCase):
         self.assertEqual(set(ordered), {1, 2, 3})
 
 
+class FlatAssignmentSudokuTests(unittest.TestCase):
+    def test_flat_assignment_matches_dict_assignment(self) -> None:
+        csp = create_sudoku_csp()
+        givens = get_sample_sudoku_puzzle()
+        flat = FlatAssignment()
+        for cell, value in givens.items():
+            flat[cell] = value
+        self.assertEqual(len(flat), len(givens))
+        self.assertEqual(set(flat), set(givens))
+
+        neighbors = build_neighbors(csp)
+        from_dict = select_unassigned_variable(
+            csp, assignment=dict(givens), neighbors=neighbors, use_mrv=True, use_degree=False
+        )
+        from_flat = select_unassigned_variable(
+            csp, assignment=flat, neighbors=neighbors, use_mrv=True, use_degree=False
+        )
+        self.assertEqual(from_flat, from_dict)
+
+        var, legal_values = from_flat
+        ordered = order_domain_values(
+            csp, var=var, legal_values=legal_values, assignment=flat, neighbors=neighbors, use_lcv=True
+        )
+        self.assertEqual(
+            ordered,
+            order_domain_values(
+                csp, var=var, legal_values=legal_values, assignment=dict(givens), neighbors=neighbors, use_lcv=True
+            ),
+        )
+        # LCV scoring assigns and removes var temporarily; the flat buffer is restored
+        self.assertEqual(len(flat), len(givens))
+        self.assertNotIn(var, flat)
+
+
 if __name__ == "__main__":
     unittest.main()
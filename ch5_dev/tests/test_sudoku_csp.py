@@ -8,124 +8,16 @@ This test script implements the CSP model for Sudoku puzzles, including:
 4. Model validation and analysis
 """
 
-import sys
-import os
-
-# Add parent directory to path to import csp module
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pytest
+from array import array
 
 from csp import CSP, Constraint, Variable, Value, Domain, Scope, Relation
+from csp._sudoku_numba import build_grid, build_scope_table, check_sudoku
+from sudoku import _solve_numba
+from tests._fixtures import apply_puzzle_constraints, create_sudoku_csp, get_sample_sudoku_puzzle
 from typing import Dict, List, Tuple
 
 
-def all_different(*values: Value) -> bool:
-    """
-    Implicit constraint function: all values must be different
-
-    Args:
-        *values: Variable values to check
-
-    Returns:
-        bool: True if all values are different, False otherwise
-    """
-    return len(set(values)) == len(values)
-
-
-def create_sudoku_csp() -> CSP:
-    """
-    Create a CSP model for standard 9x9 Sudoku problem
-
-    Variable set X = {(r, c) | r, c ∈ {1, 2, ..., 9}}
-    Domain set D = {{1, 2, ..., 9} | v ∈ X}
-    Constraint set C = C_rows ∪ C_cols ∪ C_boxes
-
-    Returns:
-        CSP: Configured Sudoku CSP problem
-    """
-    # Create CSP instance
-    csp = CSP()
-
-    # 1. Variable Set X: All 81 cells in the 9x9 grid
-    variables = [(r, c) for r in range(1, 10) for c in range(1, 10)]
-
-    # 2. Domain Set D: Each variable can take values 1-9
-    domain = set(range(1, 10))
-
-    # Add all variables with their domains
-    for var in variables:
-        csp.add_variable(var, domain)
-
-    # 3. Constraint Set C: Row, Column, and Box constraints
-
-    # Row constraints (9 constraints)
-    for r in range(1, 10):
-        row_cells = tuple((r, c) for c in range(1, 10))
-        row_constraint = Constraint(row_cells, all_different)
-        csp.add_constraint(row_constraint)
-
-    # Column constraints (9 constraints)
-    for c in range(1, 10):
-        col_cells = tuple((r, c) for r in range(1, 10))
-        col_constraint = Constraint(col_cells, all_different)
-        csp.add_constraint(col_constraint)
-
-    # Box constraints (9 constraints)
-    # Each box is a 3x3 subgrid
-    for box_row in range(3):  # 0, 1, 2
-        for box_col in range(3):  # 0, 1, 2
-            box_cells = []
-            for dr in range(3):
-                for dc in range(3):
-                    r = box_row * 3 + dr + 1
-                    c = box_col * 3 + dc + 1
-                    box_cells.append((r, c))
-            box_constraint = Constraint(tuple(box_cells), all_different)
-            csp.add_constraint(box_constraint)
-
-    return csp
-
-
-def apply_puzzle_constraints(csp: CSP, puzzle: Dict[Tuple[int, int], int]) -> CSP:
-    """
-    Apply initial puzzle constraints by modifying variable domains
-
-    Args:
-        csp (CSP): The Sudoku CSP problem
-        puzzle (Dict[Tuple[int, int], int]): Initial puzzle state (filled cells)
-
-    Returns:
-        CSP: Modified CSP with initial constraints applied
-    """
-    for (row, col), value in puzzle.items():
-        # Create a domain with only the given value
-        single_value_domain = {value}
-        csp.domains[(row, col)] = single_value_domain
-
-    return csp
-
-
-def get_sample_sudoku_puzzle() -> Dict[Tuple[int, int], int]:
-    """
-    Return a sample Sudoku puzzle (moderately difficult)
-
-    0 represents empty cells in the visual representation
-    The puzzle has a unique solution
-    """
-    puzzle = {
-        (1, 1): 5, (1, 2): 3, (1, 5): 7,
-        (2, 1): 6, (2, 4): 1, (2, 5): 9, (2, 6): 5,
-        (3, 2): 9, (3, 3): 8, (3, 8): 6,
-        (4, 1): 8, (4, 5): 6, (4, 9): 3,
-        (5, 1): 4, (5, 4): 8, (5, 6): 3, (5, 9): 1,
-        (6, 1): 7, (6, 5): 2, (6, 9): 6,
-        (7, 2): 6, (7, 3): 2, (7, 8): 8,
-        (8, 4): 4, (8, 5): 1, (8, 6): 9, (8, 9): 5,
-        (9, 5): 8, (9, 8): 7, (9, 9): 9
-    }
-
-    return puzzle
-
-
 def visualize_sudoku_puzzle(puzzle: Dict[Tuple[int, int], int]) -> None:
     """
     Visualize a Sudoku puzzle in a readable format
@@ -142,10 +34,8 @@ def visualize_sudoku_puzzle(puzzle: Dict[Tuple[int, int], int]) -> None:
             if c in [4, 7]:
                 row_str += " │"
 
-            if (r, c) in puzzle:
-                row_str += f" {puzzle[(r, c)]}"
-            else:
-                row_str += " ."
+            value = puzzle.get((r, c))
+            row_str += f" {value}" if value is not None else " ."
 
         row_str += " │"
         print(row_str)
@@ -203,14 +93,15 @@ def test_sudoku_csp_model():
 
     # Test 4: Analyze constraint types
     print("\n4. Constraint Type Analysis:")
-    implicit_constraints = 0
-    explicit_constraints = 0
-
-    for constraint in csp.constraints:
-        if callable(constraint.relation):
-            implicit_constraints += 1
-        elif isinstance(constraint.relation, set):
-            explicit_constraints += 1
+    # Classify each constraint once, then count with list.count
+    kinds = [
+        'implicit' if callable(constraint.relation)
+        else 'explicit' if isinstance(constraint.relation, (set, frozenset))
+        else 'other'
+        for constraint in csp.constraints
+    ]
+    implicit_constraints = kinds.count('implicit')
+    explicit_constraints = kinds.count('explicit')
 
     print(f"   Implicit constraints (functions): {implicit_constraints}")
     print(f"   Explicit constraints (sets): {explicit_constraints}")
@@ -240,12 +131,9 @@ def test_sudoku_csp_model():
         print(f"   Initial puzzle is complete solution: {is_solution}")
         print("   [OK] (Expected: False, since puzzle is incomplete)")
 
-        # Check if initial assignment is consistent
-        is_consistent = True
-        for constraint in csp_with_puzzle.constraints:
-            if not constraint.is_satisfied(assignment):
-                is_consistent = False
-                break
+        # Check if initial assignment is consistent with the check generated
+        # for this CSP's scopes (one call, no loop over csp.constraints)
+        is_consistent = csp_with_puzzle._fast_check(assignment)
 
         print(f"   Initial puzzle assignment is consistent: {is_consistent}")
         print(f"   [OK] Puzzle has no immediate contradictions: {is_consistent}")
@@ -253,6 +141,31 @@ def test_sudoku_csp_model():
     except Exception as e:
         print(f"   [ERROR] Error validating puzzle: {e}")
 
+    # Same check on the integer grid and scope table, built once; outside the
+    # try so a kernel mismatch or crash fails the test
+    grid = build_grid(assignment)
+    scopes = build_scope_table(csp_with_puzzle.constraints)
+    grid_consistent = check_sudoku(grid, scopes)
+    print(f"   Grid kernel check agrees: {grid_consistent == is_consistent}")
+    assert grid_consistent == is_consistent
+
+    # Incremental validation: place the givens one at a time and check only
+    # the constraints indexed for the new cell (its row, column and box)
+    placed: Dict[Tuple[int, int], int] = {}
+    incremental_consistent = True
+    for cell, value in assignment.items():
+        placed[cell] = value
+        for constraint in csp_with_puzzle.constraints_of(cell):
+            # all-different holds on the assigned part of a scope as well
+            if not constraint.relation(*(placed[var] for var in constraint.scope if var in placed)):
+                incremental_consistent = False
+                break
+        if not incremental_consistent:
+            break
+
+    print(f"   Incremental check agrees: {incremental_consistent == is_consistent}")
+    assert incremental_consistent == is_consistent
+
     # Overall test results
     print("\n" + "=" * 80)
     print("Test Summary:")
@@ -277,6 +190,49 @@ def test_sudoku_csp_model():
     return csp_with_puzzle
 
 
+def _kernel_buffers(puzzle: Dict[Tuple[int, int], int]) -> Tuple[array, ...]:
+    """Seed grid, unit masks, domains and counters for the bitmask kernels from a puzzle"""
+    grid = array('b', bytes(81))
+    row_mask, col_mask, box_mask = (array('H', bytes(18)) for _ in range(3))
+    domains = array('H', [0x1FF] * 81)
+    counters = array('q', bytes(8 * _solve_numba.N_COUNTERS))
+    for (r, c), value in puzzle.items():
+        idx = (r - 1) * 9 + (c - 1)
+        bit = 1 << (value - 1)
+        grid[idx] = value
+        domains[idx] = bit
+        row_mask[r - 1] |= bit
+        col_mask[c - 1] |= bit
+        box_mask[((r - 1) // 3) * 3 + (c - 1) // 3] |= bit
+    counters[_solve_numba.ASSIGNED] = len(puzzle)
+    return grid, row_mask, col_mask, box_mask, domains, counters
+
+
+def test_ccore_kernel_matches_python_kernel():
+    """
+    The optional Cython kernel must return the same result, grid and counters
+    as the pure-Python ``_solve_numba._solve``
+    """
+    _ccore = pytest.importorskip("csp._ccore")
+    python_solve = getattr(_solve_numba._solve, 'py_func', _solve_numba._solve)
+
+    # The sample puzzle has no solution (full backtrack); moving its (7, 3)
+    # given to (7, 7) gives the classic solvable puzzle
+    unsolvable = get_sample_sudoku_puzzle()
+    solvable = dict(unsolvable)
+    solvable[(7, 7)] = solvable.pop((7, 3))
+
+    for puzzle, expected in ((solvable, True), (unsolvable, False)):
+        grid, rows, cols, boxes, domains, counters = _kernel_buffers(puzzle)
+        assert python_solve(grid, rows, cols, boxes, domains, counters) == expected
+
+        c_grid, c_rows, c_cols, c_boxes, c_domains, c_counters = _kernel_buffers(puzzle)
+        assert _ccore.solve_sudoku(c_domains, c_rows, c_cols, c_boxes, c_grid, c_counters) == expected
+
+        assert c_grid == grid
+        assert c_counters == counters
+
+
 def main():
     """
     Main function: run tests and display sample puzzle
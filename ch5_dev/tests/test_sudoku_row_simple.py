@@ -6,13 +6,12 @@ works in the context of Sudoku.
 """
 
 import sys
-import os
-
-# Add parent directory to path to import csp module
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from csp import Constraint
 
+# Cell names of the demo row, built (and interned) once
+CELL_KEYS = tuple(sys.intern(f'row1_cell{i}') for i in range(1, 10))
+
 
 def all_different(*values):
     """Simple all_different function for Sudoku constraints"""
@@ -32,9 +31,7 @@ def main():
     print("All numbers in a row must be different (no duplicates)")
 
     # Step 2: Define the row cells
-    row_cells = []
-    for i in range(1, 10):  # cells 1 through 9
-        row_cells.append(f'row1_cell{i}')
+    row_cells = list(CELL_KEYS)  # cells 1 through 9
 
     print(f"\nStep 2: Define the row cells")
     print(f"Row cells: {row_cells}")
@@ -58,7 +55,7 @@ def main():
     print(f"\nStep 5: Testing the constraint")
 
     # Test 1: Valid complete row
-    valid_row = {f'row1_cell{i}': i for i in range(1, 10)}
+    valid_row = dict(zip(CELL_KEYS, range(1, 10)))
     result1 = row_constraint.is_satisfied(valid_row)
     print(f"\nTest 1 - Valid complete row:")
     print(f"Assignment: {list(valid_row.values())}")
@@ -76,7 +73,7 @@ def main():
     print(f"Result: {'SATISFIED' if result2 else 'VIOLATED'}")
 
     # Test 3: Partial row (incomplete assignment)
-    partial_row = {f'row1_cell{i}': i for i in range(1, 6)}  # Only first 5 cells
+    partial_row = dict(zip(CELL_KEYS[:5], range(1, 6)))  # Only first 5 cells
     result3 = row_constraint.is_satisfied(partial_row)
     print(f"\nTest 3 - Partial row (incomplete):")
     print(f"Assignment: {[partial_row.get(cell, '.') for cell in row_cells]}")
@@ -1,5 +1,7 @@
 import math
 
+from tictactoe_kernel import NUMBA_AVAILABLE, best_move_kernel
+
 # --- 常量定义 ---
 PLAYER_X = 'X'
 PLAYER_O = 'O'
@@ -17,104 +19,160 @@ def print_board(board):
     print(f" {board[6]} | {board[7]} | {board[8]} ")
     print()
 
+# --- 位棋盘表示 ---
+# 搜索时棋盘用两个 9 位整数表示：x_mask / o_mask 的第 i 位为 1 表示格子 i 有该方的棋子
+FULL_MASK = 0x1FF
+
+# 8 条获胜线对应的位掩码 (行, 列, 对角线)
+WINS = (
+    0b000000111, 0b000111000, 0b111000000,  # 行
+    0b001001001, 0b010010010, 0b100100100,  # 列
+    0b100010001, 0b001010100,               # 对角线
+)
+W0, W1, W2, W3, W4, W5, W6, W7 = WINS
+
+# 搜索时尝试走法的顺序：中心、四角、四边。
+# 强的走法先试，Alpha-Beta 能更早剪枝
+MOVE_ORDER = (4, 0, 2, 6, 8, 1, 3, 5, 7)
+MOVE_BITS = tuple(1 << cell for cell in MOVE_ORDER)
+
+def board_to_masks(board):
+    """将列表棋盘转换为 (x_mask, o_mask)"""
+    x_mask = o_mask = 0
+    for i, cell in enumerate(board):
+        if cell == PLAYER_X:
+            x_mask |= 1 << i
+        elif cell == PLAYER_O:
+            o_mask |= 1 << i
+    return x_mask, o_mask
+
+def has_won(mask):
+    """mask 中的棋子是否连成一线（8 次按位与，展开为一个表达式）"""
+    return ((mask & W0) == W0 or (mask & W1) == W1 or (mask & W2) == W2 or
+            (mask & W3) == W3 or (mask & W4) == W4 or (mask & W5) == W5 or
+            (mask & W6) == W6 or (mask & W7) == W7)
+
 def check_winner(board, player):
     """检查指定玩家是否获胜"""
-    # 所有可能的获胜组合 (行, 列, 对角线)
-    win_conditions = [
-        [0, 1, 2], [3, 4, 5], [6, 7, 8],  # 行
-        [0, 3, 6], [1, 4, 7], [2, 5, 8],  # 列
-        [0, 4, 8], [2, 4, 6]              # 对角线
-    ]
-    for condition in win_conditions:
-        if board[condition[0]] == player and \
-           board[condition[1]] == player and \
-           board[condition[2]] == player:
-            return True
-    return False
-
-def is_board_full(board):
-    """检查棋盘是否已满（平局）"""
-    return EMPTY not in board
-
-def get_empty_cells(board):
-    """获取所有空格子的索引"""
-    return [i for i, cell in enumerate(board) if cell == EMPTY]
+    x_mask, o_mask = board_to_masks(board)
+    return has_won(x_mask if player == PLAYER_X else o_mask)
 
 # --- Minimax 算法 ---
 
-def evaluate_board(board):
+# 置换表：局面键 -> (分数, 标志)
+# 局面键把 x_mask、o_mask 和轮到谁走拼成一个 19 位整数：x_mask | o_mask << 9 | is_maximizing << 18，
+# 不同局面的键一定不同（无需 Zobrist 随机数，也不会冲突），查表只需对一个小整数做哈希。
+# 同一局面可由不同落子顺序到达，缓存后每个局面只需搜索一次。
+# 由于 Alpha-Beta 剪枝，被剪枝的搜索只得到分数的上界或下界，因此需要连同标志一起保存。
+TT_EXACT, TT_LOWER, TT_UPPER = 0, 1, 2
+_TT = {}
+
+def tt_store(key, value, alpha, beta):
+    """按搜索窗口 (alpha, beta) 判断 value 是精确值还是上/下界，写入置换表并返回 value"""
+    if value <= alpha:
+        flag = TT_UPPER
+    elif value >= beta:
+        flag = TT_LOWER
+    else:
+        flag = TT_EXACT
+    _TT[key] = (value, flag)
+    return value
+
+def evaluate_board(x_mask, o_mask):
     """
     评估当前棋盘状态。
     这是 Minimax 的终点函数。
     返回 +1 (AI赢), -1 (玩家赢), 0 (平局或未结束)。
     """
-    if check_winner(board, PLAYER_O):  # AI (O) 赢了
+    if has_won(o_mask):  # AI (O) 赢了
         return 1
-    if check_winner(board, PLAYER_X):  # 玩家 (X) 赢了
+    if has_won(x_mask):  # 玩家 (X) 赢了
         return -1
     return 0  # 平局或游戏未结束
 
-def minimax(board, depth, is_maximizing):
+def minimax(x_mask, o_mask, depth, is_maximizing, alpha=-math.inf, beta=math.inf):
     """
-    Minimax 算法的核心递归函数。
-    - board: 当前棋盘状态
+    Minimax 算法的核心递归函数（带 Alpha-Beta 剪枝）。
+    - x_mask, o_mask: 当前棋盘状态（两方棋子的位掩码）
     - depth: 当前搜索深度 (对于井字棋可以省略，但保留是好习惯)
     - is_maximizing: 当前是 MAX 玩家 (AI) 还是 MIN 玩家 (人类) 的回合
+    - alpha: MAX 玩家已能保证的最低分数
+    - beta: MIN 玩家已能保证的最高分数
     """
+    # 0. 查置换表：精确值直接返回，上下界用来收窄窗口
+    key = x_mask | o_mask << 9 | is_maximizing << 18
+    entry = _TT.get(key)
+    if entry is not None:
+        value, flag = entry
+        if flag == TT_EXACT:
+            return value
+        if flag == TT_LOWER:
+            alpha = max(alpha, value)
+        else:
+            beta = min(beta, value)
+        if alpha >= beta:
+            return value
+    alpha_orig, beta_orig = alpha, beta
+
     # 1. 终止条件：检查游戏是否结束
-    score = evaluate_board(board)
-    if score is not 0: # 如果有人赢了
+    score = evaluate_board(x_mask, o_mask)
+    if score != 0: # 如果有人赢了
         return score
-    if is_board_full(board): # 如果平局
+    empty = ~(x_mask | o_mask) & FULL_MASK
+    if not empty: # 如果平局
         return 0
 
-    # 2. 递归步骤
-    empty_cells = get_empty_cells(board)
-
+    # 2. 递归步骤：按 MOVE_ORDER 的顺序尝试空格
     if is_maximizing:
         # --- AI (MAX) 的回合 ---
         best_score = -math.inf
-        for cell in empty_cells:
-            # 尝试走一步
-            board[cell] = PLAYER_O
+        for bit in MOVE_BITS:
+            if not empty & bit:
+                continue
+            # 走一步只是置位，回溯时原掩码不变，无需撤销
             # 递归调用 Minimax，轮到 MIN 玩家
-            score = minimax(board, depth + 1, False)
-            # 撤销这一步 (回溯)
-            board[cell] = EMPTY
+            score = minimax(x_mask, o_mask | bit, depth + 1, False, alpha, beta)
             # 更新最佳分数
             best_score = max(score, best_score)
-        return best_score
+            # Beta 剪枝：MIN 玩家不会让局面走到这里
+            alpha = max(alpha, best_score)
+            if alpha >= beta:
+                break
+        return tt_store(key, best_score, alpha_orig, beta_orig)
     else:
         # --- 人类 (MIN) 的回合 ---
         best_score = math.inf
-        for cell in empty_cells:
-            # 尝试走一步
-            board[cell] = PLAYER_X
+        for bit in MOVE_BITS:
+            if not empty & bit:
+                continue
             # 递归调用 Minimax，轮到 MAX 玩家
-            score = minimax(board, depth + 1, True)
-            # 撤销这一步 (回溯)
-            board[cell] = EMPTY
+            score = minimax(x_mask | bit, o_mask, depth + 1, True, alpha, beta)
             # 更新最佳分数
             best_score = min(score, best_score)
-        return best_score
+            # Alpha 剪枝：MAX 玩家不会让局面走到这里
+            beta = min(beta, best_score)
+            if beta <= alpha:
+                break
+        return tt_store(key, best_score, alpha_orig, beta_orig)
 
-def find_best_move(board):
+def search_best_move(x_mask, o_mask):
     """
-    为 AI (MAX 玩家) 找到最佳走法。
+    为 AI (MAX 玩家) 搜索最佳走法。
     遍历所有可能的走法，调用 minimax 评估，并返回得分最高的那一步。
+    安装了 Numba 时改用 tictactoe_kernel 中编译好的同一搜索。
     """
+    if NUMBA_AVAILABLE:
+        return best_move_kernel(x_mask, o_mask)
+
     best_score = -math.inf
     best_move = -1
-    empty_cells = get_empty_cells(board)
-
-    for cell in empty_cells:
-        # 尝试走一步
-        board[cell] = PLAYER_O
-        # 调用 minimax 评估这一步的分数，注意此时轮到 MIN 玩家
-        move_score = minimax(board, 0, False)
-        # 撤销这一步 (回溯)
-        board[cell] = EMPTY
-        
+
+    for cell in range(9):
+        if (x_mask | o_mask) >> cell & 1:
+            continue
+        # 调用 minimax 评估在 cell 落子后的局面，注意此时轮到 MIN 玩家
+        move_score = minimax(x_mask, o_mask | (1 << cell), 0, False, -math.inf, math.inf)
+
         # 如果这一步的分数比当前最佳分数还高，就更新最佳走法
         if move_score > best_score:
             best_score = move_score
@@ -122,12 +180,50 @@ def find_best_move(board):
             
     return best_move
 
+# --- 策略表 ---
+# 人类 (X) 先手时，轮到 AI 走的局面只有几千个，导入时一次性算出每个局面的最佳走法，
+# 对局中 find_best_move 只需查表。
+
+def build_policy():
+    """从空棋盘出发深度优先枚举所有可达局面，返回 {(x_mask, o_mask): 最佳走法}"""
+    policy = {}
+    seen = set()
+    stack = [(0, 0)]
+    while stack:
+        x_mask, o_mask = stack.pop()
+        if (x_mask, o_mask) in seen:
+            continue
+        seen.add((x_mask, o_mask))
+        empty = ~(x_mask | o_mask) & FULL_MASK
+        if not empty or has_won(x_mask) or has_won(o_mask):
+            continue
+        # X 先手：双方棋子数相同时轮到 X，否则轮到 O
+        x_to_move = x_mask.bit_count() == o_mask.bit_count()
+        if not x_to_move:
+            policy[(x_mask, o_mask)] = search_best_move(x_mask, o_mask)
+        while empty:
+            bit = empty & -empty
+            empty ^= bit
+            stack.append((x_mask | bit, o_mask) if x_to_move else (x_mask, o_mask | bit))
+    return policy
+
+POLICY = build_policy()
+
+def find_best_move(board):
+    """为 AI (MAX 玩家) 找到最佳走法：查策略表，表外的局面（如非 X 先手）再现场搜索"""
+    x_mask, o_mask = board_to_masks(board)
+    move = POLICY.get((x_mask, o_mask))
+    if move is None:
+        move = search_best_move(x_mask, o_mask)
+    return move
+
 # --- 主游戏循环 ---
 
 def main():
     """主函数，运行游戏"""
     board = [EMPTY] * 9
     current_player = PLAYER_X  # 人类玩家先手
+    _TT.clear()
 
     print("欢迎来到井字棋游戏！")
     print("你是 'X'，AI 是 'O'。")
@@ -142,13 +238,15 @@ def main():
         print_board(board)
 
         # 检查游戏是否结束
-        if check_winner(board, PLAYER_X):
+        x_mask, o_mask = board_to_masks(board)
+        occupied = x_mask | o_mask
+        if has_won(x_mask):
             print("恭喜你，你赢了！")
             break
-        if check_winner(board, PLAYER_O):
+        if has_won(o_mask):
             print("AI 赢了！再接再厉。")
             break
-        if is_board_full(board):
+        if occupied == FULL_MASK:
             print("平局！")
             break
 
@@ -156,7 +254,7 @@ def main():
         if current_player == PLAYER_X:
             try:
                 move = int(input("轮到你了，请输入你的走法 (0-8): "))
-                if move not in get_empty_cells(board):
+                if not 0 <= move <= 8 or occupied >> move & 1:
                     print("无效的走法，请选择一个空格子。")
                     continue
                 board[move] = PLAYER_X
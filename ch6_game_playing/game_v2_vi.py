@@ -7,24 +7,47 @@ PLAYER_O = 'O'
 EMPTY = ' '
 
 # --- 思考过程记录 ---
+# 日志条目是 (步骤, 缩进, 类型, 内容) 元组，搜索时只追加元组，
+# 字符串在 save_thinking_log 中统一生成：
+# - LOG_TEXT:  内容为 (格式模板, 参数)
+# - LOG_BOARD: 内容为 (标题, x_mask, o_mask)
+LOG_TEXT, LOG_BOARD = 0, 1
+# 搜索树中只记录深度不超过 LOG_MAX_DEPTH 的棋盘状态，更深的棋盘太多，不记录
+LOG_MAX_DEPTH = 2
+
 thinking_log = []
 indent_level = 0
 step_counter = 0
 
-def log_thinking(message):
-    """记录AI的思考过程"""
-    global thinking_log, step_counter
+def log_thinking(template, *args):
+    """记录AI的思考过程（template 按 str.format 的格式，保存时才格式化）"""
+    global step_counter
+    step_counter += 1
+    thinking_log.append((step_counter, indent_level, LOG_TEXT, (template, args)))
+
+def log_board(title, x_mask, o_mask):
+    """记录一个棋盘状态（保存时才转换为字符串）"""
+    global step_counter
     step_counter += 1
-    indent = "  " * indent_level
-    thinking_log.append(f"[步骤 {step_counter}] {indent}{message}")
+    thinking_log.append((step_counter, indent_level, LOG_BOARD, (title, x_mask, o_mask)))
+
+def format_thinking_log():
+    """逐条生成日志文本"""
+    for step, indent, kind, payload in thinking_log:
+        if kind == LOG_BOARD:
+            title, x_mask, o_mask = payload
+            message = f"{title}:\n{masks_to_string(x_mask, o_mask)}"
+        else:
+            template, args = payload
+            message = template.format(*args)
+        yield f"[步骤 {step}] {'  ' * indent}{message}\n"
 
 def save_thinking_log():
     """保存思考过程到文件"""
     with open("ai_thinking_process.txt", "w") as f:
         f.write("AI 井字棋思考过程\n")
         f.write("=" * 50 + "\n\n")
-        for entry in thinking_log:
-            f.write(entry + "\n")
+        f.writelines(format_thinking_log())
 
 # --- 游戏逻辑函数 ---
 
@@ -42,118 +65,194 @@ def board_to_string(board):
     """将棋盘转换为字符串表示"""
     return f"{board[0]}|{board[1]}|{board[2]}\n{board[3]}|{board[4]}|{board[5]}\n{board[6]}|{board[7]}|{board[8]}"
 
+# --- 位棋盘表示 ---
+# 搜索时棋盘用两个 9 位整数表示：x_mask / o_mask 的第 i 位为 1 表示格子 i 有该方的棋子
+FULL_MASK = 0x1FF
+
+# 8 条获胜线对应的位掩码 (行, 列, 对角线)
+WINS = (
+    0b000000111, 0b000111000, 0b111000000,  # 行
+    0b001001001, 0b010010010, 0b100100100,  # 列
+    0b100010001, 0b001010100,               # 对角线
+)
+W0, W1, W2, W3, W4, W5, W6, W7 = WINS
+
+# 搜索时尝试走法的顺序：中心、四角、四边。
+# 强的走法先试，Alpha-Beta 能更早剪枝
+MOVE_ORDER = (4, 0, 2, 6, 8, 1, 3, 5, 7)
+MOVE_BITS = tuple(1 << cell for cell in MOVE_ORDER)
+
+def board_to_masks(board):
+    """将列表棋盘转换为 (x_mask, o_mask)"""
+    x_mask = o_mask = 0
+    for i, cell in enumerate(board):
+        if cell == PLAYER_X:
+            x_mask |= 1 << i
+        elif cell == PLAYER_O:
+            o_mask |= 1 << i
+    return x_mask, o_mask
+
+def masks_to_string(x_mask, o_mask):
+    """将位棋盘转换为与 board_to_string 相同的字符串表示"""
+    board = [PLAYER_X if x_mask >> i & 1 else PLAYER_O if o_mask >> i & 1 else EMPTY for i in range(9)]
+    return board_to_string(board)
+
+def mask_cells(mask):
+    """mask 中为 1 的格子编号（按 MOVE_ORDER 排列）"""
+    return [cell for cell in MOVE_ORDER if mask >> cell & 1]
+
+def has_won(mask):
+    """mask 中的棋子是否连成一线（8 次按位与，展开为一个表达式）"""
+    return ((mask & W0) == W0 or (mask & W1) == W1 or (mask & W2) == W2 or
+            (mask & W3) == W3 or (mask & W4) == W4 or (mask & W5) == W5 or
+            (mask & W6) == W6 or (mask & W7) == W7)
+
 def check_winner(board, player):
     """检查指定玩家是否获胜"""
-    # 所有可能的获胜组合 (行, 列, 对角线)
-    win_conditions = [
-        [0, 1, 2], [3, 4, 5], [6, 7, 8],  # 行
-        [0, 3, 6], [1, 4, 7], [2, 5, 8],  # 列
-        [0, 4, 8], [2, 4, 6]              # 对角线
-    ]
-    for condition in win_conditions:
-        if board[condition[0]] == player and \
-           board[condition[1]] == player and \
-           board[condition[2]] == player:
-            return True
-    return False
-
-def is_board_full(board):
-    """检查棋盘是否已满（平局）"""
-    return EMPTY not in board
-
-def get_empty_cells(board):
-    """获取所有空格子的索引"""
-    return [i for i, cell in enumerate(board) if cell == EMPTY]
+    x_mask, o_mask = board_to_masks(board)
+    return has_won(x_mask if player == PLAYER_X else o_mask)
 
 # --- Minimax 算法 ---
 
-def evaluate_board(board):
+# 置换表：局面键 -> (分数, 标志)
+# 局面键把 x_mask、o_mask 和轮到谁走拼成一个 19 位整数：x_mask | o_mask << 9 | is_maximizing << 18，
+# 不同局面的键一定不同（无需 Zobrist 随机数，也不会冲突），查表只需对一个小整数做哈希。
+# 同一局面可由不同落子顺序到达，缓存后每个局面只需搜索一次。
+# 由于 Alpha-Beta 剪枝，被剪枝的搜索只得到分数的上界或下界，因此需要连同标志一起保存。
+TT_EXACT, TT_LOWER, TT_UPPER = 0, 1, 2
+_TT = {}
+
+def tt_store(key, value, alpha, beta):
+    """按搜索窗口 (alpha, beta) 判断 value 是精确值还是上/下界，写入置换表并返回 value"""
+    if value <= alpha:
+        flag = TT_UPPER
+    elif value >= beta:
+        flag = TT_LOWER
+    else:
+        flag = TT_EXACT
+    _TT[key] = (value, flag)
+    return value
+
+def evaluate_board(x_mask, o_mask):
     """
     评估当前棋盘状态。
     这是 Minimax 的终点函数。
     返回 +1 (AI赢), -1 (玩家赢), 0 (平局或未结束)。
     """
-    if check_winner(board, PLAYER_O):  # AI (O) 赢了
+    if has_won(o_mask):  # AI (O) 赢了
         return 1
-    if check_winner(board, PLAYER_X):  # 玩家 (X) 赢了
+    if has_won(x_mask):  # 玩家 (X) 赢了
         return -1
     return 0  # 平局或游戏未结束
 
-def minimax(board, depth, is_maximizing):
+def minimax(x_mask, o_mask, depth, is_maximizing, alpha=-math.inf, beta=math.inf):
     """
-    Minimax 算法的核心递归函数。
-    - board: 当前棋盘状态
+    Minimax 算法的核心递归函数（带 Alpha-Beta 剪枝）。
+    - x_mask, o_mask: 当前棋盘状态（两方棋子的位掩码）
     - depth: 当前搜索深度 (对于井字棋可以省略，但保留是好习惯)
     - is_maximizing: 当前是 MAX 玩家 (AI) 还是 MIN 玩家 (人类) 的回合
+    - alpha: MAX 玩家已能保证的最低分数
+    - beta: MIN 玩家已能保证的最高分数
     """
     global indent_level
     
+    # 0. 查置换表：精确值直接返回，上下界用来收窄窗口
+    key = x_mask | o_mask << 9 | is_maximizing << 18
+    entry = _TT.get(key)
+    if entry is not None:
+        value, flag = entry
+        if flag == TT_EXACT:
+            log_thinking("【置换表命中】分数: {}", value)
+            return value
+        if flag == TT_LOWER:
+            alpha = max(alpha, value)
+        else:
+            beta = min(beta, value)
+        if alpha >= beta:
+            return value
+    alpha_orig, beta_orig = alpha, beta
+
     # 1. 终止条件：检查游戏是否结束
-    score = evaluate_board(board)
-    if score is not 0: # 如果有人赢了
-        log_thinking(f"游戏结束，分数: {score}")
+    score = evaluate_board(x_mask, o_mask)
+    if score != 0: # 如果有人赢了
+        log_thinking("游戏结束，分数: {}", score)
         return score
-    if is_board_full(board): # 如果平局
+    empty = ~(x_mask | o_mask) & FULL_MASK
+    if not empty: # 如果平局
         log_thinking("棋盘已满，平局，分数: 0")
         return 0
 
     # 2. 递归步骤
-    empty_cells = get_empty_cells(board)
+    empty_cells = mask_cells(empty)
     player = PLAYER_O if is_maximizing else PLAYER_X
     player_type = "AI (O)" if is_maximizing else "玩家 (X)"
     
-    log_thinking(f"{player_type} 的回合，可选择的空位: {empty_cells}")
+    log_thinking("{} 的回合，可选择的空位: {}", player_type, empty_cells)
 
     if is_maximizing:
         # --- AI (MAX) 的回合 ---
         best_score = -math.inf
-        for cell in empty_cells:
+        for i, cell in enumerate(empty_cells):
             indent_level += 1
-            log_thinking(f"尝试在位置 {cell} 放置 {PLAYER_O}")
+            log_thinking("尝试在位置 {} 放置 {}", cell, PLAYER_O)
             
-            # 尝试走一步
-            board[cell] = PLAYER_O
-            log_thinking(f"棋盘状态:\n{board_to_string(board)}")
+            # 尝试走一步（置位得到新掩码，原掩码不变，回溯无需撤销）
+            child_o = o_mask | (1 << cell)
+            if depth < LOG_MAX_DEPTH:
+                log_board("棋盘状态", x_mask, child_o)
             
             # 递归调用 Minimax，轮到 MIN 玩家
-            score = minimax(board, depth + 1, False)
-            log_thinking("返回分数: " + str(score))
-            
-            # 撤销这一步 (回溯)
-            board[cell] = EMPTY
+            score = minimax(x_mask, child_o, depth + 1, False, alpha, beta)
+            log_thinking("返回分数: {}", score)
             
             # 更新最佳分数
             if score > best_score:
                 best_score = score
-                log_thinking(f"更新最佳分数: {best_score}")
+                log_thinking("更新最佳分数: {}", best_score)
             
             indent_level -= 1
-        return best_score
+
+            # Beta 剪枝：MIN 玩家不会让局面走到这里
+            alpha = max(alpha, best_score)
+            if alpha >= beta:
+                log_thinking(
+                    "【β剪枝】跳过剩余位置 {} | 原因: {} >= β={}",
+                    empty_cells[i + 1:], best_score, beta,
+                )
+                break
+        return tt_store(key, best_score, alpha_orig, beta_orig)
     else:
         # --- 人类 (MIN) 的回合 ---
         best_score = math.inf
-        for cell in empty_cells:
+        for i, cell in enumerate(empty_cells):
             indent_level += 1
-            log_thinking(f"尝试在位置 {cell} 放置 {PLAYER_X}")
+            log_thinking("尝试在位置 {} 放置 {}", cell, PLAYER_X)
             
-            # 尝试走一步
-            board[cell] = PLAYER_X
-            log_thinking(f"棋盘状态:\n{board_to_string(board)}")
+            # 尝试走一步（置位得到新掩码，原掩码不变，回溯无需撤销）
+            child_x = x_mask | (1 << cell)
+            if depth < LOG_MAX_DEPTH:
+                log_board("棋盘状态", child_x, o_mask)
             
             # 递归调用 Minimax，轮到 MAX 玩家
-            score = minimax(board, depth + 1, True)
-            log_thinking("返回分数: " + str(score))
-            
-            # 撤销这一步 (回溯)
-            board[cell] = EMPTY
+            score = minimax(child_x, o_mask, depth + 1, True, alpha, beta)
+            log_thinking("返回分数: {}", score)
             
             # 更新最佳分数
             if score < best_score:
                 best_score = score
-                log_thinking(f"更新最佳分数: {best_score}")
+                log_thinking("更新最佳分数: {}", best_score)
             
             indent_level -= 1
-        return best_score
+
+            # Alpha 剪枝：MAX 玩家不会让局面走到这里
+            beta = min(beta, best_score)
+            if beta <= alpha:
+                log_thinking(
+                    "【α剪枝】跳过剩余位置 {} | 原因: {} <= α={}",
+                    empty_cells[i + 1:], best_score, alpha,
+                )
+                break
+        return tt_store(key, best_score, alpha_orig, beta_orig)
 
 def find_best_move(board):
     """
@@ -168,30 +267,31 @@ def find_best_move(board):
     step_counter = 0
 
     log_thinking("AI 开始思考最佳走法...")
-    log_thinking(f"当前棋盘状态:\n{board_to_string(board)}")
+    log_board("当前棋盘状态", *board_to_masks(board))
     
     best_score = -math.inf
     best_move = -1
-    empty_cells = get_empty_cells(board)
+    empty_cells = [i for i, cell in enumerate(board) if cell == EMPTY]
     
-    log_thinking(f"可选择的空位: {empty_cells}")
+    log_thinking("可选择的空位: {}", empty_cells)
     log_thinking("开始逐一评估每个可选位置:")
 
     for i, cell in enumerate(empty_cells):
-        log_thinking(f"--- 评估第 {i+1} 个位置 {cell} ---")
+        log_thinking("--- 评估第 {} 个位置 {} ---", i + 1, cell)
         indent_level += 1
-        log_thinking(f"模拟在位置 {cell} 放置 {PLAYER_O}")
+        log_thinking("模拟在位置 {} 放置 {}", cell, PLAYER_O)
 
         # 尝试走一步
         board[cell] = PLAYER_O
-        log_thinking(f"模拟后棋盘状态:\n{board_to_string(board)}")
+        x_mask, o_mask = board_to_masks(board)
+        log_board("模拟后棋盘状态", x_mask, o_mask)
 
         log_thinking("开始预测玩家的最佳回应...")
 
         # 调用 minimax 评估这一步的分数，注意此时轮到 MIN 玩家
-        move_score = minimax(board, 0, False)
-        log_thinking(f"位置 {cell} 的评估分数: {move_score}")
-        log_thinking(f"解释: 分数 {move_score} 表示如果AI选择位置{cell}")
+        move_score = minimax(x_mask, o_mask, 0, False, -math.inf, math.inf)
+        log_thinking("位置 {} 的评估分数: {}", cell, move_score)
+        log_thinking("解释: 分数 {} 表示如果AI选择位置{}", move_score, cell)
         if move_score == 1:
             log_thinking("  → AI必胜")
         elif move_score == 0:
@@ -205,18 +305,18 @@ def find_best_move(board):
 
         # 如果这一步的分数比当前最佳分数还高，就更新最佳走法
         if move_score > best_score:
-            log_thinking(f"位置 {cell} (分数{move_score}) 比当前最佳(分数{best_score}) 更好!")
+            log_thinking("位置 {} (分数{}) 比当前最佳(分数{}) 更好!", cell, move_score, best_score)
             best_score = move_score
             best_move = cell
-            log_thinking(f"更新最佳走法: 位置 {cell}，分数 {best_score}")
+            log_thinking("更新最佳走法: 位置 {}，分数 {}", cell, best_score)
         else:
-            log_thinking(f"位置 {cell} (分数{move_score}) 不比当前最佳(分数{best_score}) 更好")
+            log_thinking("位置 {} (分数{}) 不比当前最佳(分数{}) 更好", cell, move_score, best_score)
 
         indent_level -= 1
-        log_thinking(f"--- 位置 {cell} 评估完成 ---")
+        log_thinking("--- 位置 {} 评估完成 ---", cell)
 
-    log_thinking(f"\n最终决策: AI 选择位置 {best_move}")
-    log_thinking(f"原因: 这是所有选项中分数最高的 ({best_score})")
+    log_thinking("\n最终决策: AI 选择位置 {}", best_move)
+    log_thinking("原因: 这是所有选项中分数最高的 ({})", best_score)
     
     # 保存思考过程到文件
     save_thinking_log()
@@ -229,6 +329,7 @@ def main():
     """主函数，运行游戏"""
     board = [EMPTY] * 9
     current_player = PLAYER_X  # 人类玩家先手
+    _TT.clear()
 
     print("欢迎来到井字棋游戏！")
     print("你是 'X'，AI 是 'O'。")
@@ -244,13 +345,15 @@ def main():
         print_board(board)
 
         # 检查游戏是否结束
-        if check_winner(board, PLAYER_X):
+        x_mask, o_mask = board_to_masks(board)
+        occupied = x_mask | o_mask
+        if has_won(x_mask):
             print("恭喜你，你赢了！")
             break
-        if check_winner(board, PLAYER_O):
+        if has_won(o_mask):
             print("AI 赢了！再接再厉。")
             break
-        if is_board_full(board):
+        if occupied == FULL_MASK:
             print("平局！")
             break
 
@@ -258,7 +361,7 @@ def main():
         if current_player == PLAYER_X:
             try:
                 move = int(input("轮到你了，请输入你的走法 (0-8): "))
-                if move not in get_empty_cells(board):
+                if not 0 <= move <= 8 or occupied >> move & 1:
                     print("无效的走法，请选择一个空格子。")
                     continue
                 board[move] = PLAYER_X
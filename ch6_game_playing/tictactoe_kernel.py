@@ -0,0 +1,90 @@
+"""
+井字棋 Minimax 数值内核
+
+棋盘用两个 9 位整数 (x_mask, o_mask) 表示，分数只取 -1 / 0 / +1，
+因此整个搜索只涉及整数运算和元组常量。安装了 Numba 时用 njit(cache=True) 编译
+（编译结果缓存在磁盘上，之后的进程直接加载）；未安装时作为普通 Python 函数运行。
+"""
+
+try:
+    from numba import njit
+except ImportError:  # 可选加速
+    njit = None
+
+NUMBA_AVAILABLE = njit is not None
+
+FULL_MASK = 0x1FF
+WINS = (
+    0b000000111, 0b000111000, 0b111000000,  # 行
+    0b001001001, 0b010010010, 0b100100100,  # 列
+    0b100010001, 0b001010100,               # 对角线
+)
+# 中心、四角、四边
+MOVE_BITS = (1 << 4, 1 << 0, 1 << 2, 1 << 6, 1 << 8, 1 << 1, 1 << 3, 1 << 5, 1 << 7)
+
+
+def has_won(mask):
+    """mask 中的棋子是否连成一线"""
+    for win in WINS:
+        if (mask & win) == win:
+            return True
+    return False
+
+
+def minimax_kernel(x_mask, o_mask, is_maximizing, alpha, beta):
+    """带 Alpha-Beta 剪枝的 Minimax，返回 +1 (O 赢) / -1 (X 赢) / 0 (平局)"""
+    if has_won(o_mask):
+        return 1
+    if has_won(x_mask):
+        return -1
+    empty = ~(x_mask | o_mask) & FULL_MASK
+    if empty == 0:
+        return 0
+
+    if is_maximizing:
+        best_score = -2
+        for bit in MOVE_BITS:
+            if empty & bit:
+                score = minimax_kernel(x_mask, o_mask | bit, False, alpha, beta)
+                if score > best_score:
+                    best_score = score
+                if best_score > alpha:
+                    alpha = best_score
+                if alpha >= beta:
+                    break
+        return best_score
+    else:
+        best_score = 2
+        for bit in MOVE_BITS:
+            if empty & bit:
+                score = minimax_kernel(x_mask | bit, o_mask, True, alpha, beta)
+                if score < best_score:
+                    best_score = score
+                if best_score < beta:
+                    beta = best_score
+                if beta <= alpha:
+                    break
+        return best_score
+
+
+def best_move_kernel(x_mask, o_mask):
+    """轮到 O (MAX) 时的最佳走法：按格子编号遍历，取第一个得分最高的格子"""
+    best_score = -2
+    best_move = -1
+    for cell in range(9):
+        bit = 1 << cell
+        if (x_mask | o_mask) & bit:
+            continue
+        score = minimax_kernel(x_mask, o_mask | bit, False, -2, 2)
+        if score > best_score:
+            best_score = score
+            best_move = cell
+    return best_move
+
+
+if NUMBA_AVAILABLE:
+    has_won = njit(cache=True)(has_won)
+    minimax_kernel = njit(cache=True)(minimax_kernel)
+    best_move_kernel = njit(cache=True)(best_move_kernel)
+    # 导入时预热一次，加载（或编译）缓存，避免第一次落子时卡顿
+    best_move_kernel(0, 0)
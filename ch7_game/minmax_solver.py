@@ -1,26 +1,158 @@
 import logging
+import math
 import os
 from datetime import datetime
 
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:  # 可选加速
+    np = None
+    njit = None
+
+NUMBA_AVAILABLE = njit is not None
+
+TT_EXACT, TT_LOWER, TT_UPPER = 0, 1, 2
+
+# _ab 的计数器下标
+VISITS, PRUNINGS, MAX_PLY = 0, 1, 2
+
+
+def build_csr(nodes):
+    """
+    把节点字典压平为 CSR 形式的并列数组，节点按字典顺序编号（子节点不在字典中时追加在后面）
+    :param nodes: 名称到 TreeNode 的映射
+    :return: (names, values, first_child, n_children, child_idx)
+             节点 i 的子节点编号为 child_idx[first_child[i] : first_child[i] + n_children[i]]，
+             values[i] 为节点的值（没有值时为 0）
+    """
+    ids = {name: i for i, name in enumerate(nodes)}
+    order = list(nodes.values())
+    names = list(nodes)
+    values = []
+    first_child = []
+    n_children = []
+    child_idx = []
+    
+    i = 0
+    while i < len(order):
+        node = order[i]
+        first_child.append(len(child_idx))
+        n_children.append(len(node.children))
+        values.append(node.value if node.value is not None else 0)
+        for child in node.children:
+            if child.name not in ids:
+                ids[child.name] = len(order)
+                order.append(child)
+                names.append(child.name)
+            child_idx.append(ids[child.name])
+        i += 1
+    
+    return names, values, first_child, n_children, child_idx
+
+
+def tree_height(first_child, n_children, child_idx, root):
+    """
+    CSR 数组上从 root 出发的最长路径边数。
+    子节点可能有多个父节点（DAG），按后序遍历记忆化，每个节点只计算一次
+    """
+    height = {}
+    stack = [root]
+    while stack:
+        node = stack[-1]
+        if node in height:
+            stack.pop()
+            continue
+        start = first_child[node]
+        children = child_idx[start:start + n_children[node]]
+        pending = [child for child in children if child not in height]
+        if pending:
+            stack.extend(pending)
+            continue
+        height[node] = 1 + max((height[child] for child in children), default=-1)
+        stack.pop()
+    return height[root]
+
+
+def _ab(first_child, n_children, child_idx, values, node_id, depth, ply, alpha, beta,
+        sign, pv, pv_len, width, counters):
+    """
+    CSR 数组上的 Alpha-Beta 搜索（Negamax 形式，不记录日志）。
+    sign 为 1.0（MAX 节点）或 -1.0（MIN 节点），返回值和 alpha/beta 都是当前行棋方视角，
+    即 sign * 节点值。
+    最优路径按层记录在三角形 PV 表中：pv[ply * width : ply * width + pv_len[ply]]
+    为第 ply 层节点之后的最优子节点编号序列。按层而不是按节点编号记录，
+    同一节点经由多个父节点再次访问时不会覆盖根节点的最优路径。
+    counters 累计访问节点数、剪枝次数和最大层数。
+    只涉及整数/浮点数组，安装 Numba 时用 njit(cache=True) 编译。
+    """
+    counters[VISITS] += 1
+    if ply > counters[MAX_PLY]:
+        counters[MAX_PLY] = ply
+    
+    start = first_child[node_id]
+    count = n_children[node_id]
+    pv_len[ply] = 0
+    if count == 0 or depth == 0:
+        return sign * values[node_id]
+    
+    row = ply * width
+    value = -math.inf
+    for k in range(start, start + count):
+        child = child_idx[k]
+        child_value = -_ab(first_child, n_children, child_idx, values, child, depth - 1, ply + 1,
+                           -beta, -alpha, -sign, pv, pv_len, width, counters)
+        if child_value > value:
+            value = child_value
+            # 最优子节点后接子节点搜索时记录的路径
+            pv[row] = child
+            tail = pv_len[ply + 1]
+            for j in range(tail):
+                pv[row + 1 + j] = pv[row + width + j]
+            pv_len[ply] = tail + 1
+        alpha = max(alpha, value)
+        if value >= beta:
+            counters[PRUNINGS] += 1
+            break
+    return value
+
+
+if NUMBA_AVAILABLE:
+    _ab = njit(cache=True)(_ab)
+
+
 class MinMaxSolver:
     """MinMax搜索求解器，支持Alpha-Beta剪枝和详细日志记录"""
     
-    def __init__(self, nodes, root_name, log_dir="log"):
+    def __init__(self, nodes, root_name, log_dir="log", csr=None):
         """
         初始化求解器
         :param nodes: 节点字典（从TreeVisualizer的nodes属性获取）
         :param root_name: 根节点名称
         :param log_dir: 日志存储目录
+        :param csr: 已压平的树（TreeVisualizer.build_csr 的返回值），为 None 时由 nodes 构建
         """
         self.nodes = nodes
         self.root_name = root_name
         self.root = nodes.get(root_name)
         self.log_dir = log_dir
         
+        # 搜索时按整数编号访问 CSR 数组，不再按名称查字典、访问节点对象
+        if csr is None:
+            csr = build_csr(nodes)
+        self.names, self.values, self.first_child, self.n_children, self.child_idx = csr
+        self.node_ids = {name: i for i, name in enumerate(self.names)}
+        
         # 统计信息
         self.node_visits = 0
         self.pruning_count = 0
         self.current_depth = 0
+        self.tt_hits = 0
+        
+        # 置换表：(节点编号, 是否MAX节点) -> (剩余深度, 值, 最优子节点编号, 标志)
+        # 同一节点可能经由多个父节点到达，get_optimal_path 也会再次搜索子树，缓存后无需重复展开。
+        # 被剪枝的搜索只得到值的上界或下界，因此连同标志 TT_EXACT / TT_LOWER / TT_UPPER 一起保存。
+        self._tt = {}
         
         # 创建日志目录和初始化日志记录器
         os.makedirs(self.log_dir, exist_ok=True)
@@ -51,9 +183,9 @@ class MinMaxSolver:
         file_handler.setFormatter(formatter)
         self.logger.addHandler(file_handler)
         
-        # 控制台处理器
+        # 控制台处理器：默认只输出警告和错误，逐节点的搜索过程只写入日志文件
         console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
+        console_handler.setLevel(logging.WARNING)
         console_handler.setFormatter(formatter)
         self.logger.addHandler(console_handler)
         
@@ -62,10 +194,6 @@ class MinMaxSolver:
         self.logger.info(f"日志文件: {log_file}")
         self.logger.info("=" * 70)
     
-    def _is_leaf(self, node):
-        """判断是否为叶子节点"""
-        return len(node.children) == 0
-    
     def alpha_beta_search(self, node_name, depth, alpha, beta, is_maximizing, path=None):
         """
         Alpha-Beta剪枝搜索算法（基于搜索结果的伪代码实现）
@@ -74,110 +202,156 @@ class MinMaxSolver:
         :param alpha: Alpha值（MAX节点的最优下界）
         :param beta: Beta值（MIN节点的最优上界）
         :param is_maximizing: 是否为MAX节点
-        :param path: 当前搜索路径
+        :param path: 当前搜索路径（节点编号列表，整个搜索共用，进入节点时追加、返回前弹出）
         :return: (节点值, 最优子节点名称)
         """
         if path is None:
             path = []
         
-        path = path + [node_name]
-        node = self.nodes.get(node_name)
+        node_id = self.node_ids.get(node_name)
         
-        if node is None:
+        if node_id is None:
             self.logger.error(f"节点 '{node_name}' 不存在")
             return 0, None
         
+        # 内部按 Negamax 搜索：值和窗口都换算到当前行棋方的视角
+        if is_maximizing:
+            value, best_child = self._search(node_id, depth, alpha, beta, True, path)
+        else:
+            value, best_child = self._search(node_id, depth, -beta, -alpha, False, path)
+            value = -value
+        return value, (self.names[best_child] if best_child >= 0 else None)
+    
+    def _search(self, node_id, depth, alpha, beta, is_maximizing, path):
+        """
+        按节点编号做 Negamax 搜索，alpha/beta 和返回值都是当前行棋方视角
+        （MAX 节点与原值相同，MIN 节点取相反数）
+        :return: (节点值, 最优子节点编号)，没有最优子节点时为 -1
+        """
+        path.append(node_id)
+        try:
+            return self._search_node(node_id, depth, alpha, beta, is_maximizing, path)
+        finally:
+            path.pop()
+    
+    def _path_str(self, path):
+        """把节点编号路径转换为 'A -> B -> C' 形式"""
+        names = self.names
+        return ' -> '.join(names[i] for i in path)
+    
+    def _search_node(self, node_id, depth, alpha, beta, is_maximizing, path):
+        """_search 的主体，path 的末尾已是当前节点"""
+        names = self.names
+        node_name = names[node_id]
+        # 日志级别不够时跳过字符串拼接，避免在每个节点上格式化
+        log_enabled = self.logger.isEnabledFor(logging.INFO)
+        # 当前行棋方视角与 MAX 视角之间的换算系数（日志中仍按 MAX 视角输出）
+        sign = 1 if is_maximizing else -1
+        
+        # 查置换表：只复用相同剩余深度的结果（深度限制不同，节点的值也可能不同）
+        key = (node_id, is_maximizing)
+        entry = self._tt.get(key)
+        if entry is not None and entry[0] == depth:
+            _, cached_value, cached_child, flag = entry
+            if flag == TT_LOWER:
+                alpha = max(alpha, cached_value)
+            elif flag == TT_UPPER:
+                beta = min(beta, cached_value)
+            if flag == TT_EXACT or alpha >= beta:
+                self.tt_hits += 1
+                if log_enabled:
+                    self.logger.info(
+                        f"【置换表命中】{node_name} | 值: {sign * cached_value:.2f} | "
+                        f"最优子节点: {names[cached_child] if cached_child >= 0 else None} | "
+                        f"路径: {self._path_str(path)}"
+                    )
+                return cached_value, cached_child
+        alpha_orig, beta_orig = alpha, beta
+        
         self.node_visits += 1
         self.current_depth = max(self.current_depth, len(path))
         
-        # 记录节点访问信息
-        self.logger.info(
-            f"【访问节点】{node_name} | 深度: {len(path)-1} | "
-            f"类型: {'MAX' if is_maximizing else 'MIN'} | "
-            f"Alpha: {alpha:.2f} | Beta: {beta:.2f} | "
-            f"路径: {' -> '.join(path)}"
-        )
-        
-        # 叶子节点或搜索深度耗尽
-        if self._is_leaf(node) or depth == 0:
-            leaf_value = node.value if node.value is not None else 0
+        # 记录节点访问信息（MIN 节点的窗口 [alpha, beta] 换算回 [-beta, -alpha]）
+        if log_enabled:
+            shown_alpha, shown_beta = (alpha, beta) if is_maximizing else (-beta, -alpha)
             self.logger.info(
-                f"【叶子节点】{node_name} | 值: {leaf_value:.2f} | "
-                f"深度: {len(path)-1} | 路径: {' -> '.join(path)}"
+                f"【访问节点】{node_name} | 深度: {len(path)-1} | "
+                f"类型: {'MAX' if is_maximizing else 'MIN'} | "
+                f"Alpha: {shown_alpha:.2f} | Beta: {shown_beta:.2f} | "
+                f"路径: {self._path_str(path)}"
             )
-            return leaf_value, None
-        
-        best_child = None
         
-        if is_maximizing:
-            # MAX节点：选择最大值（基于搜索结果[^16^][^18^]）
-            value = float('-inf')
-            for i, child in enumerate(node.children):
-                child_value, _ = self.alpha_beta_search(
-                    child.name, depth - 1, alpha, beta, False, path
+        # 叶子节点或搜索深度耗尽
+        start = self.first_child[node_id]
+        count = self.n_children[node_id]
+        if count == 0 or depth == 0:
+            leaf_value = self.values[node_id]
+            if log_enabled:
+                self.logger.info(
+                    f"【叶子节点】{node_name} | 值: {leaf_value:.2f} | "
+                    f"深度: {len(path)-1} | 路径: {self._path_str(path)}"
                 )
-                
-                # 更新最优值和子节点
-                if child_value > value:
-                    value = child_value
-                    best_child = child.name
-                
-                alpha = max(alpha, value)
-                
-                # Beta剪枝（参考搜索结果[^18^]）
-                if value >= beta:
-                    self.pruning_count += 1
-                    self.logger.info(
-                        f"【β剪枝】{node_name} | 剪枝子节点: {child.name} "
-                        f"及后续 {len(node.children)-i-1} 个节点 | "
-                        f"原因: {value:.2f} >= β={beta:.2f} | "
-                        f"路径: {' -> '.join(path)}"
-                    )
-                    break
-            
-            self.logger.info(
-                f"【MAX返回】{node_name} | 值: {value:.2f} | "
-                f"Alpha: {alpha:.2f} | Beta: {beta:.2f} | "
-                f"最优子节点: {best_child}"
+            return sign * leaf_value, -1
+        
+        children = self.child_idx[start:start + count]
+        best_child = -1
+        
+        # MAX 和 MIN 节点统一为取相反数后的最大值（基于搜索结果[^16^][^18^]）
+        value = float('-inf')
+        for i, child in enumerate(children):
+            child_value, _ = self._search(
+                child, depth - 1, -beta, -alpha, not is_maximizing, path
             )
-            return value, best_child
+            child_value = -child_value
             
-        else:
-            # MIN节点：选择最小值
-            value = float('inf')
-            for i, child in enumerate(node.children):
-                child_value, _ = self.alpha_beta_search(
-                    child.name, depth - 1, alpha, beta, True, path
-                )
-                
-                # 更新最优值和子节点
-                if child_value < value:
-                    value = child_value
-                    best_child = child.name
-                
-                beta = min(beta, value)
-                
-                # Alpha剪枝
-                if value <= alpha:
-                    self.pruning_count += 1
+            # 更新最优值和子节点
+            if child_value > value:
+                value = child_value
+                best_child = child
+            
+            alpha = max(alpha, value)
+            
+            # 剪枝：MAX 节点为 β剪枝，MIN 节点为 α剪枝（参考搜索结果[^18^]）
+            if value >= beta:
+                self.pruning_count += 1
+                if log_enabled:
+                    if is_maximizing:
+                        reason = f"{value:.2f} >= β={beta:.2f}"
+                    else:
+                        reason = f"{-value:.2f} <= α={-beta:.2f}"
                     self.logger.info(
-                        f"【α剪枝】{node_name} | 剪枝子节点: {child.name} "
-                        f"及后续 {len(node.children)-i-1} 个节点 | "
-                        f"原因: {value:.2f} <= α={alpha:.2f} | "
-                        f"路径: {' -> '.join(path)}"
+                        f"【{'β' if is_maximizing else 'α'}剪枝】{node_name} | 剪枝子节点: {names[child]} "
+                        f"及后续 {count-i-1} 个节点 | "
+                        f"原因: {reason} | "
+                        f"路径: {self._path_str(path)}"
                     )
-                    break
-            
+                break
+        
+        if log_enabled:
+            shown_alpha, shown_beta = (alpha, beta) if is_maximizing else (-beta, -alpha)
             self.logger.info(
-                f"【MIN返回】{node_name} | 值: {value:.2f} | "
-                f"Alpha: {alpha:.2f} | Beta: {beta:.2f} | "
-                f"最优子节点: {best_child}"
+                f"【{'MAX' if is_maximizing else 'MIN'}返回】{node_name} | 值: {sign * value:.2f} | "
+                f"Alpha: {shown_alpha:.2f} | Beta: {shown_beta:.2f} | "
+                f"最优子节点: {names[best_child] if best_child >= 0 else None}"
             )
-            return value, best_child
+        self._tt_store(key, depth, value, best_child, alpha_orig, beta_orig)
+        return value, best_child
+    
+    def _tt_store(self, key, depth, value, best_child, alpha, beta):
+        """按搜索窗口 (alpha, beta) 判断 value 是精确值还是上/下界，写入置换表"""
+        if value <= alpha:
+            flag = TT_UPPER
+        elif value >= beta:
+            flag = TT_LOWER
+        else:
+            flag = TT_EXACT
+        self._tt[key] = (depth, value, best_child, flag)
     
     def get_optimal_path(self, depth):
         """
         获取从根节点开始的最优路径
+        沿置换表中记录的最优子节点逐层向下，只有缺少精确记录时才重新搜索该节点
+        （在 solve 中根节点已用完整窗口搜索过，主变例上的节点都有精确记录）
         :param depth: 搜索深度
         :return: 最优路径节点列表
         """
@@ -185,22 +359,25 @@ class MinMaxSolver:
             return []
         
         path = []
-        current_node = self.root_name
+        current = self.node_ids[self.root_name]
         is_maximizing = True
         
         for d in range(depth, -1, -1):
-            path.append(current_node)
-            node = self.nodes.get(current_node)
+            path.append(self.names[current])
             
-            if not node or not node.children:
+            if self.n_children[current] == 0:
                 break
             
-            _, best_child = self.alpha_beta_search(
-                current_node, d, float('-inf'), float('inf'), is_maximizing
-            )
+            entry = self._tt.get((current, is_maximizing))
+            if entry is not None and entry[0] == d and entry[3] == TT_EXACT:
+                best_child = entry[2]
+            else:
+                _, best_child = self._search(
+                    current, d, float('-inf'), float('inf'), is_maximizing, []
+                )
             
-            if best_child:
-                current_node = best_child
+            if best_child >= 0:
+                current = best_child
                 is_maximizing = not is_maximizing
             else:
                 break
@@ -222,6 +399,8 @@ class MinMaxSolver:
         self.node_visits = 0
         self.pruning_count = 0
         self.current_depth = 0
+        self.tt_hits = 0
+        self._tt.clear()
         
         # 执行Alpha-Beta搜索
         result_value, best_child = self.alpha_beta_search(
@@ -241,6 +420,7 @@ class MinMaxSolver:
         self.logger.info(f"搜索最大深度: {self.current_depth-1}")
         self.logger.info(f"访问节点总数: {self.node_visits}")
         self.logger.info(f"剪枝总次数: {self.pruning_count}")
+        self.logger.info(f"置换表命中次数: {self.tt_hits}")
         self.logger.info(f"剪枝效率: {(self.pruning_count/(self.node_visits+1)):.2%}")
         self.logger.info("=" * 70)
         
@@ -251,9 +431,58 @@ class MinMaxSolver:
             'optimal_path': optimal_path,
             'node_visits': self.node_visits,
             'pruning_count': self.pruning_count,
+            'tt_hits': self.tt_hits,
             'max_depth': self.current_depth - 1
         }
 
+    def solve_fast(self, depth=999):
+        """
+        不记录逐节点日志的搜索：在 CSR 数组上调用 _ab（安装 Numba 时为编译后的版本），
+        最优路径取自 PV 表的根节点一行。solve 仍是带详细日志的调试入口。
+        :param depth: 最大搜索深度（默认999表示搜索到底）
+        :return: 与 solve 相同字段的结果字典（不含 tt_hits）
+        """
+        if not self.root:
+            return {
+                'optimal_value': 0, 'best_child': None, 'optimal_path': [],
+                'node_visits': 0, 'pruning_count': 0, 'max_depth': -1
+            }
+        
+        root = self.node_ids[self.root_name]
+        # PV 表每层一行，行数和行宽都只需覆盖实际可达的层数
+        width = min(depth, tree_height(self.first_child, self.n_children, self.child_idx, root)) + 1
+        if np is not None:
+            arrays = (
+                np.asarray(self.first_child, dtype=np.int32),
+                np.asarray(self.n_children, dtype=np.int32),
+                np.asarray(self.child_idx, dtype=np.int32),
+                np.asarray(self.values, dtype=np.float64),
+            )
+            pv = np.full(width * width, -1, dtype=np.int32)
+            pv_len = np.zeros(width, dtype=np.int32)
+            counters = np.zeros(3, dtype=np.int64)
+        else:
+            arrays = (self.first_child, self.n_children, self.child_idx, self.values)
+            pv = [-1] * (width * width)
+            pv_len = [0] * width
+            counters = [0, 0, 0]
+        
+        result_value = _ab(*arrays, root, depth, 0, -math.inf, math.inf, 1.0, pv, pv_len, width, counters)
+        
+        # 根节点那一行就是最优路径
+        optimal_path = [self.root_name]
+        optimal_path += [self.names[int(child)] for child in pv[:pv_len[0]]]
+        
+        best_child = optimal_path[1] if len(optimal_path) > 1 else None
+        return {
+            'optimal_value': float(result_value),
+            'best_child': best_child,
+            'optimal_path': optimal_path,
+            'node_visits': int(counters[VISITS]),
+            'pruning_count': int(counters[PRUNINGS]),
+            'max_depth': int(counters[MAX_PLY])
+        }
+
 # 备用函数：用于快速创建测试树
 def create_test_tree():
     """创建示例树结构用于测试"""
@@ -0,0 +1,14 @@
+"""
+Pytest configuration for the ch7_game tests.
+
+Puts ``ch7_game`` on ``sys.path`` so the tests can ``import minmax_solver``
+the same way the notebook and scripts do.
+"""
+
+import os
+import sys
+
+CH7_GAME_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if CH7_GAME_DIR not in sys.path:
+    sys.path.append(CH7_GAME_DIR)
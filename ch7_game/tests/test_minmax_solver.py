@@ -0,0 +1,67 @@
+"""
+MinMaxSolver Test
+
+Checks that the logging search (solve) and the CSR kernel (solve_fast) agree
+on value and principal variation, including game graphs where a node is
+reachable from more than one parent.
+"""
+
+from minmax_solver import MinMaxSolver
+
+
+class _Node:
+    """Minimal stand-in for tree_visualizer.TreeNode (name, value, children)"""
+
+    def __init__(self, name, value=None):
+        self.name = name
+        self.value = value
+        self.children = []
+
+
+def _build(edges, values):
+    """Build a node dict from a parent -> children mapping and leaf values"""
+    nodes = {}
+    for parent, children in edges.items():
+        nodes.setdefault(parent, _Node(parent))
+        for child in children:
+            node = nodes.setdefault(child, _Node(child))
+            nodes[parent].children.append(node)
+    for name, value in values.items():
+        nodes[name].value = value
+    return nodes
+
+
+def test_solve_fast_path_matches_solve_on_shared_nodes(tmp_path):
+    """
+    A -> B, C, D; B -> D; C -> E; D -> E, F. D is both A's child (MIN to move)
+    and B's child (MAX to move), so a per-node best-child link gets overwritten
+    """
+    nodes = _build(
+        {'A': ['B', 'C', 'D'], 'B': ['D'], 'C': ['E'], 'D': ['E', 'F']},
+        {'E': 7, 'F': 8},
+    )
+    solver = MinMaxSolver(nodes, 'A', log_dir=str(tmp_path))
+
+    slow = solver.solve()
+    fast = solver.solve_fast()
+
+    assert slow['optimal_path'] == ['A', 'B', 'D', 'F']
+    assert fast['optimal_path'] == slow['optimal_path']
+    assert fast['optimal_value'] == slow['optimal_value'] == 8
+    assert fast['best_child'] == slow['best_child'] == 'B'
+
+
+def test_solve_fast_respects_depth_limit(tmp_path):
+    """A depth-limited search stops the path at the horizon"""
+    nodes = _build(
+        {'A': ['B', 'C'], 'B': ['D', 'E'], 'C': ['F', 'G']},
+        {'B': 1, 'C': 2, 'D': 3, 'E': 5, 'F': 2, 'G': 9},
+    )
+    solver = MinMaxSolver(nodes, 'A', log_dir=str(tmp_path))
+
+    for depth in (1, 2):
+        slow = solver.solve(depth)
+        fast = solver.solve_fast(depth)
+        assert fast['optimal_path'] == slow['optimal_path']
+        assert len(fast['optimal_path']) == depth + 1
+        assert fast['optimal_value'] == slow['optimal_value']
@@ -1,6 +1,22 @@
 import plotly.graph_objects as go
 from collections import deque
-import re
+
+try:
+    import numpy as np
+except ImportError:  # 可选加速
+    np = None
+
+def _parse_number(token):
+    """
+    token 形如 -?\d+(\.\d+)? 时返回其 float 值，否则返回 None。
+    用 str 方法逐段检查代替正则；isdecimal() 与 \d 接受的字符相同，
+    因此 '+5'、'1e3'、'1_0'、'inf' 等仍按节点名处理
+    """
+    digits = token[1:] if token[:1] == '-' else token
+    int_part, dot, frac_part = digits.partition('.')
+    if not int_part.isdecimal() or (dot and not frac_part.isdecimal()):
+        return None
+    return float(token)
 
 class TreeNode:
     """树节点类，存储节点名称、值和子节点"""
@@ -10,8 +26,8 @@ class TreeNode:
         self.children = []
         
     def add_child(self, child_node):
-        """添加子节点"""
-        self.children.append(child_node)
+        """添加子节点（children 为列表或冻结后的元组时都适用）"""
+        self.children += (child_node,)
 
 class TreeVisualizer:
     """树可视化类，负责解析文件、构建树和可视化"""
@@ -42,11 +58,11 @@ class TreeVisualizer:
             parent_part, children_part = line.split(':', 1)
             parent_name = parent_part.strip()
             
-            # 获取或创建父节点
-            if parent_name not in self.nodes:
-                self.nodes[parent_name] = TreeNode(parent_name)
-            
-            parent_node = self.nodes[parent_name]
+            # 获取或创建父节点（一次字典查找）
+            nodes = self.nodes
+            parent_node = nodes.get(parent_name)
+            if parent_node is None:
+                parent_node = nodes[parent_name] = TreeNode(parent_name)
             
             # 设置根节点（第一个出现的父节点）
             if self.root is None:
@@ -54,28 +70,44 @@ class TreeVisualizer:
             
             # 解析子节点部分
             tokens = children_part.strip().split()
+            prev_node = None  # 上一个 token 对应的节点（上一个 token 是数字时为 None）
             i = 0
             while i < len(tokens):
                 token = tokens[i]
                 
-                # 检查是否是数字（整数或小数）
-                if re.match(r'^-?\d+(\.\d+)?$', token):
+                # 检查是否是数字（整数或小数），语法与原正则 ^-?\d+(\.\d+)?$ 相同
+                value = _parse_number(token)
+                if value is not None:
                     # 是数字，赋给前一个节点作为值
                     if i > 0:
-                        prev_token = tokens[i-1]
-                        if prev_token in self.nodes:
-                            self.nodes[prev_token].value = float(token)
+                        if prev_node is not None:
+                            prev_node.value = value
                     else:
                         print(f"警告: 行 '{line}' 中的数字 '{token}' 没有对应的节点")
+                    prev_node = None
                     i += 1
                 else:
                     # 是节点名称
-                    if token not in self.nodes:
-                        self.nodes[token] = TreeNode(token)
+                    node = nodes.get(token)
+                    if node is None:
+                        node = nodes[token] = TreeNode(token)
                     
                     # 添加到父节点的子节点列表
-                    parent_node.add_child(self.nodes[token])
+                    parent_node.add_child(node)
+                    prev_node = node
                     i += 1
+        
+        # 解析完成后子节点不再变化，冻结为元组
+        for node in self.nodes.values():
+            node.children = tuple(node.children)
+    
+    def build_csr(self):
+        """
+        把树压平为 CSR 形式的并列数组，供 MinMaxSolver 按整数编号搜索
+        返回: (names, values, first_child, n_children, child_idx)，见 minmax_solver.build_csr
+        """
+        from minmax_solver import build_csr
+        return build_csr(self.nodes)
     
     def calculate_positions(self):
         """使用BFS计算每个节点的位置（x, y）"""
@@ -111,25 +143,42 @@ class TreeVisualizer:
         return positions
     
     def get_edges(self, positions):
-        """获取所有边的坐标用于绘制"""
-        edges_x = []
-        edges_y = []
+        """
+        获取所有边的坐标用于绘制
+        每条边占 3 个位置：起点、终点和分隔符（NumPy 数组中为 NaN，列表中为 None），
+        安装了 NumPy 时按下标批量填充数组
+        """
+        index = {name: i for i, name in enumerate(positions)}
+        parent_ids = []
+        child_ids = []
         
         queue = deque([self.root])
         while queue:
             node = queue.popleft()
             
             for child in node.children:
-                if node.name in positions and child.name in positions:
-                    x_parent, y_parent = positions[node.name]
-                    x_child, y_child = positions[child.name]
-                    
-                    # 添加边（每段线由起点、终点和None组成，用于分隔不同边）
-                    edges_x.extend([x_parent, x_child, None])
-                    edges_y.extend([y_parent, y_child, None])
+                if node.name in index and child.name in index:
+                    parent_ids.append(index[node.name])
+                    child_ids.append(index[child.name])
                 
                 queue.append(child)
         
+        if np is not None:
+            pos_arr = np.array(list(positions.values()), dtype=float).reshape(-1, 2)
+            edges_x = np.full(3 * len(parent_ids), np.nan)
+            edges_y = np.full(3 * len(parent_ids), np.nan)
+            edges_x[0::3] = pos_arr[parent_ids, 0]
+            edges_x[1::3] = pos_arr[child_ids, 0]
+            edges_y[0::3] = pos_arr[parent_ids, 1]
+            edges_y[1::3] = pos_arr[child_ids, 1]
+            return edges_x, edges_y
+        
+        coords = list(positions.values())
+        edges_x = [None] * (3 * len(parent_ids))
+        edges_y = [None] * (3 * len(parent_ids))
+        for k, (p, c) in enumerate(zip(parent_ids, child_ids)):
+            edges_x[3 * k], edges_y[3 * k] = coords[p]
+            edges_x[3 * k + 1], edges_y[3 * k + 1] = coords[c]
         return edges_x, edges_y
     
     def visualize(self, title="树结构可视化", width=800, height=600):
@@ -148,7 +197,7 @@ class TreeVisualizer:
         fig = go.Figure()
         
         # 添加边
-        if edges_x and edges_y:
+        if len(edges_x):
             fig.add_trace(go.Scatter(
                 x=edges_x,
                 y=edges_y,
@@ -5,7 +5,7 @@
 这个适配器展示了如何将特定问题集成到泛化求解器框架中。
 """
 
-from typing import Dict, List
+from typing import Dict, List, Tuple
 from csp_model import AustraliaMapColoringCSP, Color, Region
 from generic_solver import CSPBase
 
@@ -27,7 +27,28 @@ class AustraliaCSPAdapter(CSPBase[Region, Color]):
         """
         super().__init__()
         self.csp_model = csp_model
+        self.variables = csp_model.variables
         self.domains = csp_model.domains  # 直接引用模型的值域
+        # 邻接关系在求解过程中不变，预先转换为元组
+        self.neighbors = {region: tuple(neighbors) for region, neighbors in csp_model.neighbors.items()}
+
+        # 求解器在搜索中频繁调用下面几个方法，它们只是转发给模型。
+        # 把实例属性直接绑定到数据和函数上，调用时不再多经过一层 Python 函数；
+        # 类中的同名方法保留，用于满足 CSPBase 接口并说明各方法的含义。
+        neighbor_tuples = self.neighbors
+
+        def is_consistent(var: Region, value: Color, assignment: Dict[Region, Color]) -> bool:
+            # 颜色是枚举成员，用 is 比较；未赋值的邻居 get 得到 None
+            get = assignment.get
+            for neighbor in neighbor_tuples[var]:
+                if get(neighbor) is value:
+                    return False
+            return True
+
+        self.get_variables = lambda: csp_model.variables
+        self.get_domain = csp_model.domains.__getitem__
+        self.get_neighbors = neighbor_tuples.__getitem__
+        self.is_consistent = is_consistent
 
     def get_variables(self) -> List[Region]:
         """获取所有变量（地区）"""
@@ -37,9 +58,9 @@ class AustraliaCSPAdapter(CSPBase[Region, Color]):
         """获取变量的值域（颜色）"""
         return self.csp_model.domains[var]
 
-    def get_neighbors(self, var: Region) -> List[Region]:
+    def get_neighbors(self, var: Region) -> Tuple[Region, ...]:
         """获取变量的邻居（相邻地区）"""
-        return self.csp_model.neighbors[var]
+        return self.neighbors[var]
 
     def is_consistent(self, var: Region, value: Color, assignment: Dict[Region, Color]) -> bool:
         """检查赋值是否满足约束"""
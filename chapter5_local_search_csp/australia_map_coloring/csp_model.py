@@ -13,6 +13,11 @@
 from typing import Dict, List, Tuple, Set
 from enum import Enum
 
+try:
+    import numpy as np
+except ImportError:  # 可选：没有 NumPy 时邻接数组用列表
+    np = None
+
 
 class Color(Enum):
     """颜色枚举类"""
@@ -38,6 +43,11 @@ class Region(Enum):
         return self.value
 
 
+def _canon(a: Region, b: Region) -> Tuple[Region, Region]:
+    """约束对的规范形式：按地区简称的字母顺序排列"""
+    return (a, b) if a.name < b.name else (b, a)
+
+
 class AustraliaMapColoringCSP:
     """澳大利亚地图涂色问题的CSP形式化模型"""
 
@@ -57,6 +67,11 @@ class AustraliaMapColoringCSP:
         # 邻接关系定义（基于澳大利亚地理邻接）
         self.neighbors = self._initialize_neighbors()
 
+        # 地区编号和 CSR 形式的邻接表：编号 i 的邻居是
+        # _adj_indices[_adj_indptr[i]:_adj_indptr[i+1]]
+        self._region_id = {region: i for i, region in enumerate(self.variables)}
+        self._adj_indptr, self._adj_indices = self._build_adjacency_csr()
+
         # 约束集合 C
         self.constraints = self._initialize_constraints()
 
@@ -89,6 +104,36 @@ class AustraliaMapColoringCSP:
         }
         return neighbors
 
+    def _build_adjacency_csr(self):
+        """
+        把邻接关系转换为 CSR 数组 (indptr, indices)
+        先统计每个地区的度数得到 indptr，再依次填入邻居编号
+        """
+        n = len(self.variables)
+        degrees = [len(self.neighbors[region]) for region in self.variables]
+        indptr = [0] * (n + 1)
+        for i in range(n):
+            indptr[i + 1] = indptr[i] + degrees[i]
+
+        indices = [0] * indptr[n]
+        for i, region in enumerate(self.variables):
+            start = indptr[i]
+            for k, neighbor in enumerate(self.neighbors[region]):
+                indices[start + k] = self._region_id[neighbor]
+
+        if np is not None:
+            return np.asarray(indptr, dtype=np.int32), np.asarray(indices, dtype=np.int32)
+        return indptr, indices
+
+    def get_neighbor_ids(self, region_id: int):
+        """
+        获取编号为 region_id 的地区的邻居编号
+
+        Returns:
+            CSR 邻接数组中的一段切片（NumPy 数组时为视图，不复制）
+        """
+        return self._adj_indices[self._adj_indptr[region_id]:self._adj_indptr[region_id + 1]]
+
     def _initialize_constraints(self) -> List[Tuple[Region, Region]]:
         """
         初始化约束集合 C
@@ -97,14 +142,13 @@ class AustraliaMapColoringCSP:
         约束形式：C_i : <{X₁, X₂}, X₁ ≠ X₂>，其中 X₁, X₂ 是相邻区域
         """
         constraints = []
-        processed_pairs = set()  # 避免重复添加相同的约束对
 
-        for region in self.variables:
-            for neighbor in self.neighbors[region]:
-                pair = tuple(sorted([region, neighbor], key=lambda x: x.name))
-                if pair not in processed_pairs:
-                    constraints.append(pair)
-                    processed_pairs.add(pair)
+        # 每条边在 CSR 中出现两次，只在编号较小的一端输出一次
+        for i, region in enumerate(self.variables):
+            for j in self.get_neighbor_ids(i):
+                if i < j:
+                    neighbor = self.variables[j]
+                    constraints.append(_canon(region, neighbor))
 
         return constraints
 
@@ -217,11 +261,12 @@ class AustraliaMapColoringCSP:
         Returns:
             List[Region]: 有冲突的变量列表
         """
-        conflicted = []
-        for region, color in assignment.items():
-            if not self.is_consistent(region, color, assignment):
-                conflicted.append(region)
-        return conflicted
+        # 每条约束只检查一次，再按赋值中的顺序输出涉及冲突的地区
+        conflicted = set()
+        for region1, region2 in self._conflicting_pairs(assignment):
+            conflicted.add(region1)
+            conflicted.add(region2)
+        return [region for region in assignment if region in conflicted]
 
     def count_conflicts(self, assignment: Dict[Region, Color]) -> int:
         """
@@ -233,12 +278,19 @@ class AustraliaMapColoringCSP:
         Returns:
             int: 冲突总数
         """
-        conflicts = 0
+        return sum(1 for _ in self._conflicting_pairs(assignment))
+
+    def _conflicting_pairs(self, assignment: Dict[Region, Color]):
+        """
+        依次产出被违反的约束（两端都已赋值且颜色相同的相邻地区对）
+
+        Args:
+            assignment: 当前赋值
+        """
         for region1, region2 in self.constraints:
             if region1 in assignment and region2 in assignment:
                 if assignment[region1] == assignment[region2]:
-                    conflicts += 1
-        return conflicts
+                    yield region1, region2
 
     def print_assignment(self, assignment: Dict[Region, Color], title="当前赋值"):
         """
@@ -315,15 +367,9 @@ class AustraliaMapColoringCSP:
             (Region.NSW, Region.VIC)
         ]
 
+        constraint_set = {_canon(region1, region2) for region1, region2 in self.constraints}
         for expected_pair in expected_constraints:
-            normalized_expected = tuple(sorted(expected_pair, key=lambda x: x.name))
-            found = False
-            for constraint in self.constraints:
-                normalized_constraint = tuple(sorted(constraint, key=lambda x: x.name))
-                if normalized_constraint == normalized_expected:
-                    found = True
-                    break
-            if not found:
+            if _canon(*expected_pair) not in constraint_set:
                 print(f"错误：缺少约束 {expected_pair[0].name} ≠ {expected_pair[1].name}")
                 return False
 
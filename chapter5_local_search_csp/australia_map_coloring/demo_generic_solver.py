@@ -30,21 +30,22 @@ class SimpleMapCSP(CSPBase[int, str]):
         self.variables = variables
         self.domain = domain
         self.constraints = constraints
+        # 每个变量一份值域列表（CSPBase.domains 约定的变量 -> 值域映射）
+        self.domains = {var: list(domain) for var in variables}
+        # 邻接表只在这里由约束列表构建一次，get_neighbors 直接查表
+        self._neighbor_map: Dict[int, List[int]] = {var: [] for var in variables}
+        for var1, var2 in constraints:
+            self._neighbor_map[var1].append(var2)
+            self._neighbor_map[var2].append(var1)
 
     def get_variables(self) -> List[int]:
         return self.variables
 
     def get_domain(self, var: int) -> List[str]:
-        return self.domain.copy()
+        return self.domains[var]
 
     def get_neighbors(self, var: int) -> List[int]:
-        neighbors = []
-        for constraint in self.constraints:
-            if var == constraint[0]:
-                neighbors.append(constraint[1])
-            elif var == constraint[1]:
-                neighbors.append(constraint[0])
-        return neighbors
+        return self._neighbor_map[var]
 
     def is_consistent(self, var: int, value: str, assignment: Dict[int, str]) -> bool:
         for neighbor in self.get_neighbors(var):
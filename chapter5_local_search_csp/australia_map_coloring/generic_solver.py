@@ -5,15 +5,96 @@
 包含通用的启发式算法、约束传播机制和统计功能。
 """
 
-import copy
 import time
+from collections import deque
 from typing import Dict, List, Tuple, Optional, Set, Any, TypeVar, Generic
 from abc import ABC, abstractmethod
 
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:  # 可选加速
+    np = None
+    njit = None
+
+NUMBA_AVAILABLE = njit is not None
+
 # 泛型类型变量
 V = TypeVar('V')  # 变量类型
 D = TypeVar('D')  # 值域类型
 
+# 值域位掩码中 1 的个数，即剩余可取值的数量
+popcount = int.bit_count
+
+# 编译版 AC-3 的值域用 int64 存放，最多容纳的不同值个数
+KERNEL_MAX_VALUES = 63
+
+
+def _ac3_kernel(indptr, indices, edge_src, domains, var_id, queue, in_queue, trail_var, trail_bits):
+    """
+    “相邻变量取值不同”约束下的 AC-3，只用整数数组。
+
+    邻接表为 CSR 形式：变量 u 的邻居是 indices[indptr[u]:indptr[u+1]]，
+    edge_src[e] 是第 e 条记录所在的行 u。弧 (indices[e], edge_src[e]) 用 e 表示，
+    queue 是长度为 len(indices) 的环形队列，in_queue[e] 标记弧是否已在队列中。
+    domains 是各变量的值域位掩码，删除记录依次写入 trail_var / trail_bits。
+
+    Returns:
+        写入的删除记录条数；出现空值域时先撤销已删除的值，返回 -1
+    安装 Numba 时用 njit(cache=True) 编译。
+    """
+    size = len(queue)
+    head = 0
+    count = 0
+    for e in range(indptr[var_id], indptr[var_id + 1]):
+        if in_queue[e] == 0:
+            queue[(head + count) % size] = e
+            in_queue[e] = 1
+            count += 1
+
+    n_trail = 0
+    while count > 0:
+        e = queue[head]
+        head = (head + 1) % size
+        count -= 1
+        in_queue[e] = 0
+
+        # Xj 只剩一个值时，Xi 中的这个值失去支持
+        xi = indices[e]
+        xj = edge_src[e]
+        xj_mask = domains[xj]
+        if xj_mask & (xj_mask - 1) != 0:
+            continue
+        removed = domains[xi] & xj_mask
+        if removed == 0:
+            continue
+
+        domains[xi] &= ~removed
+        trail_var[n_trail] = xi
+        trail_bits[n_trail] = removed
+        n_trail += 1
+
+        if domains[xi] == 0:
+            for t in range(n_trail - 1, -1, -1):
+                domains[trail_var[t]] |= trail_bits[t]
+            while count > 0:
+                in_queue[queue[head]] = 0
+                head = (head + 1) % size
+                count -= 1
+            return -1
+
+        for f in range(indptr[xi], indptr[xi + 1]):
+            if indices[f] != xj and in_queue[f] == 0:
+                queue[(head + count) % size] = f
+                in_queue[f] = 1
+                count += 1
+
+    return n_trail
+
+
+if NUMBA_AVAILABLE:
+    _ac3_kernel = njit(cache=True)(_ac3_kernel)
+
 
 class CSPBase(ABC, Generic[V, D]):
     """
@@ -70,23 +151,40 @@ class GenericBacktrackSolver(Generic[V, D]):
     实现最终优化版回溯搜索算法：
     1. MRV + 度启发式的变量选择
     2. LCV值排序
-    3. AC-3约束传播
-    4. 完整的状态回滚
+    3. 约束传播：前向检验（默认）或 AC-3
+    4. 基于轨迹（trail）的状态回滚：只撤销本层赋值和传播删除的值
+
+    求解前先把 CSP 编译为以整数编号为下标的表：变量、邻居都用编号表示，
+    值域用整数位掩码表示（每个不同的值占一位），删除、求交和判空都是整数运算；
+    CSP 对象自身的值域在求解过程中不被修改。
     """
 
-    def __init__(self, csp: CSPBase[V, D]):
+    PROPAGATION_MODES = ('fc', 'ac3')
+
+    def __init__(self, csp: CSPBase[V, D], propagation: str = 'fc'):
         """
         初始化求解器
 
         Args:
             csp: CSP问题实例
+            propagation: 约束传播方式，'fc' 为前向检验（只检查刚赋值变量的邻居），
+                'ac3' 为完整的 AC-3 弧相容
         """
+        if propagation not in self.PROPAGATION_MODES:
+            raise ValueError(f"未知的约束传播方式: {propagation}")
         self.csp = csp
+        self.propagation = propagation
         self.nodes_explored = 0
         self.solution = None
         self.start_time = None
         self.end_time = None
 
+        # 没有重写 _constraint_satisfied 时，约束就是“相邻变量取值不同”。
+        # LCV 和 AC-3 只在相邻变量之间检查约束，可以直接比较值，不再逐对调用该方法
+        self._not_equal_only = (
+            type(self)._constraint_satisfied is GenericBacktrackSolver._constraint_satisfied
+        )
+
         # 统计信息
         self.backtrack_count = 0
         self.inference_failures = 0
@@ -112,6 +210,14 @@ class GenericBacktrackSolver(Generic[V, D]):
         self.value_tries = 0
         self.solution = None
         self.start_time = time.time()
+        self._compile_tables()
+        # 安装了 Numba 且约束是简单的不等约束时，AC-3 改用编译后的 _ac3_kernel
+        self._use_kernel = (
+            self.propagation == 'ac3' and NUMBA_AVAILABLE and self._not_equal_only
+            and len(self._value_bit) <= KERNEL_MAX_VALUES
+        )
+        if self._use_kernel:
+            self._init_kernel_arrays()
 
         assignment = {}
         result, final_assignment = self._backtrack(assignment, verbose)
@@ -139,153 +245,354 @@ class GenericBacktrackSolver(Generic[V, D]):
         if self.csp.is_complete(assignment):
             return True, assignment
 
-        # 选择未赋值的变量
-        var = self._select_unassigned_variable(assignment)
-        ordered_values = self._order_domain_values(var, assignment)
+        # 选择未赋值的变量（内部编号）
+        vid = self._select_unassigned_variable(assignment)
+        var = self._variables[vid]
+        ordered_values = self._order_domain_values(vid, assignment)
 
         # 尝试每个值
         for value in ordered_values:
             self.value_tries += 1
 
             if self.csp.is_consistent(var, value, assignment):
-                # 记录赋值前的状态
-                original_assignment = copy.deepcopy(assignment)
-                original_domains = copy.deepcopy(self.csp.domains)
-
                 # 执行赋值
                 assignment[var] = value
+                self._unassigned.discard(vid)
 
-                # 约束传播
-                inferences = self._ac3_inference(var, value)
+                # 约束传播（失败时已自行撤销删除的值）
+                if self.propagation == 'fc':
+                    inferences = self._forward_check(vid, value)
+                else:
+                    inferences = self._ac3_inference(vid, value)
 
                 if inferences is not None:
                     # 递归搜索
                     result, new_assignment = self._backtrack(assignment, verbose)
                     if result:
                         return True, new_assignment
+                    self._undo(inferences)
 
                 # 回滚状态
-                assignment.clear()
-                assignment.update(original_assignment)
-                self.csp.domains.clear()
-                self.csp.domains.update(original_domains)
+                del assignment[var]
+                self._unassigned.add(vid)
                 self.backtrack_count += 1
 
         return False, assignment
 
-    def _select_unassigned_variable(self, assignment: Dict[V, D]) -> V:
-        """选择未赋值的变量（MRV + 度启发式）"""
-        variables = self.csp.get_variables()
-        unassigned_vars = [v for v in variables if v not in assignment]
+    def _compile_tables(self):
+        """
+        把 CSP 编译为以整数编号为下标的表
+
+        变量按 get_variables() 的顺序编号为 0..n-1，每个不同的值分配一位，
+        建立各变量的邻居编号元组和值域位掩码；搜索内部只使用编号，
+        只有调用 CSP 的 is_consistent 和 _constraint_satisfied 时才换回原始的变量。
+        """
+        variables = list(self.csp.get_variables())
+        self._variables: List[V] = variables                    # 编号 -> 变量
+        self._vid: Dict[V, int] = {var: i for i, var in enumerate(variables)}
+        self._neighbors: List[Tuple[int, ...]] = [
+            tuple(self._vid[neighbor] for neighbor in self.csp.get_neighbors(var))
+            for var in variables
+        ]
+        self._value_bit: Dict[D, int] = {}   # 值 -> 位
+        self._bit_value: Dict[int, D] = {}   # 位 -> 值
+        self._values: List[Tuple[D, ...]] = []  # 各变量的初始值域（保持原顺序）
+        self._domains: List[int] = []        # 各变量的当前值域掩码
+
+        for var in variables:
+            values = tuple(self.csp.get_domain(var))
+            mask = 0
+            for value in values:
+                bit = self._value_bit.get(value)
+                if bit is None:
+                    bit = 1 << len(self._value_bit)
+                    self._value_bit[value] = bit
+                    self._bit_value[bit] = value
+                mask |= bit
+            self._values.append(values)
+            self._domains.append(mask)
+
+        # 未赋值变量的编号集合，随赋值/回滚增量维护
+        self._unassigned: Set[int] = set(range(len(variables)))
+
+    def _init_kernel_arrays(self):
+        """为 _ac3_kernel 建立 CSR 邻接表、值域数组和工作缓冲区"""
+        indptr = [0]
+        indices = []
+        edge_src = []
+        for i, neighbors in enumerate(self._neighbors):
+            indices.extend(neighbors)
+            edge_src.extend([i] * len(neighbors))
+            indptr.append(len(indices))
+        domains = self._domains
+        # 每条删除记录至少删掉一个值，条数不超过初始值域大小之和
+        trail_size = max(sum(popcount(mask) for mask in domains), 1)
+        queue_size = max(len(indices), 1)
+
+        if np is not None:
+            self._kernel_arrays = (
+                np.asarray(indptr, dtype=np.int32),
+                np.asarray(indices, dtype=np.int32),
+                np.asarray(edge_src, dtype=np.int32),
+                np.asarray(domains, dtype=np.int64),
+            )
+            self._kernel_buffers = (
+                np.zeros(queue_size, dtype=np.int32),
+                np.zeros(queue_size, dtype=np.uint8),
+                np.zeros(trail_size, dtype=np.int32),
+                np.zeros(trail_size, dtype=np.int64),
+            )
+        else:
+            self._kernel_arrays = (indptr, indices, edge_src, list(domains))
+            self._kernel_buffers = ([0] * queue_size, [0] * queue_size, [0] * trail_size, [0] * trail_size)
+
+    def _domain_values(self, vid: int) -> List[D]:
+        """编号为 vid 的变量当前值域中的值，按初始值域的顺序排列"""
+        mask = self._domains[vid]
+        value_bit = self._value_bit
+        return [value for value in self._values[vid] if mask & value_bit[value]]
+
+    def _select_unassigned_variable(self, assignment: Dict[V, D]) -> int:
+        """选择未赋值的变量（MRV + 度启发式），返回其编号"""
+        domains = self._domains
 
         # MRV启发式
         min_domain_size = float('inf')
         mrv_candidates = []
 
-        for var in unassigned_vars:
-            domain_size = len(self.csp.get_domain(var))
+        for vid in self._unassigned:
+            domain_size = popcount(domains[vid])
             if domain_size < min_domain_size:
                 min_domain_size = domain_size
-                mrv_candidates = [var]
+                mrv_candidates = [vid]
             elif domain_size == min_domain_size:
-                mrv_candidates.append(var)
+                mrv_candidates.append(vid)
 
         if len(mrv_candidates) == 1:
             return mrv_candidates[0]
 
+        # 集合没有顺序：编号即变量的原始位置，排序后平局时的选择与按变量列表扫描一致
+        mrv_candidates.sort()
+
         # 度启发式（打破平局）
         max_degree = -1
         final_candidate = mrv_candidates[0]
 
-        for var in mrv_candidates:
-            degree = self._count_unassigned_neighbors(var, assignment)
+        for vid in mrv_candidates:
+            degree = self._count_unassigned_neighbors(vid)
             if degree > max_degree:
                 max_degree = degree
-                final_candidate = var
+                final_candidate = vid
 
         return final_candidate
 
-    def _order_domain_values(self, var: V, assignment: Dict[V, D]) -> List[D]:
-        """对变量的值域进行排序（LCV启发式）"""
-        domain = self.csp.get_domain(var)
-        value_conflicts = {}
+    def _order_domain_values(self, vid: int, assignment: Dict[V, D]) -> List[D]:
+        """对编号为 vid 的变量的值域进行排序（LCV启发式）"""
+        domain = self._domain_values(vid)
+        if len(domain) <= 1:
+            # 只剩一个值（或没有值）时无需排序
+            return domain
 
-        for value in domain:
-            total_conflicts = 0
-            unassigned_neighbors = self._get_unassigned_neighbors(var, assignment)
+        value_conflicts = {}
+        unassigned_neighbors = self._get_unassigned_neighbors(vid)
+
+        if self._not_equal_only:
+            # 值的冲突数 = 值域中仍包含该值的未赋值邻居个数
+            neighbor_masks = [self._domains[neighbor] for neighbor in unassigned_neighbors]
+            value_bit = self._value_bit
+            for value in domain:
+                bit = value_bit[value]
+                value_conflicts[value] = sum(1 for mask in neighbor_masks if mask & bit)
+        else:
+            variables = self._variables
+            var = variables[vid]
+            neighbor_domains = [
+                (variables[neighbor], self._domain_values(neighbor)) for neighbor in unassigned_neighbors
+            ]
+            for value in domain:
+                total_conflicts = 0
 
-            for neighbor in unassigned_neighbors:
-                for neighbor_value in self.csp.get_domain(neighbor):
-                    if not self._constraint_satisfied(var, value, neighbor, neighbor_value):
-                        total_conflicts += 1
+                for neighbor, neighbor_domain in neighbor_domains:
+                    for neighbor_value in neighbor_domain:
+                        if not self._constraint_satisfied(var, value, neighbor, neighbor_value):
+                            total_conflicts += 1
 
-            value_conflicts[value] = total_conflicts
+                value_conflicts[value] = total_conflicts
 
         return sorted(domain, key=lambda v: value_conflicts[v])
 
-    def _ac3_inference(self, var: V, value: D) -> Optional[List[Tuple[V, D]]]:
-        """AC-3约束传播算法"""
+    def _forward_check(self, vid: int, value: D) -> Optional[List[Tuple[int, int]]]:
+        """
+        前向检验：从刚赋值变量的每个未赋值邻居的值域中删除与 value 冲突的值
+
+        Returns:
+            与 _ac3_inference 相同的删除记录；某个邻居值域为空时先撤销，再返回 None
+        """
+        domains = self._domains
+        unassigned = self._unassigned
         inferences = []
-        queue = []
 
-        for neighbor in self.csp.get_neighbors(var):
-            queue.append((neighbor, var))
+        if self._not_equal_only:
+            bit = self._value_bit[value]
+            for neighbor in self._neighbors[vid]:
+                if neighbor not in unassigned or not domains[neighbor] & bit:
+                    continue
+                domains[neighbor] ^= bit
+                inferences.append((neighbor, bit))
+                if domains[neighbor] == 0:
+                    self.inference_failures += 1
+                    self._undo(inferences)
+                    return None
+            return inferences
+
+        variables = self._variables
+        var = variables[vid]
+        value_bit = self._value_bit
+        for neighbor in self._neighbors[vid]:
+            if neighbor not in unassigned:
+                continue
+            removed = 0
+            for neighbor_value in self._domain_values(neighbor):
+                if not self._constraint_satisfied(var, value, variables[neighbor], neighbor_value):
+                    removed |= value_bit[neighbor_value]
+            if not removed:
+                continue
+            domains[neighbor] &= ~removed
+            inferences.append((neighbor, removed))
+            if domains[neighbor] == 0:
+                self.inference_failures += 1
+                self._undo(inferences)
+                return None
+        return inferences
+
+    def _ac3_inference(self, vid: int, value: D) -> Optional[List[Tuple[int, int]]]:
+        """
+        AC-3约束传播算法
+
+        Returns:
+            删除记录 (变量编号, 删除的值的位掩码) 的列表，供回溯时 _undo 恢复；
+            出现空值域时先撤销已删除的值，再返回 None
+        """
+        if self._use_kernel:
+            return self._ac3_kernel_inference(vid)
+
+        neighbors = self._neighbors
+        domains = self._domains
+        inferences = []
+        # 双端队列 O(1) 出队；in_queue 记录队列中已有的弧，避免重复入队
+        queue = deque((neighbor, vid) for neighbor in neighbors[vid])
+        in_queue = set(queue)
 
         while queue:
-            (xi, xj) = queue.pop(0)
+            arc = queue.popleft()
+            in_queue.discard(arc)
+            xi, xj = arc
             revised = self._revise_domain(xi, xj, inferences)
 
             if revised:
-                if len(self.csp.get_domain(xi)) == 0:
+                if domains[xi] == 0:
                     self.inference_failures += 1
+                    self._undo(inferences)
                     return None
 
-                for xk in self.csp.get_neighbors(xi):
-                    if xk != xj:
+                for xk in neighbors[xi]:
+                    if xk != xj and (xk, xi) not in in_queue:
                         queue.append((xk, xi))
+                        in_queue.add((xk, xi))
 
         return inferences
 
-    def _revise_domain(self, xi: V, xj: V, inferences: List[Tuple[V, D]]) -> bool:
-        """修订Xi的值域，移除与Xj不一致的值"""
-        revised = False
-        original_domain = self.csp.get_domain(xi).copy()
-        values_to_remove = []
+    def _revise_domain(self, xi: int, xj: int, inferences: List[Tuple[int, int]]) -> bool:
+        """修订Xi的值域，移除与Xj不一致的值，并把删除的值记入 inferences（xi、xj 为编号）"""
+        xi_mask = self._domains[xi]
+
+        if self._not_equal_only:
+            # Xi 的值 v 有支持当且仅当 Xj 还有 v 以外的值，
+            # 所以只有 Xj 只剩一个值时才会删除，删除的正是这个值
+            xj_mask = self._domains[xj]
+            removed = xi_mask & xj_mask if xj_mask & (xj_mask - 1) == 0 else 0
+            if not removed:
+                return False
+            self._domains[xi] = xi_mask & ~removed
+            inferences.append((xi, removed))
+            return True
+
+        xi_var = self._variables[xi]
+        xj_var = self._variables[xj]
+        xj_values = self._domain_values(xj)
+        bit_value = self._bit_value
+        removed = 0
+
+        # 逐个取出 Xi 值域中的位
+        remaining = xi_mask
+        while remaining:
+            bit = remaining & -remaining
+            remaining ^= bit
+            xi_value = bit_value[bit]
 
-        for xi_value in self.csp.get_domain(xi):
             consistent = False
-            for xj_value in self.csp.get_domain(xj):
-                if self._constraint_satisfied(xi, xi_value, xj, xj_value):
+            for xj_value in xj_values:
+                if self._constraint_satisfied(xi_var, xi_value, xj_var, xj_value):
                     consistent = True
                     break
 
             if not consistent:
-                values_to_remove.append(xi_value)
+                removed |= bit
+
+        if not removed:
+            return False
 
-        for value in values_to_remove:
-            self.csp.domains[xi].remove(value)
-            if value in original_domain:
-                inferences.append((xi, value))
-            revised = True
+        self._domains[xi] = xi_mask & ~removed
+        inferences.append((xi, removed))
+        return True
 
-        return revised
+    def _ac3_kernel_inference(self, vid: int) -> Optional[List[Tuple[int, int]]]:
+        """调用 _ac3_kernel 传播，并把删除记录同步到 self._domains"""
+        indptr, indices, edge_src, kernel_domains = self._kernel_arrays
+        queue, in_queue, trail_var, trail_bits = self._kernel_buffers
+        n_trail = _ac3_kernel(indptr, indices, edge_src, kernel_domains, vid,
+                              queue, in_queue, trail_var, trail_bits)
+        if n_trail < 0:
+            self.inference_failures += 1
+            return None
+
+        domains = self._domains
+        inferences = []
+        for t in range(n_trail):
+            xi = int(trail_var[t])
+            removed = int(trail_bits[t])
+            domains[xi] &= ~removed
+            inferences.append((xi, removed))
+        return inferences
 
-    def _count_unassigned_neighbors(self, var: V, assignment: Dict[V, D]) -> int:
-        """计算变量的未赋值邻居数量"""
+    def _undo(self, inferences: List[Tuple[int, int]]):
+        """把删除的值按位或回各自的值域"""
+        domains = self._domains
+        for xi, removed in inferences:
+            domains[xi] |= removed
+        if self._use_kernel:
+            kernel_domains = self._kernel_arrays[3]
+            for xi, removed in inferences:
+                kernel_domains[xi] |= removed
+
+    def _count_unassigned_neighbors(self, vid: int) -> int:
+        """计算编号为 vid 的变量的未赋值邻居数量"""
+        unassigned = self._unassigned
         count = 0
-        for neighbor in self.csp.get_neighbors(var):
-            if neighbor not in assignment:
+        for neighbor in self._neighbors[vid]:
+            if neighbor in unassigned:
                 count += 1
         return count
 
-    def _get_unassigned_neighbors(self, var: V, assignment: Dict[V, D]) -> List[V]:
-        """获取变量的未赋值邻居列表"""
-        return [n for n in self.csp.get_neighbors(var) if n not in assignment]
+    def _get_unassigned_neighbors(self, vid: int) -> List[int]:
+        """获取编号为 vid 的变量的未赋值邻居编号列表"""
+        unassigned = self._unassigned
+        return [n for n in self._neighbors[vid] if n in unassigned]
 
     def _constraint_satisfied(self, var1: V, value1: D, var2: V, value2: D) -> bool:
         """检查两个变量的赋值是否满足约束"""
         # 默认实现：如果两个变量相邻，它们的值必须不同
-        # 子类可以重写此方法来实现更复杂的约束
+        # 子类可以重写此方法来实现更复杂的约束（此时 LCV 和 AC-3 会逐对调用它）
         return var2 not in self.csp.get_neighbors(var1) or value1 != value2
 
     def _print_problem_info(self):
@@ -100,7 +100,7 @@ def demonstrate_heuristic_comparison():
     print("   - 值域相同时，选择约束最多的变量 (未来影响)")
     print("2. 值排序: LCV (最少约束值)")
     print("   - 优先选择导致最少冲突的值")
-    print("3. 约束传播: AC-3 算法")
+    print("3. 约束传播: 前向检验（可选 AC-3 算法）")
     print("   - 在赋值后立即传播约束，缩小值域")
     print("   - 提前检测失败，减少搜索空间")
 
@@ -123,7 +123,7 @@ def demonstrate_problem_complexity():
 
     print("\n约束的作用:")
     print("- 大幅减少了有效的搜索空间")
-    print("- AC-3 算法进一步缩小值域")
+    print("- 前向检验 / AC-3 进一步缩小值域")
     print("- 启发式策略引导搜索走向解")
 
 